@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Bash Command Patterns
+Rule set used by deny-dangerous-bash.py. A cheap literal prefilter selects
+the rules whose trigger tokens occur in the command (skipping the regex
+entirely when there are none); the selected rules of a severity level run as
+one alternation of named groups, so the command is scanned once per level
+and the matching rule is still reported.
+
+Rules can be overridden in .ai/enforcement.yaml:
+
+  bash_guard:
+    dangerous:
+      - pattern: '\\bmkfs\\.'
+        triggers: [mkfs]
+    warning:
+      - pattern: '\\bgit\\s+reset\\s+--hard'
+        triggers: [git]
+
+A rule without triggers always runs; triggers must be literals every match
+contains. A rule whose pattern does not compile is reported on stderr and
+left out.
+"""
+
+import re
+import sys
+
+import hook_config
+
+# Dangerous command patterns to block: (pattern, trigger tokens)
+DANGEROUS_PATTERNS = [
+    (r"\brm\s+-rf\s+/\s*$", ["rm"]),             # rm -rf /
+    (r"\brm\s+-rf\s+\*\s*$", ["rm"]),            # rm -rf *
+    (r"\brm\s+-rf\s+\.\s*$", ["rm"]),            # rm -rf .
+    (r"\bmkfs\.", ["mkfs"]),                     # mkfs.* (format disk)
+    (r"\bdd\s+if=", ["dd"]),                     # dd if= (disk operations)
+    (r">\s*/dev/sd", ["/dev/sd"]),               # Write to disk devices
+    (r"\bchmod\s+-R\s+777\s+/", ["chmod"]),      # chmod -R 777 /
+    (r"\bchown\s+-R\s+.*\s+/\s*$", ["chown"]),   # chown -R ... /
+    (r":\(\)\s*\{.*\};\s*:", [":()"]),           # Fork bomb
+    (r"\bsudo\s+rm\s+-rf", ["sudo"]),            # sudo rm -rf
+]
+
+# Commands that require confirmation (warning only)
+WARNING_PATTERNS = [
+    (r"\brm\s+-rf", ["rm"]),                     # Any rm -rf
+    (r"\bgit\s+push\s+.*--force", ["git"]),      # Force push
+    (r"\bgit\s+reset\s+--hard", ["git"]),        # Hard reset
+    (r"\bdrop\s+database", ["drop"]),            # Drop database
+    (r"\btruncate\s+table", ["truncate"]),       # Truncate table
+]
+
+
+class PatternLevel:
+    """
+    One severity level. The rules whose trigger tokens occur in a command are
+    compiled into a single alternation (cached per combination), so a command
+    is scanned once no matter how many rules apply.
+    """
+
+    def __init__(self, rules):
+        self.patterns = [pattern for pattern, _ in rules]
+        self.triggers = [tuple(t.lower() for t in tokens) for _, tokens in rules]
+        self._compiled = {}
+
+    def search(self, command, lowered):
+        """Return the matching pattern, or None"""
+        active = tuple(i for i, tokens in enumerate(self.triggers)
+                       if not tokens or any(t in lowered for t in tokens))
+        if not active:
+            return None
+
+        regex = self._compiled.get(active)
+        if regex is None:
+            regex = re.compile(
+                "|".join(f"(?P<r{i}>{self.patterns[i]})" for i in active),
+                re.IGNORECASE,
+            )
+            self._compiled[active] = regex
+
+        match = regex.search(command)
+        if match is None:
+            return None
+        name = match.lastgroup
+        if name is None:
+            name = next(k for k, v in match.groupdict().items() if v is not None)
+        return self.patterns[int(name[1:])]
+
+
+class RuleSet:
+    """Dangerous (block) and warning (allow with notice) levels"""
+
+    def __init__(self, dangerous, warning):
+        self.dangerous = PatternLevel(dangerous)
+        self.warning = PatternLevel(warning)
+
+    def match(self, command):
+        """
+        Classify a command.
+        Returns ("block", pattern), ("warn", pattern) or None.
+        """
+        lowered = command.lower()
+        pattern = self.dangerous.search(command, lowered)
+        if pattern is not None:
+            return "block", pattern
+        pattern = self.warning.search(command, lowered)
+        if pattern is not None:
+            return "warn", pattern
+        return None
+
+
+_rule_set = None
+_rule_set_stamp = None
+
+
+def load_rule_set():
+    """Rule set from enforcement.yaml (bash_guard) or the built-in defaults"""
+    global _rule_set, _rule_set_stamp
+
+    stamp = hook_config.config_stamp()
+    if _rule_set is not None and stamp == _rule_set_stamp:
+        return _rule_set
+
+    guard = hook_config.section("bash_guard", {})
+    _rule_set = RuleSet(
+        _parse_rules(guard.get("dangerous"), DANGEROUS_PATTERNS, "dangerous"),
+        _parse_rules(guard.get("warning"), WARNING_PATTERNS, "warning"),
+    )
+    _rule_set_stamp = stamp
+    return _rule_set
+
+
+def _parse_rules(entries, default, level):
+    """Normalize YAML rule entries to (pattern, triggers) pairs"""
+    if not entries:
+        return default
+    rules = []
+    for entry in entries:
+        if isinstance(entry, str):
+            pattern, triggers = entry, []
+        else:
+            pattern, triggers = entry["pattern"], list(entry.get("triggers") or [])
+        try:
+            # As PatternLevel compiles it, so patterns that only break inside
+            # the alternation (misplaced global flags, group names) fail here
+            re.compile(f"(?P<r0>{pattern})", re.IGNORECASE)
+        except re.error as e:
+            print(f"bash_guard: ignoring invalid {level} rule {pattern!r}: {e}", file=sys.stderr)
+            continue
+        rules.append((pattern, triggers))
+    return rules
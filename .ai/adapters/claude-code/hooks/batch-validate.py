@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Batch Memory-Bank Validator
+Validates every document of a memory-bank tree (or a manifest of paths) in
+one run instead of one interpreter launch per file. Each file's command is
+inferred from its location using the `outputs` patterns of COMMAND_TEMPLATES.
+Files are checked by a process pool sized to the CPU count and results are
+streamed as JSONL as they finish, followed by a summary line. A file whose
+validation raises (or whose worker dies) gets an ERROR record instead of
+aborting the batch, and makes the run exit non-zero.
+
+Per file:
+  template_usage  command-enforcer template structure check (enforced)
+  guidance        template-guide must_have check (advisory)
+  feedback        template-enforcer-flexible suggestions (advisory)
+
+Batch runs are audits and are not written to the enforcement log.
+"""
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import hook_profile
+import hook_runtime
+from command_registry import RegistryError
+from memory_bank_index import MemoryBankIndex, command_for_path, compile_outputs
+
+MEMORY_BANK = Path(hook_runtime.PROJECT_ROOT) / "memory-bank"
+
+# Only markdown outputs carry template structure; others are listed unchecked
+CHECKED_SUFFIXES = (".md",)
+
+_hooks = None
+
+
+def _load_hooks():
+    """Load the validating hooks once per worker process"""
+    global _hooks
+    if _hooks is None:
+        _hooks = {
+            "enforcer": hook_runtime.load_hook("command-enforcer").TemplateEnforcer(),
+            "guide": hook_runtime.load_hook("template-guide").TemplateGuide(),
+            "flexible": hook_runtime.load_hook("template-enforcer-flexible").FlexibleEnforcer(),
+        }
+    return _hooks
+
+
+def validate_file(path, rel_path, command):
+    """Validate one document; returns its result record"""
+    result = {"path": rel_path, "command": command}
+    if command is None:
+        result["status"] = "SKIPPED"
+        result["reason"] = "No command produces this path"
+        return result
+    if not path.endswith(CHECKED_SUFFIXES):
+        result["status"] = "UNCHECKED"
+        return result
+
+    hooks = _load_hooks()
+    enforcer = hooks["enforcer"]
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        result["status"] = "ERROR"
+        result["reason"] = str(e)
+        return result
+
+    enforcer.violations = []
+    valid, message = enforcer.check_template_usage(command, content)
+    guidance = hooks["guide"].validate_output(command, content)
+    feedback = hooks["flexible"].post_command_check(command, [path])
+
+    result["status"] = "PASS" if valid else "VIOLATION"
+    result["template_usage"] = {
+        "valid": valid,
+        "message": message,
+        "violations": [v["type"] for v in enforcer.violations],
+    }
+    result["guidance"] = {"valid": guidance["valid"], "missing": guidance["missing"]}
+    result["feedback"] = {
+        "suggestions": feedback["suggestions"],
+        "commendations": feedback["commendations"],
+    }
+    return result
+
+
+def error_result(item, error):
+    """Record for a file whose validation raised (or whose worker died)"""
+    _, rel_path, command = item
+    return {"path": rel_path, "command": command, "status": "ERROR",
+            "error": f"{type(error).__name__}: {error}"}
+
+
+def validate_batch(items):
+    """Worker entry point: validate a list of (path, rel_path, command)"""
+    return [validate_file(*item) for item in items]
+
+
+def collect_tree(root, compiled):
+    """(path, rel_path, command) for every visible file under a directory"""
+    root = Path(root).resolve()
+    bank = MEMORY_BANK.resolve()
+    if root == bank or bank in root.parents:
+        base, rel_dir = bank, root.relative_to(bank).as_posix()
+    else:
+        base, rel_dir = root, ""  # Treat the directory as a memory-bank root
+    rel_dir = "" if rel_dir == "." else rel_dir
+
+    index = MemoryBankIndex(base).refresh()
+    items = []
+    for rel_path in index.walk(rel_dir):
+        if os.path.basename(rel_path).startswith("."):
+            continue
+        items.append((str(base / rel_path), rel_path, command_for_path(rel_path, compiled)))
+    return items
+
+
+def collect_paths(lines, compiled):
+    """(path, rel_path, command) for file paths (absolute or memory-bank relative)"""
+    bank = MEMORY_BANK.resolve()
+    items = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        path = Path(line)
+        if not path.is_absolute():
+            path = bank / path
+        path = path.resolve()
+        try:
+            rel_path = path.relative_to(bank).as_posix()
+        except ValueError:
+            rel_path = None
+        command = command_for_path(rel_path, compiled) if rel_path else None
+        items.append((str(path), rel_path or str(path), command))
+    return items
+
+
+def collect_manifest(manifest, compiled):
+    """Items for each path listed in a manifest, one per line ('-' = stdin)"""
+    if manifest == "-":
+        return collect_paths(sys.stdin, compiled)
+    with open(manifest, 'r', encoding='utf-8') as f:
+        return collect_paths(f, compiled)
+
+
+def run(items, jobs, out=sys.stdout):
+    """Validate items in parallel, writing one JSON line per file; returns summary"""
+    summary = {"files": 0, "statuses": {}, "commands": {}}
+    start = time.perf_counter()
+
+    def record(result):
+        out.write(json.dumps(result, ensure_ascii=False) + "\n")
+        out.flush()
+        status = result["status"]
+        summary["files"] += 1
+        summary["statuses"][status] = summary["statuses"].get(status, 0) + 1
+        if result["command"]:
+            counts = summary["commands"].setdefault(result["command"], {"files": 0, "violations": 0})
+            counts["files"] += 1
+            counts["violations"] += status == "VIOLATION"
+
+    # Unmatched paths need no worker
+    work = [item for item in items if item[2] is not None]
+    for item in items:
+        if item[2] is None:
+            record(validate_file(*item))
+
+    if jobs <= 1 or len(work) <= 1:
+        for item in work:
+            try:
+                record(validate_file(*item))
+            except Exception as e:
+                record(error_result(item, e))
+    else:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        # Several files per task keeps pickling overhead small for big trees
+        size = max(1, min(64, len(work) // (jobs * 4)))
+        batches = [work[i:i + size] for i in range(0, len(work), size)]
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_load_hooks) as pool:
+            futures = {pool.submit(validate_batch, b): b for b in batches}
+            for future in as_completed(futures):
+                try:
+                    results = future.result()
+                except Exception as e:
+                    # The batch is lost as a whole (raised, or its worker died)
+                    results = [error_result(item, e) for item in futures[future]]
+                for result in results:
+                    record(result)
+
+    summary["elapsed_s"] = round(time.perf_counter() - start, 3)
+    out.write(json.dumps({"summary": summary}, ensure_ascii=False) + "\n")
+    out.flush()
+    return summary
+
+
+def main():
+    """CLI interface for batch validation"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Batch Memory-Bank Validator")
+    parser.add_argument("paths", nargs="*",
+                        help="Directories or files to validate (default: memory-bank/)")
+    parser.add_argument("--manifest", help="File listing one path per line ('-' for stdin)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (default: CPU count)")
+
+    args = parser.parse_args()
+
+    try:
+        compiled = compile_outputs(hook_runtime.load_hook("command-enforcer").COMMAND_TEMPLATES)
+    except RegistryError as e:
+        parser.exit(1, f"{parser.prog}: error: {e}\n")
+    items = []
+    if args.manifest:
+        items.extend(collect_manifest(args.manifest, compiled))
+    for target in args.paths or ([] if args.manifest else [str(MEMORY_BANK)]):
+        if os.path.isdir(target):
+            items.extend(collect_tree(target, compiled))
+        else:
+            items.extend(collect_paths([os.path.abspath(target)], compiled))
+
+    summary = run(items, args.jobs)
+    statuses = summary["statuses"]
+    sys.exit(1 if statuses.get("VIOLATION") or statuses.get("ERROR") else 0)
+
+
+if __name__ == "__main__":
+    hook_profile.run_main(main)
@@ -4,100 +4,125 @@ Command Template Enforcer
 Ensures all workflow commands use standardized templates and save to memory-bank
 """
 
+import io
 import os
 import sys
 import json
-import yaml
-import hashlib
+import time
 from datetime import datetime
 from pathlib import Path
 
+import hook_config
+import hook_profile
+import hook_timing
+from command_registry import RegistryError, registry
+from memory_bank_index import MemoryBankIndex, command_for_path, compile_outputs
+from template_structure import TemplateStructureCache, scan_structure
+
 # Define project root
 PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 TEMPLATE_DIR = PROJECT_ROOT / ".ai" / "template" / "outputs"
 MEMORY_BANK = PROJECT_ROOT / "memory-bank"
 ENFORCEMENT_LOG = MEMORY_BANK / ".enforcement.log"
 
-# Command template mappings (enforced)
-COMMAND_TEMPLATES = {
-    # Core workflow commands
-    "/van": {
-        "templates": ["van/requirements-spec.md"],
-        "outputs": ["requirements/requirements-*.md", "activeContext.md"],
-        "required": True
-    },
-    "/plan": {
-        "templates": ["plan/tasks.md"],
-        "outputs": ["tasks.md", "planning/wbs-*.md"],
-        "required": True
-    },
-    "/adr": {
-        "templates": ["adr/adr-template.md"],
-        "outputs": ["decisions/adr-*-*.md"],
-        "required": True
-    },
-    "/creative": {
-        "templates": ["creative/architecture-design.md"],
-        "outputs": ["designs/architecture/architecture-*.md", "techContext.md"],
-        "required": True
-    },
-    "/design-validator": {
-        "templates": ["design-validator/validation-report.md"],
-        "outputs": ["validation/report-*.md", "designs/api/openapi-*.yaml"],
-        "required": True
-    },
-    "/implement": {
-        "templates": ["implement/implementation-guide.md"],
-        "outputs": ["implementation/guide-*.md"],
-        "required": True
-    },
-    "/reflect": {
-        "templates": ["reflect/progress-report.md"],
-        "outputs": ["progress.md", "metrics/dashboard.json"],
-        "required": True
-    },
-    # Utility commands with templates
-    "/task-next": {
-        "templates": ["task-next/pm-recommendation.md"],
-        "outputs": ["recommendations/pm-recommendation-*.md"],
-        "required": True,
-        "links_to": ["/plan"]
-    },
-    "/debug": {
-        "templates": ["debug/root-cause-analysis.md"],
-        "outputs": ["debug/debug-*-*.md"],
-        "required": True,
-        "links_to": ["/implement"]
-    },
-    "/review-code": {
-        "templates": ["review-code/code-review-report.md"],
-        "outputs": ["reviews/review-*-*.md"],
-        "required": True,
-        "links_to": ["/implement", "/write-tests"]
-    },
-    "/write-tests": {
-        "templates": ["write-tests/test-strategy.md"],
-        "outputs": ["tests/test-strategy-*-*.md"],
-        "required": True,
-        "links_to": ["/implement", "/review-code"]
-    }
-}
+# Command template mappings (enforced), compiled from .ai/enforcement.yaml
+COMMAND_TEMPLATES = registry
 
 class TemplateEnforcer:
     """Enforces template usage for workflow commands"""
 
-    def __init__(self):
+    def __init__(self, flush_window=None):
         self.violations = []
-        self.command_history = []
-        self.load_history()
+        self._logged_violations = 0
+        self._log = None
+        self._flush_window = flush_window  # None: the log's default
+        self._command_history = None
+        self._memory_bank_index = None
+        self.template_structures = TemplateStructureCache(TEMPLATE_DIR)
+        # Shared by checks running concurrently (see _sync and _run_checks)
+        self._lock = None
+        self._local = None
+        self._matches = {}
+        self._reference_graph = None
+        self._outputs = None
+        self._outputs_for = None
+
+    @property
+    def log(self):
+        """Enforcement log store, opened on first use"""
+        if self._log is None:
+            from enforcement_log import EnforcementLog
+
+            log = EnforcementLog(ENFORCEMENT_LOG)
+            if self._flush_window is not None:
+                log.flush_window = self._flush_window
+            self._log = log
+        return self._log
+
+    def _sync(self):
+        """
+        Create the lock and thread-local shared by concurrent checks. Called
+        before _run_checks starts threads, so creation itself never races,
+        and lazily so the --check path does not import threading.
+        """
+        if self._lock is None:
+            import threading
+
+            self._lock = threading.Lock()
+            self._local = threading.local()
+        return self._lock
+
+    @property
+    def memory_bank_index(self):
+        """Memory-bank file manifest, refreshed once on first use"""
+        if self._memory_bank_index is None:
+            with self._sync():
+                if self._memory_bank_index is None:
+                    with hook_timing.phase("io"):
+                        self._memory_bank_index = MemoryBankIndex(MEMORY_BANK).refresh()
+        return self._memory_bank_index
+
+    def lookup_outputs(self, patterns):
+        """Index matches per output pattern, memoized across checks"""
+        missing = [p for p in patterns if p not in self._matches]
+        if missing:
+            found = self.memory_bank_index.glob_many(missing)
+            with self._sync():
+                self._matches.update(found)
+        return {pattern: self._matches[pattern] for pattern in patterns}
+
+    @property
+    def reference_graph(self):
+        """Memory-bank reference graph, sharing the manifest index"""
+        if self._reference_graph is None:
+            from reference_graph import ReferenceGraph
+
+            self._reference_graph = ReferenceGraph(MEMORY_BANK, self.memory_bank_index)
+        return self._reference_graph
+
+    def output_patterns(self):
+        """Output patterns indexed for command_for_path (per config version)"""
+        compiled = registry.compiled()
+        if self._outputs_for is not compiled:
+            self._outputs = compile_outputs(COMMAND_TEMPLATES)
+            self._outputs_for = compiled
+        return self._outputs
+
+    def record_violation(self, violation):
+        """Add a violation (to the running check's list inside _run_checks)"""
+        sink = getattr(self._local, "violations", None)
+        (self.violations if sink is None else sink).append(violation)
+
+    @property
+    def command_history(self):
+        """Full execution history, loaded on first access only"""
+        if self._command_history is None:
+            self.load_history()
+        return self._command_history
 
     def load_history(self):
         """Load command execution history"""
-        if ENFORCEMENT_LOG.exists():
-            with open(ENFORCEMENT_LOG, 'r') as f:
-                for line in f:
-                    if line.strip():
-                        self.command_history.append(json.loads(line))
+        self._command_history = list(self.log.entries())
 
     def log_execution(self, command, status, details):
         """Log command execution"""
@@ -105,15 +130,17 @@ class TemplateEnforcer:
             "timestamp": datetime.now().isoformat(),
             "command": command,
             "status": status,
-            "details": details
+            "details": details,
+            "violations": [v["type"] for v in self.violations[self._logged_violations:]]
         }
+        self._logged_violations = len(self.violations)
 
-        # Append to log file
-        ENFORCEMENT_LOG.parent.mkdir(parents=True, exist_ok=True)
-        with open(ENFORCEMENT_LOG, 'a') as f:
-            f.write(json.dumps(entry) + "\n")
+        # Append to log file (also updates the running aggregates)
+        with hook_timing.phase("io"):
+            self.log.append(entry)
 
-        self.command_history.append(entry)
+        if self._command_history is not None:
+            self._command_history.append(entry)
 
     def validate_command(self, command):
         """Validate that a command will use proper templates"""
@@ -127,7 +154,7 @@ class TemplateEnforcer:
         for template_path in config["templates"]:
             full_path = TEMPLATE_DIR / template_path
             if not full_path.exists():
-                self.violations.append({
+                self.record_violation({
                     "type": "MISSING_TEMPLATE",
                     "command": command,
                     "template": str(template_path),
@@ -149,7 +176,7 @@ class TemplateEnforcer:
             # Verify files are in memory-bank
             for file_path in generated_files:
                 if not str(file_path).startswith(str(MEMORY_BANK)):
-                    self.violations.append({
+                    self.record_violation({
                         "type": "INVALID_OUTPUT_LOCATION",
                         "command": command,
                         "file": str(file_path),
@@ -157,19 +184,13 @@ class TemplateEnforcer:
                     })
                     return False, f"Output not in memory-bank: {file_path}"
 
-        # Check output patterns
+        # Check output patterns against the memory-bank index
         found_outputs = []
-        for pattern in config["outputs"]:
-            # Convert pattern to Path and check existence
-            pattern_path = MEMORY_BANK / pattern.replace("*", "")
-            if pattern_path.parent.exists():
-                # Check for files matching pattern
-                matches = list(pattern_path.parent.glob(pattern_path.name.replace("*", "*")))
-                if matches:
-                    found_outputs.extend(matches)
+        for matches in self.lookup_outputs(config["outputs"]).values():
+            found_outputs.extend(matches)
 
         if not found_outputs and config.get("required", True):
-            self.violations.append({
+            self.record_violation({
                 "type": "NO_OUTPUT_GENERATED",
                 "command": command,
                 "severity": "HIGH"
@@ -183,40 +204,30 @@ class TemplateEnforcer:
         if command not in COMMAND_TEMPLATES:
             return True, "Not a workflow command"
 
-        # Load template to compare structure
+        # Load cached template structure (headings)
         config = COMMAND_TEMPLATES[command]
-        template_path = TEMPLATE_DIR / config["templates"][0]
+        structure = self.template_structures.get(config["templates"][0])
 
-        if template_path.exists():
-            with open(template_path, 'r') as f:
-                template_content = f.read()
+        if structure is not None:
+            # Main headings from the template, matched in one pass over content
+            template_headings = structure["headings"][:5]
+            scan = scan_structure(io.StringIO(content), template_headings)
+            found = set(scan["headings"])
 
             # Check for template markers
-            has_frontmatter = content.startswith("---\n") and "\n---\n" in content
-            has_structure = False
-
-            # Extract main headings from template
-            template_headings = [line.strip() for line in template_content.split('\n')
-                                if line.startswith('#')]
-
-            # Check if generated content has similar structure
-            content_headings = [line.strip() for line in content.split('\n')
-                               if line.startswith('#')]
-
-            # Calculate structural similarity
-            if template_headings and content_headings:
-                matches = sum(1 for h in template_headings[:5] if h in content_headings)
-                has_structure = matches >= 3  # At least 3 main headings match
+            has_frontmatter = scan["frontmatter"]
+            matches = sum(1 for h in template_headings if h in found)
+            has_structure = matches >= 3  # At least 3 main headings match
 
             if not has_frontmatter:
-                self.violations.append({
+                self.record_violation({
                     "type": "MISSING_FRONTMATTER",
                     "command": command,
                     "severity": "MEDIUM"
                 })
 
             if not has_structure:
-                self.violations.append({
+                self.record_violation({
                     "type": "TEMPLATE_NOT_USED",
                     "command": command,
                     "severity": "HIGH"
@@ -225,7 +236,7 @@ class TemplateEnforcer:
 
         return True, "Template structure detected"
 
-    def validate_linkages(self, command, content=None):
+    def validate_linkages(self, command, content=None, output_files=None):
         """Validate that utility commands properly link to parent commands"""
         if command not in COMMAND_TEMPLATES:
             return True, "Not a workflow command"
@@ -236,26 +247,17 @@ class TemplateEnforcer:
         if not links_to:
             return True, "No linkage requirements"
 
-        # Check that parent command outputs exist
-        missing_parents = []
-        for parent_cmd in links_to:
-            if parent_cmd in COMMAND_TEMPLATES:
-                parent_config = COMMAND_TEMPLATES[parent_cmd]
-                # Check if any parent outputs exist
-                parent_found = False
-                for pattern in parent_config["outputs"]:
-                    pattern_path = MEMORY_BANK / pattern.replace("*", "")
-                    if pattern_path.parent.exists():
-                        matches = list(pattern_path.parent.glob(pattern_path.name.replace("*", "*")))
-                        if matches:
-                            parent_found = True
-                            break
-
-                if not parent_found:
-                    missing_parents.append(parent_cmd)
+        # Check that parent command outputs exist (one index pass for all parents)
+        parents = self.parent_commands(command)
+        matches = self.lookup_outputs(
+            [pattern for p in parents for pattern in COMMAND_TEMPLATES[p]["outputs"]])
+        missing_parents = [
+            p for p in parents
+            if not any(matches[pattern] for pattern in COMMAND_TEMPLATES[p]["outputs"])
+        ]
 
         if missing_parents:
-            self.violations.append({
+            self.record_violation({
                 "type": "MISSING_PARENT_OUTPUT",
                 "command": command,
                 "missing_parents": missing_parents,
@@ -263,25 +265,52 @@ class TemplateEnforcer:
             })
             return False, f"Parent command outputs missing: {', '.join(missing_parents)}"
 
-        # If content provided, check for references to parent outputs
-        if content and links_to:
-            has_reference = False
-            for parent_cmd in links_to:
-                # Check if content references parent command outputs
-                if f"memory-bank/" in content or f"{parent_cmd[1:]}" in content:
-                    has_reference = True
-                    break
-
-            if not has_reference:
-                self.violations.append({
-                    "type": "NO_PARENT_REFERENCE",
-                    "command": command,
-                    "severity": "MEDIUM"
-                })
-                return False, "Content doesn't reference parent command outputs"
+        # Content (or the written outputs) must cite a document a parent produced
+        if content or output_files:
+            if not self.cites_parent(parents, content, output_files):
+                return self._no_parent_reference(command)
 
         return True, "Linkage validation passed"
 
+    def parent_commands(self, command):
+        """Workflow commands a command links_to"""
+        return [p for p in COMMAND_TEMPLATES[command].get("links_to", []) if p in COMMAND_TEMPLATES]
+
+    def cites_parent(self, parents, content=None, output_files=None):
+        """Whether the content (or output documents) cite a document one of `parents` produced"""
+        compiled = self.output_patterns()
+        return any(command_for_path(ref, compiled) in parents
+                   for ref in self.cited_paths(content, output_files))
+
+    def _no_parent_reference(self, command):
+        self.record_violation({
+            "type": "NO_PARENT_REFERENCE",
+            "command": command,
+            "severity": "MEDIUM"
+        })
+        return False, "Content doesn't reference parent command outputs"
+
+    def cited_paths(self, content=None, output_files=None):
+        """
+        Memory-bank paths referenced by the content, or else by the output
+        documents (looked up in the reference graph, rescanned if changed)
+        """
+        rel_paths = []
+        bank = str(MEMORY_BANK) + os.sep
+        for file_path in output_files or ():
+            file_path = os.path.abspath(file_path)
+            if file_path.startswith(bank):
+                rel_paths.append(file_path[len(bank):].replace(os.sep, "/"))
+
+        if content:
+            from reference_graph import extract_references
+
+            return extract_references(content, rel_paths[0] if len(rel_paths) == 1 else None)
+
+        with hook_timing.phase("io"):
+            graph = self.reference_graph.update(rel_paths)
+        return [ref for rel_path in rel_paths for ref in graph.references(rel_path)]
+
     def enforce_pre_command(self, command):
         """Pre-command enforcement hook"""
         valid, message = self.validate_command(command)
@@ -300,32 +329,33 @@ class TemplateEnforcer:
         print(f"\n✅ Template enforcement check passed for {command}")
         return True
 
-    def enforce_post_command(self, command, output_files=None, content=None):
+    def enforce_post_command(self, command, output_files=None, content=None, watched=True):
         """Post-command enforcement hook"""
-        results = []
-
-        # Validate outputs
-        valid_output, output_message = self.validate_output(command, output_files)
-        results.append(("Output validation", valid_output, output_message))
-
-        # Check template usage if content provided
-        if content:
-            valid_template, template_message = self.check_template_usage(command, content)
-            results.append(("Template usage", valid_template, template_message))
-
-        # Validate linkages for utility commands
-        valid_linkage, linkage_message = self.validate_linkages(command, content)
-        results.append(("Linkage validation", valid_linkage, linkage_message))
+        # Answer from memory-watch.py's verdicts when it has seen these files
+        results = self.watched_results(command, output_files) if watched and not content else None
+        precomputed = results is not None
+
+        if results is None:
+            # Validate outputs, template usage (if content provided) and linkages
+            checks = [("Output validation", self.validate_output, (command, output_files))]
+            if content:
+                checks.append(("Template usage", self.check_template_usage, (command, content)))
+            checks.append(("Linkage validation", self.validate_linkages,
+                           (command, content, output_files)))
+            results = self._run_checks(checks)
 
         # Log results
         all_valid = all(r[1] for r in results)
-        details = {r[0]: {"valid": r[1], "message": r[2]} for r in results}
+        details = {r[0]: {"valid": r[1], "message": r[2], "elapsed_ms": r[3]} for r in results}
+        if precomputed:
+            for detail in details.values():
+                detail["precomputed"] = True
 
         self.log_execution(command, "SUCCESS" if all_valid else "VIOLATION", details)
 
         if not all_valid:
             print(f"\n⚠️ TEMPLATE ENFORCEMENT VIOLATIONS DETECTED:")
-            for check_name, valid, message in results:
+            for check_name, valid, message, _ in results:
                 if not valid:
                     print(f"  - {check_name}: {message}")
 
@@ -339,22 +369,137 @@ class TemplateEnforcer:
         print(f"\n✅ All enforcement checks passed for {command}")
         return True
 
-    def generate_report(self):
-        """Generate enforcement report"""
+    def watched_results(self, command, output_files=None):
+        """
+        Output and linkage results from a live memory-watch.py status, in
+        _run_checks form, or None when there is no settled watcher, the
+        config changed, a file was created or deleted in an output directory
+        since the verdicts were computed, or an output file is not in the
+        status as it is now.
+        """
+        import watch_status
+
+        status = watch_status.load_live()
+        if status is None or status["config"] != hook_config.config_stamp():
+            return None
+        if not watch_status.fresh(status, str(MEMORY_BANK)):
+            return None
+        verdict = status["commands"].get(command)
+        if verdict is None:
+            return None
+
+        records = []
+        bank = str(MEMORY_BANK) + os.sep
+        for file_path in output_files or ():
+            if not str(file_path).startswith(str(MEMORY_BANK)):
+                return None  # Reported by validate_output inline
+            file_path = os.path.abspath(file_path)
+            record = status["documents"].get(file_path[len(bank):].replace(os.sep, "/"))
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                return None
+            if record is None or record[:2] != [st.st_mtime_ns, st.st_size]:
+                return None
+            records.append(record)
+
+        results = []
+        for name, key in (("Output validation", "outputs"), ("Linkage validation", "linkage")):
+            valid, message, violations, elapsed_ms = verdict[key]
+            for violation in violations:
+                self.record_violation(violation)
+            if key == "linkage" and valid and verdict["parents"] and records \
+                    and not any(record[2] for record in records):
+                valid, message = self._no_parent_reference(command)
+            results.append((name, valid, message, elapsed_ms))
+        return results
+
+    def _run_checks(self, checks):
+        """
+        Run independent checks concurrently, each on its own thread (the
+        first on this one). They share the memory-bank index and output
+        lookups, so the tree is scanned once. Violations are collected per
+        check and merged in check order, independent of scheduling.
+        Returns [(name, valid, message, elapsed_ms)] in check order.
+        """
+        import threading
+
+        self._sync()
+        outcomes = [None] * len(checks)
+
+        def run(i):
+            name, method, args = checks[i]
+            self._local.violations = []
+            start = time.perf_counter()
+            try:
+                valid, message = method(*args)
+                error = None
+            except Exception as e:
+                valid, message, error = False, str(e), e
+            elapsed_ms = round((time.perf_counter() - start) * 1000, 3)
+            outcomes[i] = (name, valid, message, elapsed_ms, self._local.violations, error)
+            self._local.violations = None
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(1, len(checks))]
+        for thread in threads:
+            thread.start()
+        run(0)
+        for thread in threads:
+            thread.join()
+
+        results = []
+        for name, valid, message, elapsed_ms, violations, error in outcomes:
+            if error is not None:
+                raise error
+            self.violations.extend(violations)
+            results.append((name, valid, message, elapsed_ms))
+        return results
+
+    def generate_report(self, since=None, command=None):
+        """Generate enforcement report from the running aggregates"""
+        summary = self.log.summary(since, command)
         report = {
             "timestamp": datetime.now().isoformat(),
-            "total_commands": len(self.command_history),
+            "total_commands": summary["entries"],
             "violations": self.violations,
-            "enforcement_rate": 0
+            "enforcement_rate": self._rate(summary),
+            "violation_types": summary["violations"]
         }
 
-        if self.command_history:
-            successful = sum(1 for cmd in self.command_history
-                           if cmd["status"] == "SUCCESS")
-            report["enforcement_rate"] = (successful / len(self.command_history)) * 100
+        if since is not None or command is not None:
+            report["filters"] = {
+                "since": since.isoformat() if since else None,
+                "command": command
+            }
+
+        if command is None and since is None:
+            report["commands"] = {
+                name: {
+                    "total": counter["entries"],
+                    "enforcement_rate": self._rate(counter),
+                    "violation_types": counter["violations"]
+                }
+                for name, counter in sorted(self.log.commands().items())
+            }
 
         return report
 
+    def _rate(self, counter):
+        """Share of SUCCESS entries in a counter, in percent"""
+        if not counter["entries"]:
+            return 0
+        return (counter["statuses"].get("SUCCESS", 0) / counter["entries"]) * 100
+
+def parse_since(value):
+    """Parse --since: relative ("36h", "7d") or an ISO date/datetime"""
+    from datetime import timedelta
+
+    if value[:-1].isdigit() and value[-1] in "hd":
+        amount = int(value[:-1])
+        delta = timedelta(hours=amount) if value[-1] == "h" else timedelta(days=amount)
+        return datetime.now() - delta
+    return datetime.fromisoformat(value)
+
 def main():
     """CLI interface for enforcement checks"""
     import argparse
@@ -364,25 +509,62 @@ def main():
     parser.add_argument("--validate", help="Validate after execution")
     parser.add_argument("--report", action="store_true", help="Generate report")
     parser.add_argument("--files", nargs="+", help="Output files to validate")
+    parser.add_argument("--since", help="Report window start (e.g. 24h, 7d, 2024-01-31)")
+    parser.add_argument("--command", help="Restrict report to one command")
+    parser.add_argument("--inline", action="store_true",
+                        help="With --validate: ignore memory-watch.py verdicts")
+    parser.add_argument("--compact", type=int, metavar="DAYS",
+                        help="Fold log segments older than DAYS into the aggregates")
+    parser.add_argument("--query", action="store_true",
+                        help="Print log entries (JSON lines) in the --from/--to window")
+    parser.add_argument("--from", dest="start", help="Query window start, inclusive (e.g. 48h, 2024-01-31)")
+    parser.add_argument("--to", dest="end", help="Query window end, exclusive")
+    parser.add_argument("--limit", type=int, help="Stop the query after this many entries")
+    parser.add_argument("--segments", action="store_true",
+                        help="List sealed log segments with their time ranges and counts")
 
     args = parser.parse_args()
 
-    enforcer = TemplateEnforcer()
+    runtime = sys.modules.get("hook_runtime")
+    # One-shot run: commit each entry before the process can exit
+    enforcer = TemplateEnforcer(None if getattr(runtime, "persistent_process", False) else 0)
 
     if args.report:
-        report = enforcer.generate_report()
+        since = parse_since(args.since) if args.since else None
+        report = enforcer.generate_report(since, args.command)
         print(json.dumps(report, indent=2))
 
-    elif args.check:
-        valid = enforcer.enforce_pre_command(args.check)
-        sys.exit(0 if valid else 1)
-
-    elif args.validate:
-        valid = enforcer.enforce_post_command(args.validate, args.files)
+    elif args.compact is not None:
+        removed = enforcer.log.compact(args.compact)
+        print(json.dumps({"compacted_entries": removed}, indent=2))
+
+    elif args.query:
+        start = parse_since(args.start).isoformat() if args.start else None
+        end = parse_since(args.end).isoformat() if args.end else None
+        for count, entry in enumerate(enforcer.log.query(start, end, args.command)):
+            if args.limit is not None and count >= args.limit:
+                break
+            sys.stdout.write(json.dumps(entry) + "\n")
+
+    elif args.segments:
+        print(json.dumps(enforcer.log.segments(), indent=2))
+
+    elif args.check or args.validate:
+        try:
+            with hook_timing.phase("rules"):
+                if args.check:
+                    valid = enforcer.enforce_pre_command(args.check)
+                else:
+                    valid = enforcer.enforce_post_command(args.validate, args.files,
+                                                          watched=not args.inline)
+        except RegistryError as e:
+            # Fail closed: without the command definitions nothing can be checked
+            print(f"\n❌ ENFORCEMENT UNAVAILABLE: {e}")
+            valid = False
         sys.exit(0 if valid else 1)
 
     else:
         parser.print_help()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    hook_profile.run_main(main)
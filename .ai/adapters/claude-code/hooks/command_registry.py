@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Command Registry
+Single source of workflow command metadata for the hooks, compiled from the
+`commands`, `utility_commands` and `guidance` sections of
+.ai/enforcement.yaml (loaded through hook_config, which keeps the parsed
+snapshot). The registry is compiled once per config version and every lookup
+is a dict access; entries are shared and must be treated as read-only.
+
+There is no built-in fallback: when enforcement.yaml is missing, unreadable
+or cannot be parsed (no PyYAML and no snapshot), compiling the registry
+raises RegistryError so the hooks fail closed instead of enforcing nothing.
+
+Each command entry carries the YAML fields plus normalised keys:
+  templates   template files under .ai/template/outputs/
+  outputs     memory-bank relative output patterns
+  links_to    parent commands whose outputs must exist
+  required    whether the command is enforced
+"""
+
+from collections.abc import Mapping
+
+import hook_config
+
+COMMAND_SECTIONS = ("commands", "utility_commands")
+
+
+class RegistryError(RuntimeError):
+    """enforcement.yaml provides no command definitions"""
+
+
+def compile_registry(config):
+    """{"commands": {command: entry}, "guidance": {...}, "default_guidance": {...}}"""
+    rules = {}
+    for section_name in COMMAND_SECTIONS:
+        for command, rule in (config.get(section_name) or {}).items():
+            rules[command] = dict(rule or {})
+    if not rules:
+        raise RegistryError(
+            f"no commands defined: {hook_config.CONFIG_PATH} is missing, unreadable "
+            "or could not be parsed (PyYAML is required without a cached snapshot)")
+
+    commands = {}
+    for command, entry in rules.items():
+        entry["templates"] = list(entry.get("templates") or [])
+        entry["outputs"] = list(entry.get("outputs") or [])
+        entry["links_to"] = list(entry.get("links_to") or [])
+        entry["required"] = bool(entry.get("enforce", entry.get("required", True)))
+        commands[command] = entry
+
+    guidance = {command: dict(entry or {})
+                for command, entry in (config.get("guidance") or {}).items()}
+    default_guidance = guidance.pop("default", {})
+    return {
+        "commands": commands,
+        "guidance": guidance,
+        "default_guidance": default_guidance,
+    }
+
+
+class CommandRegistry(Mapping):
+    """Read-only mapping of command -> entry that follows enforcement.yaml"""
+
+    def __init__(self):
+        self._config = None
+        self._compiled = None
+
+    def compiled(self):
+        config = hook_config.load_config()
+        if config is not self._config:
+            self._compiled = compile_registry(config)
+            self._config = config
+        return self._compiled
+
+    def __getitem__(self, command):
+        return self.compiled()["commands"][command]
+
+    def __contains__(self, command):
+        return command in self.compiled()["commands"]
+
+    def __iter__(self):
+        return iter(self.compiled()["commands"])
+
+    def __len__(self):
+        return len(self.compiled()["commands"])
+
+    def guidance(self, command):
+        """Writing guidance for a command, or the default guidance"""
+        compiled = self.compiled()
+        entry = compiled["guidance"].get(command) or compiled["default_guidance"]
+        if not entry:
+            raise RegistryError(
+                f"no guidance for {command} and no `default` guidance in {hook_config.CONFIG_PATH}")
+        return entry
+
+
+registry = CommandRegistry()
@@ -0,0 +1,680 @@
+#!/usr/bin/env python3
+"""
+Enforcement Log Store
+Append-only, segmented JSONL log of enforcement results (sealed segments are
+gzipped) with a sidecar index of running aggregates, so reports and time
+window queries never replay the log. Concurrent writers commit batches under
+an fcntl lock with one O_APPEND write each.
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+INDEX_VERSION = 3
+SEGMENT_MAX_BYTES = 4 * 1024 * 1024
+SEGMENT_MAX_AGE = 24 * 3600  # Seconds between the active segment's first entry and sealing
+HEADER_KEY = "_segment_header"
+_TIMESTAMP_PREFIX = '{"timestamp": "'  # json.dumps of an entry with the timestamp first
+HOUR_RETENTION_DAYS = 7
+FLUSH_WINDOW = 0.05  # Seconds a queued entry waits for others to commit with
+MAX_BATCH = 256
+
+
+def new_counter():
+    return {"entries": 0, "statuses": {}, "violations": {}}
+
+
+def merge_counter(target, source):
+    """Add the counts of `source` into `target`"""
+    target["entries"] += source["entries"]
+    for key in ("statuses", "violations"):
+        for name, count in source[key].items():
+            target[key][name] = target[key].get(name, 0) + count
+    return target
+
+
+def empty_aggregates():
+    return {"totals": new_counter(), "commands": {}, "hours": {}, "days": {}}
+
+
+def fold_entry(aggregates, entry):
+    """Count one log entry into an aggregates structure"""
+    status = entry.get("status", "UNKNOWN")
+    command = entry.get("command", "")
+    violations = entry.get("violations", [])
+    timestamp = entry.get("timestamp", "")
+
+    counters = [
+        aggregates["totals"],
+        aggregates["commands"].setdefault(command, new_counter()),
+    ]
+    if len(timestamp) >= 13:
+        hours = aggregates["hours"]
+        hour = timestamp[:13]
+        if hour not in hours:
+            _prune_hours(hours, hour)
+        counters.append(hours.setdefault(hour, {}).setdefault(command, new_counter()))
+        day = aggregates["days"].setdefault(timestamp[:10], {})
+        counters.append(day.setdefault(command, new_counter()))
+
+    for counter in counters:
+        count_entry(counter, status, violations)
+
+
+def count_entry(counter, status, violations):
+    """Count one entry's status and violations into a counter"""
+    counter["entries"] += 1
+    counter["statuses"][status] = counter["statuses"].get(status, 0) + 1
+    for violation in violations:
+        counter["violations"][violation] = counter["violations"].get(violation, 0) + 1
+
+
+def merge_aggregates(target, source):
+    """Add one aggregates structure into another"""
+    merge_counter(target["totals"], source["totals"])
+    for command, counter in source["commands"].items():
+        merge_counter(target["commands"].setdefault(command, new_counter()), counter)
+    for key in ("hours", "days"):
+        for bucket, per_command in source[key].items():
+            target_bucket = target[key].setdefault(bucket, {})
+            for command, counter in per_command.items():
+                merge_counter(target_bucket.setdefault(command, new_counter()), counter)
+    return target
+
+
+def line_timestamp(line):
+    """Timestamp of a log line, without parsing it when written by this module"""
+    if line.startswith(_TIMESTAMP_PREFIX):
+        end = line.find('"', len(_TIMESTAMP_PREFIX))
+        if end > 0:
+            return line[len(_TIMESTAMP_PREFIX):end]
+    try:
+        return json.loads(line).get("timestamp", "")
+    except (ValueError, AttributeError):
+        return ""
+
+
+def read_segment_header(path):
+    """Header of a compressed sealed segment (first gzip member only), or None"""
+    import zlib
+
+    try:
+        with open(path, 'rb') as f:
+            data = f.read(64 * 1024)
+    except OSError:
+        return None
+    inflater = zlib.decompressobj(31)  # gzip framing
+    try:
+        line = inflater.decompress(data)
+    except zlib.error:
+        return None
+    if not inflater.eof or not line.startswith(b'{"' + HEADER_KEY.encode()):
+        return None
+    return json.loads(line)[HEADER_KEY]
+
+
+def _prune_hours(hours, newest):
+    """Drop hour buckets older than the retention window (days keep them)"""
+    try:
+        cutoff = datetime.strptime(newest, "%Y-%m-%dT%H") - timedelta(days=HOUR_RETENTION_DAYS)
+    except ValueError:
+        return
+    cutoff_key = cutoff.strftime("%Y-%m-%dT%H")
+    for key in [k for k in hours if k < cutoff_key]:
+        del hours[key]
+
+
+class EnforcementLog:
+    """Segmented enforcement log with running aggregates"""
+
+    def __init__(self, path, segment_max_bytes=SEGMENT_MAX_BYTES, flush_window=FLUSH_WINDOW,
+                 segment_max_age=SEGMENT_MAX_AGE):
+        self.path = Path(path)
+        self.index_path = self.path.with_name(".enforcement.index.json")
+        self.compacted_path = self.path.with_name(".enforcement.compacted.json")
+        self.lock_path = self.path.with_name(".enforcement.lock")
+        self.segment_max_bytes = segment_max_bytes
+        self.segment_max_age = segment_max_age
+        self.flush_window = flush_window
+        self._index = None
+        self._index_stat = None
+        self._pending = []
+        self._mutex = None
+        self._timer = None
+        self._dir_ready = False
+
+    # ------------------------------------------------------------------
+    # Writing
+
+    def append(self, entry):
+        """
+        Queue one entry; it is committed with the entries queued around it.
+        Queued entries are lost if the process dies without exiting normally,
+        so one-shot writers set flush_window=0 to commit synchronously.
+        """
+        if self.flush_window <= 0:
+            self._commit([entry])
+            return
+
+        import threading
+
+        if self._mutex is None:
+            self._mutex = threading.Lock()
+
+        with self._mutex:
+            _track_pending(self)
+            self._pending.append(entry)
+            if len(self._pending) < MAX_BATCH:
+                if self._timer is None:
+                    self._timer = threading.Timer(self.flush_window, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return
+        self.flush()
+
+    def flush(self):
+        """Commit queued entries now"""
+        if self._mutex is None:
+            return
+        with self._mutex:
+            entries, self._pending = self._pending, []
+            _pending_logs.discard(self)
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if entries:
+                self._commit(entries)
+
+    def _commit(self, entries):
+        """Write a batch as one locked append and fold it into the index"""
+        data = "".join(json.dumps(entry) + "\n" for entry in entries).encode("utf-8")
+        with self._locked():
+            index = self._refresh_index()
+            if index["active_entries"] and self._active_expired(index):
+                self._seal_active(index)  # New entries start the next segment
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view):]
+                offset = os.fstat(fd).st_size
+            finally:
+                os.close(fd)
+
+            for entry in entries:
+                self._count(index, entry)
+            index["active_offset"] = offset
+
+            if offset >= self.segment_max_bytes:
+                self._seal_active(index)
+
+            self._save_index(index)
+
+    def _active_expired(self, index):
+        first = index.get("active_first")
+        if not first or self.segment_max_age is None:
+            return False
+        cutoff = datetime.now() - timedelta(seconds=self.segment_max_age)
+        return first < cutoff.isoformat()
+
+    def compact(self, older_than_days=30):
+        """
+        Remove sealed segments whose newest entry is older than the cutoff.
+        Their counts stay in the aggregates (and in the compacted base, so a
+        later index rebuild does not lose them). Remaining uncompressed
+        segments are compressed. Returns entries removed.
+        """
+        self.flush()
+        with self._locked():
+            index = self._refresh_index()
+            removed = self._compact(index, older_than_days)
+            if self._compress_plain(index):
+                self._save_index(index)
+            return removed
+
+    def compress_segments(self):
+        """Compress sealed segments still stored plain; returns how many"""
+        self.flush()
+        with self._locked():
+            index = self._refresh_index()
+            compressed = self._compress_plain(index)
+            if compressed:
+                self._save_index(index)
+            return compressed
+
+    def _compress_plain(self, index):
+        compressed = 0
+        for segment in index["segments"]:
+            path = self._segment_path(segment["name"])
+            if path.suffix == ".gz":
+                continue
+            header = new_counter()
+            for entry in self._read_entries(path):
+                count_entry(header, entry.get("status", "UNKNOWN"), entry.get("violations", []))
+            header.update(name=segment["name"] + ".gz", first=segment["first"], last=segment["last"])
+            if self._compress_segment(path, header):
+                segment["name"] = header["name"]
+                compressed += 1
+        return compressed
+
+    def _compact(self, index, older_than_days):
+        cutoff = (datetime.now() - timedelta(days=older_than_days)).isoformat()
+        base = self._load_compacted()
+        removed = 0
+
+        for segment in list(index["segments"]):
+            if not segment.get("last") or segment["last"] >= cutoff:
+                break  # Segments are in time order
+            path = self._segment_path(segment["name"])
+            for entry in self._read_entries(path):
+                fold_entry(base, entry)
+            removed += segment["entries"]
+            index["segments"].remove(segment)
+            self._save_json(self.compacted_path, base)
+            path.unlink()
+
+        if removed:
+            index["compacted"]["entries"] += removed
+            index["compacted"]["through"] = cutoff
+            self._save_index(index)
+        return removed
+
+    # ------------------------------------------------------------------
+    # Reading
+
+    def index(self):
+        """Aggregates, brought up to date with the active segment"""
+        self.flush()
+        if self._is_current():
+            return self._index  # Nothing written since our last look
+        with self._locked():
+            return self._refresh_index()
+
+    def summary(self, since=None, command=None):
+        """
+        Counter for a time window and/or command, answered from the
+        aggregates. `since` is a datetime; resolution is one hour within the
+        hour retention window and one day before it.
+        """
+        index = self.index()
+        if since is None:
+            if command is None:
+                return index["totals"]
+            return index["commands"].get(command, new_counter())
+
+        hour_key = since.strftime("%Y-%m-%dT%H")
+        day_key = since.strftime("%Y-%m-%d")
+        hours, days = index["hours"], index["days"]
+        # Hour buckets are contiguous back to the oldest retained one
+        use_hours = bool(hours) and min(hours) <= hour_key
+
+        result = new_counter()
+        for day, per_command in days.items():
+            if day > day_key or (day == day_key and not use_hours):
+                self._merge_bucket(result, per_command, command)
+        if use_hours:
+            for hour, per_command in hours.items():
+                if hour.startswith(day_key) and hour >= hour_key:
+                    self._merge_bucket(result, per_command, command)
+        return result
+
+    def commands(self):
+        """Per-command counters"""
+        return self.index()["commands"]
+
+    def entries(self):
+        """Iterate every raw entry still on disk, oldest first"""
+        self.flush()
+        for segment in self._segment_files():
+            yield from self._read_entries(segment)
+        if self.path.exists():
+            yield from self._read_entries(self.path)
+
+    def query(self, start=None, end=None, command=None):
+        """
+        Iterate entries with start <= timestamp < end (ISO strings, either
+        bound optional), oldest first, optionally of one command. Only the
+        segments whose time range overlaps the window are read.
+        """
+        index = self.index()
+        for segment in index["segments"]:
+            first, last = segment.get("first"), segment.get("last")
+            if (start and last and last < start) or (end and first and first >= end):
+                continue
+            yield from self._read_window(self._segment_path(segment["name"]), start, end, command)
+        if self.path.exists():
+            yield from self._read_window(self.path, start, end, command)
+
+    def segments(self):
+        """Sealed segments as listed in the index, with their headers and sizes"""
+        result = []
+        for segment in self.index()["segments"]:
+            path = self._segment_path(segment["name"])
+            info = dict(segment, bytes=self._size(path))
+            header = read_segment_header(path) if path.suffix == ".gz" else None
+            if header:
+                info.update(statuses=header["statuses"], violations=header["violations"])
+            result.append(info)
+        return result
+
+    # ------------------------------------------------------------------
+    # Internals
+
+    def _locked(self):
+        """Exclusive lock shared by every writer of this log"""
+        if not self._dir_ready:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._dir_ready = True
+        return _FileLock(self.lock_path)
+
+    def _is_current(self):
+        index = self._index
+        return (index is not None
+                and self._index_stat == self._stat(self.index_path)
+                and index["active_offset"] == self._size(self.path)
+                and all(self._segment_path(s["name"]).exists() for s in index["segments"]))
+
+    def _refresh_index(self):
+        """Index as on disk plus the active segment's tail (lock held)"""
+        stat = self._stat(self.index_path)
+        if self._index is None or stat != self._index_stat:
+            self._index_stat = stat  # Replaced if loading rebuilds and saves
+            self._index = self._load_index()  # Another writer committed
+
+        index = self._index
+        size = self._size(self.path)
+        sealed_ok = all(self._segment_path(s["name"]).exists() for s in index["segments"])
+
+        if size < index["active_offset"] or not sealed_ok:
+            # Log was truncated, rotated or edited by hand: rebuild
+            index = self._index = self._rebuild_index()
+            self._save_index(index)
+        elif size > index["active_offset"]:
+            # Appended by a writer that does not maintain the index
+            for entry in self._read_entries(self.path, index["active_offset"]):
+                self._count(index, entry)
+            index["active_offset"] = size
+            self._save_index(index)
+
+        return index
+
+    def _stat(self, path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def _size(self, path):
+        try:
+            return os.stat(path).st_size
+        except OSError:
+            return 0
+
+    def _merge_bucket(self, result, per_command, command):
+        if command is None:
+            for counter in per_command.values():
+                merge_counter(result, counter)
+        elif command in per_command:
+            merge_counter(result, per_command[command])
+
+    def _segment_path(self, name):
+        return self.path.with_name(name)
+
+    def _segment_number(self, name):
+        """Sequence number of a sealed segment file name, or None"""
+        number = name[len(self.path.name) + 1:].removesuffix(".gz")
+        if name.startswith(self.path.name + ".") and number.isdigit():
+            return int(number)
+        return None
+
+    def _segment_files(self):
+        """Sealed segments on disk, oldest first (compressed copy preferred)"""
+        segments = {}
+        if self.path.parent.exists():
+            for candidate in self.path.parent.iterdir():
+                number = self._segment_number(candidate.name)
+                if number is not None and (number not in segments or candidate.suffix == ".gz"):
+                    segments[number] = candidate
+        return [segments[number] for number in sorted(segments)]
+
+    def _open_segment(self, path):
+        if path.suffix == ".gz":
+            import gzip
+            return gzip.open(path, 'rt')
+        return open(path, 'r')
+
+    def _read_lines(self, path, offset=0):
+        with self._open_segment(path) as f:
+            if offset:
+                f.seek(offset)
+            for line in f:
+                if line.strip() and not line.startswith('{"' + HEADER_KEY):
+                    yield line
+
+    def _read_entries(self, path, offset=0):
+        for line in self._read_lines(path, offset):
+            yield json.loads(line)
+
+    def _read_window(self, path, start, end, command):
+        """Entries of one segment file in [start, end), optionally of one command"""
+        offset = 0
+        if start and path.suffix != ".gz":
+            offset = self._seek_timestamp(path, start)
+        for line in self._read_lines(path, offset):
+            timestamp = line_timestamp(line)
+            if start and timestamp < start:
+                continue
+            if end and timestamp >= end:
+                if path.suffix != ".gz":
+                    break  # Uncompressed segments were located by timestamp order too
+                continue
+            entry = json.loads(line)
+            if command is None or entry.get("command") == command:
+                yield entry
+
+    def _seek_timestamp(self, path, timestamp):
+        """Byte offset of the first line at or after `timestamp` (binary search)"""
+        import mmap
+
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if not size:
+                return 0
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                def line_start(pos):
+                    if pos == 0:
+                        return 0
+                    newline = view.find(b"\n", pos - 1)
+                    return size if newline < 0 else newline + 1
+
+                def timestamp_at(pos):
+                    newline = view.find(b"\n", pos)
+                    line = view[pos:newline if newline >= 0 else size]
+                    return line_timestamp(line.decode("utf-8", "replace"))
+
+                lo, hi = 0, size
+                while lo < hi:
+                    mid = (lo + hi) // 2
+                    pos = line_start(mid)
+                    if pos >= size or timestamp_at(pos) >= timestamp:
+                        hi = mid
+                    else:
+                        lo = mid + 1
+                return line_start(lo)
+
+    def _seal_active(self, index):
+        """Move the active segment aside, compress it and start a new one"""
+        number = 1 + max((self._segment_number(s["name"]) for s in index["segments"]), default=0)
+        name = f"{self.path.name}.{number}"
+        os.replace(self.path, self._segment_path(name))
+        header = dict(index.pop("active_counter", None) or new_counter(),
+                      name=name + ".gz",
+                      first=index.pop("active_first", None),
+                      last=index.pop("active_last", None))
+        if self._compress_segment(self._segment_path(name), header):
+            name = header["name"]
+        index["segments"].append({
+            "name": name,
+            "entries": index["active_entries"],
+            "first": header["first"],
+            "last": header["last"],
+        })
+        index["active_entries"] = 0
+        index["active_offset"] = 0
+
+    def _compress_segment(self, path, header):
+        """
+        Write path + ".gz" (header member, then the entries) and remove the
+        plain file. On failure the plain segment stays in place.
+        """
+        import gzip
+
+        target = path.with_name(header["name"])
+        tmp_path = path.with_name(f"{target.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'wb') as out:
+                line = json.dumps({HEADER_KEY: header}) + "\n"
+                out.write(gzip.compress(line.encode("utf-8"), mtime=0))
+                with open(path, 'rb') as src, gzip.GzipFile(fileobj=out, mode='wb', mtime=0) as gz:
+                    for block in iter(lambda: src.read(1 << 20), b""):
+                        gz.write(block)
+            os.replace(tmp_path, target)
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            return False
+        path.unlink()  # The .gz copy is preferred if this is interrupted
+        return True
+
+    def _empty_index(self):
+        index = {
+            "version": INDEX_VERSION,
+            "active_offset": 0,
+            "active_entries": 0,
+            "segments": [],
+            "compacted": {"entries": 0, "through": None},
+        }
+        index.update(empty_aggregates())
+        return index
+
+    def _count(self, index, entry):
+        fold_entry(index, entry)
+        index["active_entries"] += 1
+        count_entry(index.setdefault("active_counter", new_counter()),
+                    entry.get("status", "UNKNOWN"), entry.get("violations", []))
+        timestamp = entry.get("timestamp")
+        if timestamp:
+            index.setdefault("active_first", timestamp)
+            index["active_last"] = timestamp
+
+    def _rebuild_index(self):
+        index = self._empty_index()
+        base = self._load_compacted()
+        merge_aggregates(index, base)
+        index["compacted"]["entries"] = base["totals"]["entries"]
+
+        for segment in self._segment_files():
+            before = index["totals"]["entries"]
+            first = last = None
+            for entry in self._read_entries(segment):
+                fold_entry(index, entry)
+                first = first or entry.get("timestamp")
+                last = entry.get("timestamp") or last
+            index["segments"].append({
+                "name": segment.name,
+                "entries": index["totals"]["entries"] - before,
+                "first": first,
+                "last": last,
+            })
+
+        if self.path.exists():
+            for entry in self._read_entries(self.path):
+                self._count(index, entry)
+            index["active_offset"] = self.path.stat().st_size
+        return index
+
+    def _load_compacted(self):
+        try:
+            with open(self.compacted_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return empty_aggregates()
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, 'r') as f:
+                index = json.load(f)
+            if index.get("version") == INDEX_VERSION:
+                return index
+        except (OSError, ValueError):
+            pass
+        index = self._rebuild_index()
+        if index["totals"]["entries"]:
+            self._save_index(index)
+        return index
+
+    def _save_index(self, index):
+        self._save_json(self.index_path, index)
+        self._index = index
+        self._index_stat = self._stat(self.index_path)
+
+    def _save_json(self, path, data):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+
+# Logs holding queued entries, flushed before a fork and at exit
+_pending_logs = set()
+_hooks_registered = False
+
+
+def _track_pending(log):
+    global _hooks_registered
+    if not _hooks_registered:
+        import atexit
+        atexit.register(flush_pending)
+        if hasattr(os, "register_at_fork"):
+            # A child must not inherit (and commit again) the parent's queue
+            os.register_at_fork(before=flush_pending)
+        _hooks_registered = True
+    _pending_logs.add(log)
+
+
+def flush_pending():
+    """Commit the queued entries of every log in this process"""
+    for log in list(_pending_logs):
+        log.flush()
+
+
+class _FileLock:
+    """fcntl.flock on a lock file for the duration of a with block"""
+
+    def __init__(self, path):
+        self.path = path
+        self.fd = None
+
+    def __enter__(self):
+        if fcntl is not None:
+            self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if self.fd is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+            os.close(self.fd)
+            self.fd = None
+        return False
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+File System Watch
+Reports which files under a directory tree changed, for memory-watch.py.
+
+  InotifyWatcher   Linux inotify through a small ctypes binding to libc:
+                   one watch per directory, new directories are watched
+                   (and their files reported) as they appear
+  PollingWatcher   stats the tree every `interval` seconds and reports
+                   files whose mtime or size changed, appeared or vanished
+
+Both offer wait(timeout) -> set of changed relative posix paths (empty on
+timeout), or None when changes were lost (inotify queue overflow, a watched
+directory moved or deleted) and the caller should rescan everything.
+Hidden files and directories (.cache, .enforcement.log) are ignored.
+open_watcher() picks inotify and falls back to polling where it is not
+available (other platforms, no libc symbol, watch limit reached).
+"""
+
+import os
+import sys
+import time
+
+POLL_INTERVAL = 1.0
+
+# <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+              | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+
+_EVENT_HEADER = 16  # struct inotify_event: int wd; uint32 mask, cookie, len
+
+
+class InotifyWatcher:
+    """Change notifications from inotify (Linux)"""
+
+    backend = "inotify"
+
+    def __init__(self, root):
+        import ctypes
+
+        self.root = str(root)
+        self._ctypes = ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        try:
+            self._init = libc.inotify_init1
+            self._add_watch = libc.inotify_add_watch
+        except AttributeError:
+            raise OSError("inotify is not available")
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+
+        self._fd = self._init(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise self._error("inotify_init1")
+        self._dirs = {}  # wd -> relative directory
+        self._changed = set()
+        try:
+            self._watch_tree("", report=False)
+        except OSError:
+            self.close()
+            raise
+
+    def wait(self, timeout):
+        """Changed paths, once any arrive or `timeout` seconds pass"""
+        import select
+
+        deadline = time.monotonic() + timeout
+        lost = False
+        while not self._changed and not lost:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([self._fd], [], [], remaining)[0]:
+                break
+            lost = self._read_events()
+        changed, self._changed = self._changed, set()
+        return None if lost else changed
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _read_events(self):
+        """Drain the queue into self._changed; True when events were lost"""
+        import struct
+
+        lost = False
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return lost
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = struct.unpack_from("iIII", data, offset)
+                name = data[offset + _EVENT_HEADER:offset + _EVENT_HEADER + length]
+                offset += _EVENT_HEADER + length
+                name = os.fsdecode(name.rstrip(b"\0"))
+
+                if mask & IN_Q_OVERFLOW:
+                    lost = True
+                    continue
+                rel_dir = self._dirs.get(wd)
+                if rel_dir is None:
+                    continue
+                if mask & IN_IGNORED:
+                    del self._dirs[wd]
+                    continue
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                    lost = lost or bool(rel_dir)  # Files below it went unreported
+                    continue
+                if not name or name.startswith("."):
+                    continue
+                rel_path = f"{rel_dir}/{name}" if rel_dir else name
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        self._watch_tree(rel_path, report=True)
+                    elif mask & IN_MOVED_FROM:
+                        lost = True
+                else:
+                    self._changed.add(rel_path)
+
+    def _watch_tree(self, rel_dir, report):
+        """Watch a directory and its subdirectories; report=True lists their files"""
+        path = os.path.join(self.root, rel_dir) if rel_dir else self.root
+        wd = self._add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            error = self._error("inotify_add_watch")
+            if rel_dir and isinstance(error, FileNotFoundError):
+                return  # Gone again before we got to it
+            raise error
+        self._dirs[wd] = rel_dir
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.name.startswith("."):
+                        continue
+                    rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        self._watch_tree(rel_path, report)
+                    elif report:
+                        self._changed.add(rel_path)
+        except OSError:
+            pass
+
+    def _error(self, call):
+        errno = self._ctypes.get_errno()
+        return OSError(errno, f"{call}: {os.strerror(errno)}")
+
+
+class PollingWatcher:
+    """Change detection by periodic stat scans"""
+
+    backend = "poll"
+
+    def __init__(self, root, interval=POLL_INTERVAL):
+        self.root = str(root)
+        self.interval = interval
+        self._stamps = self._scan()
+
+    def wait(self, timeout):
+        """Changed paths, once any are seen or `timeout` seconds pass"""
+        deadline = time.monotonic() + timeout
+        while True:
+            stamps = self._scan()
+            changed = {rel for rel in stamps.keys() | self._stamps.keys()
+                       if stamps.get(rel) != self._stamps.get(rel)}
+            self._stamps = stamps
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0:
+                return changed
+            time.sleep(min(self.interval, remaining))
+
+    def close(self):
+        pass
+
+    def _scan(self):
+        stamps = {}
+        pending = [""]
+        while pending:
+            rel_dir = pending.pop()
+            path = os.path.join(self.root, rel_dir) if rel_dir else self.root
+            try:
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        if entry.name.startswith("."):
+                            continue
+                        rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(rel_path)
+                        elif entry.is_file():
+                            st = entry.stat()
+                            stamps[rel_path] = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                continue
+        return stamps
+
+
+def open_watcher(root, poll=False, interval=POLL_INTERVAL):
+    """InotifyWatcher where possible, else PollingWatcher"""
+    if not poll and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(root)
+        except OSError:
+            pass
+    return PollingWatcher(root, interval)
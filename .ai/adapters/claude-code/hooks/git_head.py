@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Git HEAD Reader
+Resolves the current branch by reading HEAD directly instead of running
+`git rev-parse --abbrev-ref HEAD`. Supports `.git` directories and `.git`
+files with a `gitdir:` pointer (worktrees, submodules). Results are cached
+per process keyed on HEAD's inode, mtime and size, so repeated lookups in a
+long-lived hook process cost one stat. An unborn branch (HEAD names a ref
+that has no loose file and no packed-refs entry, as in a fresh repository)
+reports None like git does, and is not cached so the first commit is seen.
+Anything unusual (GIT_DIR set, symbolic refs outside refs/heads, unreadable
+HEAD, reftable repositories whose HEAD file is only a placeholder) falls
+back to git itself.
+"""
+
+import os
+
+import hook_timing
+
+# HEAD of a reftable repository, kept only so older git sees a repository
+REFTABLE_PLACEHOLDER = ".invalid"
+
+# working directory -> HEAD path
+_head_paths = {}
+# HEAD path -> ((inode, mtime_ns, size), branch)
+_branches = {}
+
+
+def find_head(start):
+    """Path of the HEAD file for the repository containing `start`, or None"""
+    path = os.path.abspath(start)
+    while True:
+        dot_git = os.path.join(path, ".git")
+        if os.path.isdir(dot_git):
+            return os.path.join(dot_git, "HEAD")
+        if os.path.isfile(dot_git):
+            git_dir = _read_gitdir_file(dot_git)
+            if git_dir is None:
+                return None
+            if not os.path.isabs(git_dir):
+                git_dir = os.path.join(path, git_dir)
+            return os.path.join(os.path.normpath(git_dir), "HEAD")
+
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+
+def current_branch(cwd=None):
+    """
+    Branch name as `git rev-parse --abbrev-ref HEAD` reports it ("HEAD" when
+    detached), or None outside a repository.
+    """
+    with hook_timing.phase("git"):
+        return _current_branch(cwd)
+
+
+def _current_branch(cwd):
+    if "GIT_DIR" in os.environ:
+        return _branch_from_git(cwd)
+
+    cwd = cwd or os.getcwd()
+    head = _head_paths.get(cwd)
+    stat = _stat(head) if head else None
+    if stat is None:
+        head = find_head(cwd)
+        if head is None:
+            return None
+        stat = _stat(head)
+        if stat is None:
+            return _branch_from_git(cwd)
+        _head_paths[cwd] = head
+
+    cached = _branches.get(head)
+    if cached and cached[0] == stat:
+        return cached[1]
+
+    branch = _branch_from_head(head)
+    if branch == REFTABLE_PLACEHOLDER:
+        # The real HEAD is in the reftable stack, and the file never changes
+        # on a switch, so ask git every time rather than caching on its stat
+        return _branch_from_git(cwd)
+    if branch is None:
+        branch = _branch_from_git(cwd)
+    elif branch != "HEAD" and not _ref_exists(os.path.dirname(head), "refs/heads/" + branch):
+        return None  # Unborn: no commit on this branch yet
+    _branches[head] = (stat, branch)
+    return branch
+
+
+def _stat(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _read_gitdir_file(dot_git):
+    try:
+        with open(dot_git, 'r', encoding='utf-8') as f:
+            line = f.readline().strip()
+    except OSError:
+        return None
+    if line.startswith("gitdir:"):
+        return line[len("gitdir:"):].strip()
+    return None
+
+
+def _branch_from_head(head):
+    """Parse HEAD; None when the content needs git to interpret"""
+    try:
+        with open(head, 'r', encoding='utf-8') as f:
+            content = f.read().strip()
+    except OSError:
+        return None
+
+    if content.startswith("ref: refs/heads/"):
+        return content[len("ref: refs/heads/"):]
+    if len(content) in (40, 64) and all(c in "0123456789abcdef" for c in content):
+        return "HEAD"  # Detached
+    return None
+
+
+def _ref_exists(git_dir, ref):
+    """Whether `ref` exists as a loose ref or in packed-refs"""
+    common_dir = git_dir
+    try:
+        with open(os.path.join(git_dir, "commondir"), 'r', encoding='utf-8') as f:
+            common_dir = os.path.normpath(os.path.join(git_dir, f.read().strip()))
+    except OSError:
+        pass  # Not a linked worktree
+
+    for base in {git_dir, common_dir}:
+        if os.path.isfile(os.path.join(base, ref)):
+            return True
+    try:
+        with open(os.path.join(common_dir, "packed-refs"), 'r', encoding='utf-8') as f:
+            suffix = " " + ref
+            return any(line.rstrip("\n").endswith(suffix) and not line.startswith(("#", "^"))
+                       for line in f)
+    except OSError:
+        return False
+
+
+def _branch_from_git(cwd):
+    """Fallback for layouts this module does not understand"""
+    import subprocess
+
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--abbrev-ref", "HEAD"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+            cwd=cwd
+        )
+        if result.returncode == 0:
+            return result.stdout.strip()
+    except (subprocess.TimeoutExpired, FileNotFoundError):
+        pass
+    return None
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Guide Cache
+Compiled form of the writing guides in .ai/template/guides/ (parsed section
+map and rendered prompt), persisted with marshal next to the guides in
+.ai/template/guides/.cache/guides.marshal. An entry is reused while the
+guide's mtime and size are unchanged, and revalidated by content hash when
+they are not (checkouts, touch), so a pre-check or prompt request reads one
+small marshal file instead of re-reading and re-parsing the markdown.
+
+What "compiled" means is up to the caller: get() takes a
+compile_guide(content) function and a version, and an entry compiled with
+another version is compiled again. warm() compiles every *-guide.md at once and drops entries
+of guides that no longer exist.
+"""
+
+import marshal
+import os
+
+CACHE_VERSION = 1
+GUIDE_SUFFIX = "-guide.md"
+
+
+class GuideCache:
+    """Persistent per-guide compiled content"""
+
+    def __init__(self, guides_dir, cache_path=None):
+        self.guides_dir = str(guides_dir)
+        self.cache_path = cache_path or os.path.join(self.guides_dir, ".cache", "guides.marshal")
+        self._entries = None
+
+    def get(self, name, compile_guide, version):
+        """
+        Compiled entry of a guide file name (what compile_guide() returns,
+        e.g. {"sections", "prompt"}, plus "stamp", "sha256" and "version"),
+        or None when the guide does not exist.
+        """
+        if self._entries is None:
+            self._entries = self._load()
+        entry, status = self._get(name, compile_guide, version)
+        if status in ("refreshed", "compiled", "removed"):
+            self._save()
+        return entry
+
+    def warm(self, compile_for, version):
+        """
+        Compile every guide; compile_for(name) returns the compile function
+        for a guide. Returns {"guides", "compiled", "removed"} counts.
+        """
+        if self._entries is None:
+            self._entries = self._load()
+        try:
+            names = sorted(n for n in os.listdir(self.guides_dir) if n.endswith(GUIDE_SUFFIX))
+        except OSError:
+            names = []
+
+        compiled = 0
+        for name in names:
+            _, status = self._get(name, compile_for(name), version)
+            compiled += status == "compiled"
+        removed = [name for name in self._entries if name not in names]
+        for name in removed:
+            del self._entries[name]
+        self._save()
+        return {"guides": len(names), "compiled": compiled, "removed": len(removed)}
+
+    def _get(self, name, compile_guide, version):
+        """(entry or None, "hit" | "refreshed" | "compiled" | "missing" | "removed")"""
+        path = os.path.join(self.guides_dir, name)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None, "missing" if self._entries.pop(name, None) is None else "removed"
+
+        stamp = [st.st_mtime_ns, st.st_size]
+        entry = self._entries.get(name)
+        if entry and entry["version"] == version and entry["stamp"] == stamp:
+            return entry, "hit"
+
+        import hashlib
+
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None, "missing"
+        digest = hashlib.sha256(data).hexdigest()
+        if entry and entry["version"] == version and entry["sha256"] == digest:
+            entry["stamp"] = stamp
+            return entry, "refreshed"
+
+        entry = dict(compile_guide(data.decode("utf-8")))
+        entry.update(stamp=stamp, sha256=digest, version=version)
+        self._entries[name] = entry
+        return entry, "compiled"
+
+    def _load(self):
+        try:
+            with open(self.cache_path, 'rb') as f:
+                cache = marshal.loads(f.read())
+            if cache.get("version") == CACHE_VERSION:
+                return cache["guides"]
+        except (OSError, EOFError, ValueError, TypeError, KeyError, AttributeError):
+            pass
+        return {}
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                marshal.dump({"version": CACHE_VERSION, "guides": self._entries}, f)
+            os.replace(tmp_path, self.cache_path)
+        except (OSError, ValueError):
+            pass  # Cache is best-effort
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Hook Client
+Tiny shim for the hook configuration: forwards stdin to the hook server and
+relays the hook's exit code, stdout and stderr unchanged. Falls back to
+running the hook in-process when the server is not running or does not take
+the request within TIMEOUT; once the request is sent the client waits for
+the reply, so a slow call is never run a second time.
+
+Usage (in .claude/settings.json):
+  python .claude/hooks/hook-client.py deny-dangerous-bash
+  python .claude/hooks/hook-client.py command-enforcer --check /van
+
+Only builtin modules are imported on the fast path (_socket, marshal) so the
+shim costs little more than bare interpreter startup.
+
+The socket is used only when it is a socket owned by the calling user
+(hook_runtime.check_socket); anything else at that path is ignored and the
+hook runs in-process, so another local user cannot answer for the hooks.
+"""
+
+import _socket
+import marshal
+import os
+import sys
+
+import hook_runtime
+
+# Server must take the request within this window, otherwise evaluate locally
+TIMEOUT = float(os.environ.get("HOOK_DAEMON_TIMEOUT", "10"))
+
+
+class ServerFailed(Exception):
+    """The server took the request but gave no usable reply"""
+
+
+def call_server(path, header, payload):
+    """
+    Forward one call. Raises OSError while the request is not yet delivered
+    (the hook has not run) and ServerFailed once it is (it may have run).
+    """
+    hook_runtime.check_socket(path)
+    sock = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    try:
+        sock.settimeout(TIMEOUT)
+        sock.connect(path)
+        sock.sendall(marshal.dumps((header, payload)))
+        sock.shutdown(_socket.SHUT_WR)
+        sock.settimeout(None)  # Delivered: wait however long the hook takes
+        try:
+            return marshal.loads(_receive(sock))
+        except (OSError, ValueError, EOFError, TypeError) as e:
+            raise ServerFailed(e) from e
+    finally:
+        sock.close()
+
+
+def _receive(sock):
+    chunks = []
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("usage: hook-client.py <hook-name> [args...]", file=sys.stderr)
+        sys.exit(1)
+
+    name, argv = sys.argv[1], sys.argv[2:]
+    payload = b"" if sys.stdin.isatty() else sys.stdin.buffer.read()
+    cwd = os.getcwd()
+
+    header = {"hook": name, "argv": argv, "cwd": cwd, "env": hook_runtime.forwarded_env()}
+
+    try:
+        result = call_server(hook_runtime.socket_path(), header, payload)
+    except (OSError, ValueError):
+        result = None
+    except ServerFailed as e:
+        # The hook may already have run (and logged): report, do not rerun it
+        print(f"hook-client: hook server failed during {name}: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    if result is None:
+        # Server not running or unusable: evaluate in this process
+        result = hook_runtime.run_hook(name, argv, payload, cwd)
+
+    code, out, err = result
+
+    sys.stdout.write(out)
+    sys.stderr.write(err)
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Hook: Dispatch
+Purpose: Single PreToolUse entry point for every safety rule. Parses the
+tool payload once, routes on tool_name to the rules registered for that
+tool (rules/__init__.py) and stops at the first blocking verdict.
+Exit Code 2: Blocks the tool call and returns stderr to AI.
+
+Rules for other tools are never imported. Replaces separate
+deny-dangerous-bash.py / forbid-write-main.py entries in settings:
+
+  "PreToolUse": [{"matcher": "Bash|Write|Edit", "hooks": [
+    {"type": "command", "command": "python .claude/hooks/hook-dispatch.py"}]}]
+"""
+import sys
+
+import hook_profile
+import rules
+
+
+def main():
+    sys.exit(rules.run_stdin())
+
+
+if __name__ == "__main__":
+    hook_profile.run_main(main)
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Hook Server
+Long-lived process that keeps the hook scripts, their pattern tables,
+COMMAND_TEMPLATES and the guide data loaded, and answers hook calls from
+hook-client.py over a local Unix socket.
+
+Usage:
+  hook-server.py start    # start in the background
+  hook-server.py run      # run in the foreground
+  hook-server.py stop
+  hook-server.py status
+
+Protocol (one call per connection, marshal-encoded, socket is user-only):
+  request:  (header, payload) with header {"op", "hook", "argv", "cwd", "env"}
+            and the raw stdin bytes, then EOF
+  response: (code, stdout, stderr) for hook calls, a status dict otherwise
+"""
+
+import json
+import marshal
+import os
+import signal
+import socket
+import socketserver
+import subprocess
+import sys
+import time
+
+import hook_runtime
+
+
+class HookRequestHandler(socketserver.StreamRequestHandler):
+    """Serve a single hook call"""
+
+    def handle(self):
+        header, payload = marshal.loads(self.rfile.read())
+        op = header.get("op", "run")
+
+        if op == "ping":
+            response = self.server.status()
+        elif op == "shutdown":
+            response = {"stopping": True}
+            self.server.stopping = True
+        else:
+            response = hook_runtime.run_hook(
+                header.get("hook", ""),
+                header.get("argv", []),
+                payload,
+                header.get("cwd"),
+                header.get("env"),
+            )
+            self.server.served += 1
+
+        self.wfile.write(marshal.dumps(response))
+
+
+class HookServer(socketserver.UnixStreamServer):
+    """
+    Serial Unix socket server. Hook calls are handled one at a time because
+    each call swaps the process-wide stdin/stdout/stderr, argv and cwd.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.started = time.time()
+        self.served = 0
+        self.stopping = False
+        if os.path.exists(path):
+            if socket_answers(path):
+                raise FileExistsError(f"Hook server already running on {path}")
+            os.unlink(path)  # Stale socket left by a server that died
+        old_umask = os.umask(0o077)  # socket is private to this user
+        try:
+            super().__init__(path, HookRequestHandler)
+        finally:
+            os.umask(old_umask)
+
+    def status(self):
+        return {
+            "pid": os.getpid(),
+            "socket": self.path,
+            "uptime": round(time.time() - self.started, 3),
+            "served": self.served,
+            "hooks": sorted(hook_runtime.HOOK_SCRIPTS),
+            "verdict_cache": self.verdict_cache_stats(),
+        }
+
+    def verdict_cache_stats(self):
+        """In-memory bash verdict cache counters, once a Bash call loaded it"""
+        verdict_cache = sys.modules.get("verdict_cache")
+        return verdict_cache.memory_stats() if verdict_cache else None
+
+    def serve(self):
+        while not self.stopping:
+            self.handle_request()
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+def socket_answers(path, timeout=1.0):
+    """Whether a server accepts connections on `path`"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        try:
+            sock.connect(path)
+        except OSError:
+            return False
+    return True
+
+
+def request(path, header, timeout=2.0):
+    """Send a control request to a running server"""
+    hook_runtime.check_socket(path)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall(marshal.dumps((header, b"")))
+        sock.shutdown(socket.SHUT_WR)
+        return marshal.loads(sock.makefile("rb").read())
+
+
+def run_foreground(path):
+    """Preload every hook and serve until stopped"""
+    hook_runtime.persistent_process = True
+    hook_runtime.preload()
+    try:
+        server = HookServer(path)
+    except FileExistsError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))  # Exit through the finally below
+    try:
+        server.serve()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        flush_logs()
+
+
+def flush_logs():
+    """Commit enforcement log entries the hooks still have queued"""
+    enforcement_log = sys.modules.get("enforcement_log")
+    if enforcement_log is not None:
+        enforcement_log.flush_pending()
+
+
+def start_background(path, wait=5.0):
+    """Start the server detached and wait until it answers"""
+    try:
+        return request(path, {"op": "ping"})
+    except OSError:
+        pass
+
+    subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "run"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+        env=dict(os.environ, HOOK_DAEMON_SOCKET=path),
+    )
+
+    deadline = time.time() + wait
+    while time.time() < deadline:
+        try:
+            return request(path, {"op": "ping"})
+        except OSError:
+            time.sleep(0.05)
+    return None
+
+
+def main():
+    """CLI interface"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Hook Server")
+    parser.add_argument("action", choices=["start", "run", "stop", "status"])
+    parser.add_argument("--socket", help="Socket path (default: per-project path)")
+
+    args = parser.parse_args()
+    path = args.socket or hook_runtime.socket_path()
+
+    if args.action == "run":
+        run_foreground(path)
+
+    elif args.action == "start":
+        status = start_background(path)
+        if status is None:
+            print(f"Hook server failed to start on {path}", file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps(status, indent=2))
+
+    elif args.action == "stop":
+        try:
+            print(json.dumps(request(path, {"op": "shutdown"}), indent=2))
+        except OSError:
+            print(f"Hook server not running on {path}", file=sys.stderr)
+            sys.exit(1)
+
+    elif args.action == "status":
+        try:
+            print(json.dumps(request(path, {"op": "ping"}), indent=2))
+        except OSError:
+            print(f"Hook server not running on {path}", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Hook Configuration
+Loads .ai/enforcement.yaml once per process. The parsed document is also
+snapshotted with marshal under .ai/.cache/, keyed on the YAML file's mtime
+and size and revalidated by its sha256 when those change (checkouts, touch),
+so cold hook starts skip YAML parsing (and the yaml import) entirely.
+PyYAML is optional: without it and without a snapshot, the config is empty
+and hooks fall back to their built-in defaults where they have them.
+"""
+
+import marshal
+import os
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+CONFIG_PATH = os.path.join(PROJECT_ROOT, ".ai", "enforcement.yaml")
+CACHE_DIR = os.path.join(PROJECT_ROOT, ".ai", ".cache")
+SNAPSHOT_PATH = os.path.join(CACHE_DIR, "enforcement.marshal")
+
+_config = None
+_config_stamp = None
+
+
+def config_stamp():
+    """(mtime_ns, size) of enforcement.yaml, or None when it does not exist"""
+    try:
+        st = os.stat(CONFIG_PATH)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def load_config():
+    """Parsed enforcement.yaml ({} when missing or unreadable)"""
+    global _config, _config_stamp
+
+    stamp = config_stamp()
+    if _config is not None and stamp == _config_stamp:
+        return _config
+
+    import hook_timing
+
+    config = {}
+    with hook_timing.phase("config"):
+        if stamp:
+            snapshot = _load_snapshot()
+            if snapshot.get("stamp") == stamp:
+                config = snapshot["config"]
+            else:
+                config = _reload(stamp, snapshot)
+
+    _config, _config_stamp = config, stamp
+    return config
+
+
+def section(name, default=None):
+    """Top-level section of enforcement.yaml"""
+    value = load_config().get(name)
+    return default if value is None else value
+
+
+def _reload(stamp, snapshot):
+    """Config for a changed stamp: reuse the snapshot if the content is the same"""
+    import hashlib
+
+    try:
+        with open(CONFIG_PATH, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return {}
+
+    digest = hashlib.sha256(data).hexdigest()
+    if snapshot.get("sha256") == digest:
+        config = snapshot["config"]
+    else:
+        config = _parse_yaml(data)
+        if config is None:
+            return {}
+    _save_snapshot({"stamp": stamp, "sha256": digest, "config": config})
+    return config
+
+
+def _parse_yaml(data):
+    try:
+        import yaml
+    except ImportError:
+        return None
+    try:
+        return yaml.safe_load(data) or {}
+    except yaml.YAMLError:
+        return None
+
+
+def _load_snapshot():
+    try:
+        with open(SNAPSHOT_PATH, 'rb') as f:
+            snapshot = marshal.loads(f.read())
+        if isinstance(snapshot, dict) and "config" in snapshot:
+            return snapshot
+    except (OSError, ValueError, EOFError, TypeError):
+        pass
+    return {}
+
+
+def _save_snapshot(snapshot):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{SNAPSHOT_PATH}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            marshal.dump(snapshot, f)
+        os.replace(tmp_path, SNAPSHOT_PATH)
+    except (OSError, ValueError):
+        pass  # Cache is best-effort (or the config holds non-marshallable values)
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Hook Payload Reader
+Pulls selected keys out of the JSON tool payload on stdin without parsing
+the rest. Write and Edit payloads carry whole file contents, but the hooks
+only need `tool_name` and one or two `tool_input` fields.
+
+The payload is read in chunks. Values that are not wanted are skipped at the
+byte level without being decoded: in a string, escaped backslashes and
+quotes are blanked out per chunk with bytes.replace (same length, so offsets
+hold) and the closing quote is a plain find; containers are skipped by
+bracket depth. Parsing stops as soon as every wanted key has been seen, so
+content after the wanted fields is never scanned. Wanted values are decoded
+with json.loads.
+
+Only the wanted keys are validated; a malformed payload is reported as
+ValueError when the malformed part is actually reached.
+"""
+
+import json
+import re
+import sys
+
+CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = b" \t\r\n"
+_STRUCTURE = re.compile(rb'["{}\[\]]')
+_SCALAR_END = re.compile(rb'[,}\]\s]')
+
+_QUOTE, _LBRACE, _RBRACE, _LBRACKET, _COLON, _COMMA, _BACKSLASH = b'"{}[:,\\'
+
+
+def read_payload(stream, wanted, until=None, drain=True):
+    """
+    Parse only the `wanted` keys of a JSON object read from a binary stream.
+
+    `wanted` maps key -> True (take the value) or a nested dict (descend
+    into an object value), e.g. {"tool_name": True, "tool_input":
+    {"command": True}}. A callable spec is resolved when its key is reached,
+    with the keys parsed so far (e.g. pick tool_input fields by tool_name).
+    Returns the same shape holding the keys found.
+    `until(result)` may end parsing early, e.g. once tool_name shows the
+    payload is for another tool. With `drain`, the rest of the stream is
+    read and discarded so the writer never sees a closed pipe.
+    """
+    reader = _Reader(stream)
+    try:
+        if reader.peek() != _LBRACE:
+            raise ValueError("Payload is not a JSON object")
+        result, _ = reader.parse_object(wanted, top=True, until=until)
+        return result
+    finally:
+        if drain:
+            reader.drain()
+
+
+def read_stdin_payload(wanted, until=None):
+    """read_payload() on this process's stdin"""
+    stream = getattr(sys.stdin, "buffer", None)
+    if stream is None:
+        import io
+        stream = io.BytesIO(sys.stdin.read().encode("utf-8"))
+    return read_payload(stream, wanted, until)
+
+
+class _Reader:
+    def __init__(self, stream, chunk_size=CHUNK_SIZE):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buf = b""
+        self.pos = 0
+        self.capture = None
+        self.mark = 0
+
+    def fill(self):
+        """Append the next chunk, dropping consumed bytes; False at EOF"""
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            return False
+        if self.capture is not None:
+            self.capture.append(self.buf[self.mark:self.pos])
+            self.mark = 0
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def drain(self):
+        if hasattr(self.stream, "readinto"):
+            scratch = bytearray(self.chunk_size)
+            while self.stream.readinto(scratch):
+                pass
+        else:
+            while self.stream.read(self.chunk_size):
+                pass
+
+    def peek(self):
+        """Next non-whitespace byte (not consumed), or None at EOF"""
+        while True:
+            buf, pos = self.buf, self.pos
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self.fill():
+                return None
+
+    def expect(self, byte):
+        if self.peek() != byte:
+            raise ValueError(f"Expected {chr(byte)!r} in payload")
+        self.pos += 1
+
+    # ------------------------------------------------------------------
+    # Skipping
+
+    def skip_value(self):
+        first = self.peek()
+        if first is None:
+            raise ValueError("Unexpected end of payload")
+        if first == _QUOTE:
+            self.skip_string()
+        elif first in (_LBRACE, _LBRACKET):
+            self.skip_container()
+        else:
+            self.skip_scalar()
+
+    def skip_string(self):
+        self.pos += 1  # Opening quote
+        buf, start = self.buf, self.pos
+        # Short strings: check the first few quotes directly
+        for _ in range(8):
+            end = buf.find(b'"', start)
+            if end < 0:
+                break
+            backslashes = 0
+            while end - backslashes > self.pos and buf[end - backslashes - 1] == _BACKSLASH:
+                backslashes += 1
+            if backslashes % 2 == 0:
+                self.pos = end + 1
+                return
+            start = end + 1
+
+        while True:
+            region = self.buf[self.pos:].replace(b"\\\\", b"__").replace(b'\\"', b"__")
+            end = region.find(b'"')
+            if end >= 0:
+                self.pos += end + 1
+                return
+            # An unpaired trailing backslash escapes the first byte of the next chunk
+            self.pos += len(region) - region.endswith(b"\\")
+            if not self.fill():
+                raise ValueError("Unterminated string in payload")
+
+    def skip_container(self):
+        depth = 0
+        while True:
+            match = _STRUCTURE.search(self.buf, self.pos)
+            if match is None:
+                self.pos = len(self.buf)
+                if not self.fill():
+                    raise ValueError("Unterminated container in payload")
+                continue
+            self.pos = match.start()
+            byte = self.buf[self.pos]
+            if byte == _QUOTE:
+                self.skip_string()
+                continue
+            self.pos += 1
+            depth += 1 if byte in (_LBRACE, _LBRACKET) else -1
+            if depth == 0:
+                return
+
+    def skip_scalar(self):
+        while True:
+            match = _SCALAR_END.search(self.buf, self.pos)
+            if match is not None:
+                self.pos = match.start()
+                return
+            self.pos = len(self.buf)
+            if not self.fill():
+                return
+
+    # ------------------------------------------------------------------
+    # Reading
+
+    def read_value(self):
+        """Decode the next value in full"""
+        self.peek()
+        self.capture, self.mark = [], self.pos
+        try:
+            self.skip_value()
+            self.capture.append(self.buf[self.mark:self.pos])
+            data = b"".join(self.capture)
+        finally:
+            self.capture = None
+        return json.loads(data)
+
+    def parse_object(self, wanted, top=False, until=None):
+        """
+        Parse the object at the current position, keeping wanted keys.
+        Returns (result, complete). With `top`, the object is left unread
+        once complete (or once `until` says so); otherwise it is consumed to
+        its closing brace.
+        """
+        self.expect(_LBRACE)
+        result = {}
+        pending = set(wanted)
+
+        if self.peek() == _RBRACE:
+            self.pos += 1
+            return result, not pending
+
+        while True:
+            if self.peek() != _QUOTE:
+                raise ValueError("Expected object key in payload")
+            key = self.read_value()
+            self.expect(_COLON)
+
+            spec = wanted.get(key) if key in pending else None
+            if callable(spec):
+                spec = spec(result)
+            if spec is None:
+                pending.discard(key)  # Not wanted (or no longer wanted)
+                self.skip_value()
+            elif spec is True or self.peek() != _LBRACE:
+                result[key] = self.read_value()
+                pending.discard(key)
+            else:
+                # The last pending object may stop early too: nothing follows
+                last = top and pending == {key}
+                result[key], complete = self.parse_object(spec, top=last)
+                if complete:
+                    pending.discard(key)
+
+            if top and (not pending or (until is not None and until(result))):
+                return result, not pending
+
+            separator = self.peek()
+            self.pos += 1
+            if separator == _RBRACE:
+                return result, not pending
+            if separator != _COMMA:
+                raise ValueError("Expected ',' or '}' in payload")
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Hook Profiler
+Opt-in cProfile capture for the hook CLIs. With HOOK_PROFILE=1 in the
+environment, each run of a hook's main() (standalone, through the hook
+server or the client fallback) dumps its stats to
+
+  .ai/.cache/profiles/<hook>-<YYYYmmddTHHMMSS>-<pid>.<seq>.prof
+
+keeping the newest HOOK_PROFILE_KEEP files (default 200). <seq> numbers the
+runs of a process, as the hook server profiles many calls a second under one
+pid. Module imports happen before main() and are not part of the profile.
+
+`--merge` combines many runs into one pstats report and, with --collapsed,
+writes folded stacks ("a;b;c <microseconds>") for flamegraph.pl, speedscope
+or inferno. cProfile records caller/callee edges rather than whole stacks,
+so stacks are rebuilt from the roots down, splitting each function's time
+across its callers in proportion to the time each caller spent in it.
+
+Usage:
+  HOOK_PROFILE=1 python .claude/hooks/command-enforcer.py --validate /van
+  hook_profile.py --list
+  hook_profile.py --merge [--hook NAME] [--sort cumulative] [--limit 40]
+                  [--collapsed stacks.txt] [--output merged.prof]
+  hook_profile.py --clear
+"""
+
+import itertools
+import os
+import sys
+import time
+
+import hook_config
+
+PROFILE_DIR = os.path.join(hook_config.CACHE_DIR, "profiles")
+DEFAULT_KEEP = 200
+
+# Folded stacks: deepest frame followed and smallest time emitted
+MAX_STACK_DEPTH = 64
+MIN_STACK_US = 1
+
+_sequence = itertools.count()
+
+
+def enabled():
+    return os.environ.get("HOOK_PROFILE", "") not in ("", "0")
+
+
+def run(hook, func):
+    """Call func(), profiling it when HOOK_PROFILE is set"""
+    if not enabled():
+        return func()
+
+    import cProfile
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        return func()  # Another profiler is active in this process
+    try:
+        return func()
+    finally:
+        profiler.disable()
+        _dump(profiler, hook)
+
+
+def run_main(main):
+    """run() for a script's own `if __name__ == "__main__"` block"""
+    hook = os.path.splitext(os.path.basename(sys.argv[0]))[0]
+    return run(hook, main)
+
+
+def _dump(profiler, hook):
+    stamp = time.strftime("%Y%m%dT%H%M%S")
+    path = os.path.join(PROFILE_DIR, f"{hook}-{stamp}-{os.getpid()}.{next(_sequence)}.prof")
+    try:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        profiler.dump_stats(path)
+        _rotate(_keep())
+    except OSError:
+        pass  # Profiling is best-effort
+
+
+def _keep():
+    try:
+        return max(1, int(os.environ.get("HOOK_PROFILE_KEEP", DEFAULT_KEEP)))
+    except ValueError:
+        return DEFAULT_KEEP
+
+
+def _rotate(keep):
+    """Delete all but the newest `keep` profiles"""
+    for path in profile_files()[:-keep]:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def profile_files(hook=None):
+    """Profile files, oldest first, optionally for one hook"""
+    try:
+        names = os.listdir(PROFILE_DIR)
+    except OSError:
+        return []
+    entries = []
+    for name in names:
+        if not name.endswith(".prof"):
+            continue
+        if hook is not None and name.rsplit("-", 2)[0] != hook:
+            continue
+        path = os.path.join(PROFILE_DIR, name)
+        try:
+            entries.append((os.stat(path).st_mtime_ns, path))
+        except OSError:
+            continue
+    return [path for _, path in sorted(entries)]
+
+
+def merge(paths):
+    """pstats.Stats of all readable profiles, or None"""
+    import pstats
+
+    stats = None
+    for path in paths:
+        try:
+            if stats is None:
+                stats = pstats.Stats(path, stream=sys.stdout)
+            else:
+                stats.add(path)
+        except (OSError, EOFError, TypeError, ValueError):
+            continue  # Truncated or foreign file
+    return stats
+
+
+def collapsed_stacks(stats):
+    """
+    Folded stacks {"frame;frame;...": microseconds of self time} rebuilt
+    from pstats caller edges. Recursive edges are cut at the first repeat.
+    """
+    raw = stats.stats
+    callees = {}
+    for func, (_, _, _, _, callers) in raw.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, {})[func] = edge[3]
+
+    folded = {}
+
+    def walk(func, stack, share):
+        total_time = raw[func][2]
+        frames = stack + (_frame_name(func),)
+        self_us = int(total_time * share * 1e6)
+        if self_us >= MIN_STACK_US:
+            key = ";".join(frames)
+            folded[key] = folded.get(key, 0) + self_us
+        if len(frames) >= MAX_STACK_DEPTH:
+            return
+        for child, edge_time in callees.get(func, {}).items():
+            child_cumulative = raw[child][3]
+            if child_cumulative <= 0 or _frame_name(child) in frames:
+                continue
+            child_share = share * edge_time / child_cumulative
+            if edge_time * share * 1e6 >= MIN_STACK_US:
+                walk(child, frames, min(child_share, 1.0))
+
+    roots = [func for func, entry in raw.items() if not entry[4]]
+    for root in roots:
+        walk(root, (), 1.0)
+    return folded
+
+
+def _frame_name(func):
+    filename, line, name = func
+    if filename == "~":
+        return name  # Builtins, e.g. <built-in method posix.stat>
+    return f"{os.path.basename(filename)}:{name}:{line}"
+
+
+def main():
+    """CLI interface for captured profiles"""
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Hook Profiler")
+    parser.add_argument("--list", action="store_true", help="List captured profiles")
+    parser.add_argument("--merge", action="store_true", help="Aggregate report over captured profiles")
+    parser.add_argument("--hook", help="Only profiles of this hook")
+    parser.add_argument("--sort", default="cumulative", help="pstats sort key (cumulative, tottime, ...)")
+    parser.add_argument("--limit", type=int, default=40, help="Rows in the report")
+    parser.add_argument("--collapsed", help="Write folded stacks for flame graph tools")
+    parser.add_argument("--output", help="Write the merged stats as a .prof file")
+    parser.add_argument("--clear", action="store_true", help="Delete captured profiles")
+
+    args = parser.parse_args()
+
+    if args.clear:
+        paths = profile_files(args.hook)
+        for path in paths:
+            os.unlink(path)
+        print(json.dumps({"deleted": len(paths)}, indent=2))
+
+    elif args.list:
+        print(json.dumps({"directory": PROFILE_DIR,
+                          "profiles": [os.path.basename(p) for p in profile_files(args.hook)]},
+                         indent=2))
+
+    elif args.merge:
+        paths = profile_files(args.hook)
+        stats = merge(paths)
+        if stats is None:
+            print(f"No profiles in {PROFILE_DIR}", file=sys.stderr)
+            sys.exit(1)
+
+        print(f"Merged {len(paths)} profiles from {PROFILE_DIR}")
+        stats.files = []  # One header line per profile is noise at this scale
+        stats.sort_stats(args.sort).print_stats(args.limit)
+
+        if args.output:
+            stats.dump_stats(args.output)
+        if args.collapsed:
+            folded = collapsed_stacks(stats)
+            with open(args.collapsed, 'w', encoding='utf-8') as f:
+                for stack, us in sorted(folded.items()):
+                    f.write(f"{stack} {us}\n")
+            print(f"Folded stacks: {args.collapsed} ({len(folded)} stacks)")
+
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
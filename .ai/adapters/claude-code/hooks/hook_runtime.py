@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Hook Runtime
+Loads the hook scripts in this directory as modules and runs their main()
+in-process, capturing exit code, stdout and stderr exactly as a separate
+interpreter would produce them. Shared by the hook server (long-lived) and
+the client shim (fallback when the server is not running).
+"""
+
+import io
+import os
+import sys
+import zlib
+
+# Kept to os.path and builtin modules: the client shim imports this module
+# on every call, so it must stay cheap to import.
+HOOKS_DIR = os.path.dirname(os.path.realpath(__file__))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(HOOKS_DIR))
+
+# Hook name -> script file. Only these can be run through the runtime.
+HOOK_SCRIPTS = {
+    "deny-dangerous-bash": "deny-dangerous-bash.py",
+    "forbid-write-main": "forbid-write-main.py",
+    "hook-dispatch": "hook-dispatch.py",
+    "command-enforcer": "command-enforcer.py",
+    "template-guide": "template-guide.py",
+    "template-enforcer-flexible": "template-enforcer-flexible.py",
+}
+
+# Environment variables forwarded from the client to the server per call
+FORWARDED_ENV_PREFIXES = ("CLAUDE_", "HOOK_", "TEMPLATE_")
+
+# Set by the hook server: module-level caches outlive a single call
+persistent_process = False
+
+_loaded = {}
+
+
+def socket_path():
+    """Unix socket path of the hook server for this project."""
+    override = os.environ.get("HOOK_DAEMON_SOCKET")
+    if override:
+        return override
+    digest = format(zlib.crc32(PROJECT_ROOT.encode("utf-8")), "08x")
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, f"claude-hooks-{digest}.sock")
+    return os.path.join("/tmp", f"claude-hooks-{os.getuid()}-{digest}.sock")
+
+
+def check_socket(path):
+    """
+    Raise OSError unless `path` is a Unix socket owned by this user. The
+    default path is predictable (under /tmp without XDG_RUNTIME_DIR), so a
+    socket another user created there must never be asked for hook results.
+    """
+    import stat
+
+    st = os.lstat(path)
+    if not stat.S_ISSOCK(st.st_mode) or st.st_uid != os.getuid():
+        raise PermissionError(f"Refusing hook server socket not owned by this user: {path}")
+
+
+def forwarded_env(environ=None):
+    """Subset of the environment the hooks read at call time."""
+    environ = os.environ if environ is None else environ
+    return {k: v for k, v in environ.items() if k.startswith(FORWARDED_ENV_PREFIXES)}
+
+
+def load_hook(name):
+    """Import a hook script as a module, reloading it when the file changes."""
+    if name not in HOOK_SCRIPTS:
+        raise KeyError(f"Unknown hook: {name}")
+
+    script = os.path.join(HOOKS_DIR, HOOK_SCRIPTS[name])
+    mtime = os.stat(script).st_mtime_ns
+    cached = _loaded.get(name)
+    if cached and cached[1] == mtime:
+        return cached[0]
+
+    import importlib.util
+
+    module_name = "hook_" + name.replace("-", "_")
+    spec = importlib.util.spec_from_file_location(module_name, script)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    _loaded[name] = (module, mtime)
+    return module
+
+
+def preload():
+    """Load every known hook so pattern tables and command data stay resident."""
+    return {name: load_hook(name) for name in HOOK_SCRIPTS}
+
+
+def run_hook(name, argv=None, stdin=b"", cwd=None, env=None):
+    """
+    Run a hook's main() in this process.
+    Returns (exit_code, stdout_text, stderr_text).
+    """
+    from contextlib import redirect_stdout, redirect_stderr
+
+    import hook_profile
+    import hook_timing
+
+    out, err = io.StringIO(), io.StringIO()
+    saved_argv, saved_stdin = sys.argv, sys.stdin
+    saved_cwd = os.getcwd()
+    saved_env = {k: os.environ.get(k) for k in (env or {})}
+    code = 0
+
+    try:
+        if env:
+            os.environ.update(env)
+        if cwd:
+            os.chdir(cwd)
+        sys.argv = [os.path.join(HOOKS_DIR, HOOK_SCRIPTS.get(name, name))] + list(argv or [])
+        sys.stdin = io.TextIOWrapper(io.BytesIO(stdin), encoding="utf-8")
+
+        hook_timing.begin(name)  # After env is applied: HOOK_TIMING is per call
+        with redirect_stdout(out), redirect_stderr(err):
+            try:
+                hook_profile.run(name, load_hook(name).main)
+            except SystemExit as exc:
+                code = _exit_code(exc, err)
+            except Exception:
+                import traceback
+                traceback.print_exc(file=err)
+                code = 1
+    finally:
+        hook_timing.end()
+        sys.argv, sys.stdin = saved_argv, saved_stdin
+        os.chdir(saved_cwd)
+        for key, value in saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+    return code, out.getvalue(), err.getvalue()
+
+
+def _exit_code(exc, err):
+    """Translate SystemExit the same way the interpreter does."""
+    if exc.code is None:
+        return 0
+    if isinstance(exc.code, int):
+        return exc.code
+    print(exc.code, file=err)
+    return 1
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Hook Timing
+Opt-in wall-time instrumentation for the hooks. With HOOK_TIMING=1 in the
+environment, every hook run records how long it spent in each phase:
+
+  parse    reading the tool payload from stdin
+  config   loading enforcement.yaml (snapshot or YAML parse)
+  rules    evaluating rules and template checks
+  git      resolving the current branch
+  io       memory-bank reads and enforcement log writes
+  total    the whole run
+
+Phase times are exclusive: time spent in a nested phase (git inside a rule)
+counts only for the inner phase. A run is written as a single line to
+.ai/.cache/hook-timing.log with one os.write on an O_APPEND descriptor, so
+concurrent hooks append without locking (lines stay well under PIPE_BUF).
+Disabled, phase() returns a shared no-op context manager.
+
+`--stats` aggregates the log into log-linear (HDR-style) histograms per
+hook, tool_name and phase, prints p50/p95/p99 and writes the quantiles as a
+Prometheus summary (text format) to .ai/.cache/hook-timing.prom.
+
+Usage:
+  HOOK_TIMING=1 python .claude/hooks/hook-dispatch.py < payload.json
+  hook_timing.py --stats [--hook NAME] [--prom PATH]
+  hook_timing.py --clear
+"""
+
+import atexit
+import math
+import os
+import sys
+import time
+from _thread import get_ident
+
+import hook_config
+
+LOG_PATH = os.path.join(hook_config.CACHE_DIR, "hook-timing.log")
+PROM_PATH = os.path.join(hook_config.CACHE_DIR, "hook-timing.prom")
+MAX_LOG_BYTES = 8 << 20  # Rotated to hook-timing.log.1 past this size
+
+PHASES = ("parse", "config", "rules", "git", "io", "total")
+QUANTILES = (0.5, 0.95, 0.99)
+
+# Histogram precision: reported quantiles are within 2**-(SUB_BUCKET_BITS - 1)
+# (~1.6%) of the recorded value
+SUB_BUCKET_BITS = 7
+
+# Processes that run hooks but are not hooks themselves
+_NOT_HOOKS = {"hook-server", "hook-client", "hook_timing"}
+
+_session = None
+
+
+def enabled():
+    return os.environ.get("HOOK_TIMING", "") not in ("", "0")
+
+
+def begin(hook):
+    """Start timing one hook run (no-op unless HOOK_TIMING is set)"""
+    global _session
+    _session = _Session(hook) if enabled() else None
+
+
+def end():
+    """Finish the current run and append its record"""
+    global _session
+    session, _session = _session, None
+    if session is not None:
+        session.write()
+
+
+def set_tool(tool_name):
+    """Label the current run with the payload's tool_name"""
+    if _session is not None:
+        _session.tool = tool_name or ""
+
+
+def phase(name):
+    """
+    Context manager timing a phase of the current run. Phases entered on
+    other threads are not recorded; their time counts toward the phase the
+    run's thread is waiting in.
+    """
+    if _session is None or _session.thread != get_ident():
+        return _NULL_PHASE
+    return _Phase(_session, name)
+
+
+class _NullPhase:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    __slots__ = ("session", "name", "start", "children")
+
+    def __init__(self, session, name):
+        self.session = session
+        self.name = name
+
+    def __enter__(self):
+        self.children = 0
+        self.start = time.perf_counter_ns()
+        self.session.stack.append(self)
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter_ns() - self.start
+        stack = self.session.stack
+        stack.pop()
+        if stack:
+            stack[-1].children += elapsed
+        self.session.add(self.name, elapsed - self.children)
+        return False
+
+
+class _Session:
+    def __init__(self, hook):
+        self.hook = hook
+        self.thread = get_ident()
+        self.tool = ""
+        self.start = time.perf_counter_ns()
+        self.phases = {}
+        self.stack = []
+
+    def add(self, name, ns):
+        self.phases[name] = self.phases.get(name, 0) + ns
+
+    def write(self):
+        self.phases["total"] = time.perf_counter_ns() - self.start
+        fields = ",".join(f"{name}={ns}" for name, ns in self.phases.items())
+        line = f"{int(time.time())}\t{self.hook}\t{self.tool}\t{fields}\n"
+        try:
+            os.makedirs(hook_config.CACHE_DIR, exist_ok=True)
+            fd = os.open(LOG_PATH, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line.encode("utf-8"))
+                size = os.fstat(fd).st_size
+            finally:
+                os.close(fd)
+            if size > MAX_LOG_BYTES:
+                os.replace(LOG_PATH, LOG_PATH + ".1")
+        except OSError:
+            pass  # Timing is best-effort
+
+
+def _auto_begin():
+    """One-shot hook processes time themselves from this import to exit"""
+    hook = os.path.splitext(os.path.basename(sys.argv[0] if sys.argv else ""))[0]
+    if hook and hook not in _NOT_HOOKS and enabled():
+        begin(hook)
+        atexit.register(end)
+
+
+_auto_begin()
+
+
+# ----------------------------------------------------------------------
+# Aggregation
+
+
+class LatencyHistogram:
+    """
+    Log-linear histogram of integer values (microseconds). Values below
+    2**SUB_BUCKET_BITS get a bucket each; above that, every power of two is
+    split into 2**(SUB_BUCKET_BITS - 1) equal buckets, bounding the relative
+    error of a reported quantile by 2**-(SUB_BUCKET_BITS - 1).
+    """
+
+    FULL = 1 << SUB_BUCKET_BITS
+    HALF = FULL >> 1
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, value):
+        value = max(int(value), 0)
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def value_at(self, quantile):
+        """Highest value equivalent to the given quantile (0..1)"""
+        if not self.count:
+            return 0
+        rank = max(1, math.ceil(quantile * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self._highest(index), self.max)
+        return self.max
+
+    def _index(self, value):
+        if value < self.FULL:
+            return value
+        shift = value.bit_length() - SUB_BUCKET_BITS
+        return self.FULL + (shift - 1) * self.HALF + (value >> shift) - self.HALF
+
+    def _highest(self, index):
+        if index < self.FULL:
+            return index
+        shift = (index - self.FULL) // self.HALF + 1
+        sub = (index - self.FULL) % self.HALF + self.HALF
+        return ((sub + 1) << shift) - 1
+
+
+def read_records(paths=None):
+    """Yield (timestamp, hook, tool, {phase: ns}) from the timing log"""
+    for path in paths or (LOG_PATH + ".1", LOG_PATH):
+        try:
+            f = open(path, 'r', encoding='utf-8')
+        except OSError:
+            continue
+        with f:
+            for line in f:
+                parts = line.rstrip("\n").split("\t")
+                if len(parts) != 4:
+                    continue  # Torn or foreign line
+                try:
+                    phases = {k: int(v) for k, v in
+                              (field.split("=", 1) for field in parts[3].split(","))}
+                    yield int(parts[0]), parts[1], parts[2], phases
+                except ValueError:
+                    continue
+
+
+def aggregate(records, hook=None):
+    """{(hook, tool, phase): LatencyHistogram} in microseconds"""
+    histograms = {}
+    for _, name, tool, phases in records:
+        if hook is not None and name != hook:
+            continue
+        for phase_name, ns in phases.items():
+            key = (name, tool, phase_name)
+            if key not in histograms:
+                histograms[key] = LatencyHistogram()
+            histograms[key].record(ns // 1000)
+    return histograms
+
+
+def summarize(histograms):
+    """Nested {hook: {tool: {phase: stats}}} with milliseconds"""
+    order = {name: i for i, name in enumerate(PHASES)}
+    stats = {}
+    for (hook, tool, phase_name), hist in sorted(
+            histograms.items(), key=lambda kv: (kv[0][0], kv[0][1], order.get(kv[0][2], 99))):
+        stats.setdefault(hook, {}).setdefault(tool or "-", {})[phase_name] = {
+            "count": hist.count,
+            "p50_ms": hist.value_at(0.5) / 1000,
+            "p95_ms": hist.value_at(0.95) / 1000,
+            "p99_ms": hist.value_at(0.99) / 1000,
+            "max_ms": hist.max / 1000,
+            "mean_ms": round(hist.total / hist.count / 1000, 3),
+        }
+    return stats
+
+
+def prometheus_text(histograms):
+    """Prometheus text exposition of the histograms as a summary"""
+    metric = "claude_hook_phase_seconds"
+    lines = [
+        f"# HELP {metric} Wall time spent by Claude hooks per phase.",
+        f"# TYPE {metric} summary",
+    ]
+    for (hook, tool, phase_name), hist in sorted(histograms.items()):
+        labels = f'hook="{_label(hook)}",tool="{_label(tool)}",phase="{_label(phase_name)}"'
+        for quantile in QUANTILES:
+            lines.append(f'{metric}{{{labels},quantile="{quantile}"}} '
+                         f'{hist.value_at(quantile) / 1e6:.6f}')
+        lines.append(f"{metric}_sum{{{labels}}} {hist.total / 1e6:.6f}")
+        lines.append(f"{metric}_count{{{labels}}} {hist.count}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(histograms, path=PROM_PATH):
+    """Write the exposition atomically (textfile collectors may read it any time)"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(prometheus_text(histograms))
+    os.replace(tmp_path, path)
+
+
+def _label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def main():
+    """CLI interface for timing statistics"""
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Hook Timing")
+    parser.add_argument("--stats", action="store_true", help="Show p50/p95/p99 per hook phase")
+    parser.add_argument("--hook", help="Restrict stats to one hook")
+    parser.add_argument("--prom", default=PROM_PATH, help="Prometheus text-format output file")
+    parser.add_argument("--clear", action="store_true", help="Delete recorded timings")
+
+    args = parser.parse_args()
+
+    if args.clear:
+        for path in (LOG_PATH, LOG_PATH + ".1"):
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        print(json.dumps({"cleared": LOG_PATH}, indent=2))
+
+    elif args.stats:
+        histograms = aggregate(read_records(), args.hook)
+        write_prometheus(histograms, args.prom)
+        print(json.dumps({"hooks": summarize(histograms), "prometheus": args.prom},
+                         indent=2, ensure_ascii=False))
+
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Streaming Keyword Scanner
+Finds the first occurrence of every keyword in a stream of text chunks in a
+single pass, without holding the whole document in memory.
+
+The keywords are built into an Aho-Corasick automaton (goto, fail and output
+tables over the lowercased keywords), so the stream is read once whatever
+the number of keywords: O(text + matches) instead of one search per
+keyword. Overlapping keywords are reported, since every state outputs the
+keywords ending there, including those reached through its fail links.
+The automaton state carries over from one chunk to the next, so matches
+spanning a chunk boundary are found without re-reading an overlap. While
+the automaton is in its root state it skips ahead with a regex to the next
+keyword prefix of SKIP_PREFIX characters (the whole keyword when shorter).
+No match can start in the text skipped, so the skip never misses one; the
+last SKIP_PREFIX - 1 characters of a chunk, where a prefix may be cut off,
+are always stepped through. Scanning stops as soon as every keyword is found.
+
+Matching is case-insensitive via str.lower(); offsets are character offsets
+into the lowercased stream.
+"""
+
+import re
+
+CHUNK_SIZE = 1 << 16
+SKIP_PREFIX = 4  # Keyword prefix length the root-state skip searches for
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton over a set of (lowercase) keywords"""
+
+    def __init__(self, keywords):
+        self.goto = [{}]  # state -> {character: next state}
+        self.fail = [0]
+        self.output = [()]  # state -> keywords ending in this state
+
+        for keyword in keywords:
+            state = 0
+            for ch in keyword:
+                next_state = self.goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][ch] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(())
+                state = next_state
+            self.output[state] += (keyword,)
+
+        # Breadth-first, so every fail target is complete before it is used
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for ch, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(ch, 0)
+                self.fail[next_state] = target
+                self.output[next_state] += self.output[target]
+
+        # Where a match can start, for skipping text while in the root state
+        prefixes = {keyword[:SKIP_PREFIX] for keyword in keywords}
+        self.start = re.compile(
+            "|".join(map(re.escape, sorted(prefixes, key=len, reverse=True))))
+
+
+def scan_keywords(chunks, keywords):
+    """
+    Scan an iterable of text chunks for keywords (matched lowercased).
+    Returns {keyword: offset of its first occurrence or None}.
+    """
+    found = {kw: None for kw in keywords}
+    pending = len([kw for kw in found if kw])
+    if not pending:
+        return found
+
+    automaton = KeywordAutomaton([kw for kw in found if kw])
+    goto, fail, output = automaton.goto, automaton.fail, automaton.output
+    start = automaton.start
+    state = 0
+    consumed = 0  # Stream offset of the first character of the chunk
+
+    for chunk in chunks:
+        text = chunk.lower()
+        pos, end = 0, len(text)
+        tail = end - SKIP_PREFIX + 1
+        while pos < end:
+            if not state and pos < tail:
+                match = start.search(text, pos, tail + SKIP_PREFIX - 1)
+                if match is None or match.start() >= tail:
+                    pos = tail  # A prefix may be cut off by the chunk end
+                    continue
+                pos = match.start()
+            ch = text[pos]
+            pos += 1
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for keyword in output[state]:
+                if found[keyword] is None:
+                    found[keyword] = consumed + pos - len(keyword)
+                    pending -= 1
+                    if not pending:
+                        return found
+        consumed += end
+
+    return found
+
+
+def read_chunks(path, chunk_size=CHUNK_SIZE):
+    """Yield a UTF-8 text file in chunks"""
+    with open(path, 'r', encoding='utf-8') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Memory Bank Watch
+Long-lived process that keeps the verdicts of the post-command checks
+current while memory-bank/ changes, so command-enforcer --validate reads a
+precomputed answer (watch_status) instead of validating inline.
+
+Changes come from inotify, or from polling where inotify is unavailable
+(fs_watch). A burst of writes is debounced: revalidation starts once no
+event arrived for --debounce seconds, or --max-delay after the burst began.
+Each round checks only what the changes affect:
+
+  documents   changed documents of a workflow command are rescanned for
+              parent references (TemplateEnforcer.cites_parent), and the
+              advisory checks of template-guide and template-enforcer-flexible
+              run through the validation cache, so those hooks hit it
+  commands    commands owning a changed document get their output and
+              parent-output checks redone, and so do the commands that
+              link_to them (a parent output appearing satisfies a child
+              that was waiting on it)
+
+A change to enforcement.yaml, or lost events, revalidates everything.
+Document stamps from the previous status are reused at start-up, so a
+restart only rechecks what changed while no watcher was running.
+
+Usage:
+  memory-watch.py start       # start in the background
+  memory-watch.py run         # run in the foreground [--poll] [--debounce S]
+  memory-watch.py stop
+  memory-watch.py status
+  memory-watch.py once        # one revalidation, then exit (warms caches)
+"""
+
+import json
+import os
+import signal
+import sys
+import time
+from datetime import datetime
+
+import hook_config
+import hook_runtime
+import watch_status
+from command_registry import registry
+from fs_watch import POLL_INTERVAL, open_watcher
+from memory_bank_index import command_for_path
+
+MEMORY_BANK = os.path.join(hook_config.PROJECT_ROOT, "memory-bank")
+
+DEBOUNCE = 0.3  # Seconds without events before a burst is revalidated
+MAX_DELAY = 5.0  # Seconds a continuous burst may postpone revalidation
+
+# Documents the advisory checks read (as batch-validate does)
+CHECKED_SUFFIXES = (".md",)
+
+
+class MemoryWatch:
+    """Incremental revalidation of memory-bank documents and commands"""
+
+    def __init__(self, root=MEMORY_BANK, status_path=watch_status.STATUS_PATH):
+        self.root = root
+        self.status_path = status_path
+        self.status = watch_status.load(status_path) or watch_status.empty_status()
+        self.stopping = False
+
+    def revalidate(self, rel_paths=None):
+        """
+        Recheck changed documents (all documents when rel_paths is None)
+        and the commands they affect; writes the status. Returns counts.
+        """
+        from validation_cache import ValidationCache
+
+        start = time.perf_counter()
+        enforcer = hook_runtime.load_hook("command-enforcer").TemplateEnforcer()
+        cache = ValidationCache()
+        guide = hook_runtime.load_hook("template-guide").TemplateGuide(cache)
+        flexible = hook_runtime.load_hook("template-enforcer-flexible").FlexibleEnforcer(cache)
+
+        # Stamped before anything is read: a change made meanwhile mismatches later
+        synced = time.time_ns()
+        compiled = enforcer.output_patterns()
+        dirs = watch_status.dir_stamps(self.root, compiled)
+
+        config = hook_config.config_stamp()
+        documents = self.status["documents"]
+        full = rel_paths is None or config != self.status["config"]
+        if config != self.status["config"]:
+            documents.clear()  # Output patterns or links may have changed
+        index = enforcer.memory_bank_index
+        if full:
+            rel_paths = set(index.walk()) | set(documents)
+        else:
+            index.update(rel_paths)  # In-place rewrites do not change directory mtimes
+
+        affected, stale = set(), []
+        for rel_path in sorted(rel_paths):
+            command = command_for_path(rel_path, compiled)
+            if command is None:
+                continue
+            stamp = index.stamp(rel_path)
+            if stamp is None:
+                if documents.pop(rel_path, None) is not None:
+                    affected.add(command)
+                continue
+            record = documents.get(rel_path)
+            if record is None or record[:2] != stamp:
+                stale.append((rel_path, command, stamp))
+                affected.add(command)
+
+        index.save()
+
+        # One reference graph update for every stale document
+        enforcer.reference_graph.update([rel_path for rel_path, _, _ in stale])
+        for rel_path, command, stamp in stale:
+            path = os.path.join(self.root, rel_path)
+            parents = enforcer.parent_commands(command)
+            cites = enforcer.cites_parent(parents, output_files=[path]) if parents else None
+            if path.endswith(CHECKED_SUFFIXES):
+                guide.validate_file(command, path)
+                flexible.post_command_check(command, [path])
+            documents[rel_path] = stamp + [cites]
+        cache.save()
+
+        if full:
+            commands = set(registry)
+            for command in set(self.status["commands"]) - commands:
+                del self.status["commands"][command]
+        else:
+            commands = affected | {c for c in registry
+                                   if affected.intersection(registry[c].get("links_to", []))}
+        for command in sorted(commands):
+            self.status["commands"][command] = self._verdict(enforcer, command)
+
+        self.status.update(config=config, dirs=dirs, synced=synced, pending=False,
+                           updated=datetime.now().isoformat())
+        watch_status.save(self.status, self.status_path)
+        return {"documents": len(stale), "commands": len(commands), "full": full,
+                "elapsed_ms": round((time.perf_counter() - start) * 1000, 3)}
+
+    def _verdict(self, enforcer, command):
+        """Output and parent-output checks of one command, as the status stores them"""
+        verdict = {"parents": enforcer.parent_commands(command)}
+        for key, check in (("outputs", enforcer.validate_output),
+                           ("linkage", enforcer.validate_linkages)):
+            before = len(enforcer.violations)
+            start = time.perf_counter()
+            valid, message = check(command)
+            verdict[key] = [valid, message, enforcer.violations[before:],
+                            round((time.perf_counter() - start) * 1000, 3)]
+        return verdict
+
+    def run(self, watcher, debounce=DEBOUNCE, max_delay=MAX_DELAY, verbose=False):
+        """Revalidate on changes until stopped"""
+        self.status.update(pid=os.getpid(), backend=watcher.backend, running=True)
+        try:
+            self._report(self.revalidate(), verbose)
+            while not self.stopping:
+                changed = watcher.wait(watch_status.HEARTBEAT)
+                if changed is not None and not changed:
+                    if hook_config.config_stamp() != self.status["config"]:
+                        self._report(self.revalidate(), verbose)
+                    else:
+                        watch_status.touch(self.status_path)
+                    continue
+
+                # Hooks stop trusting the status until this burst is checked
+                self.status["pending"] = True
+                watch_status.save(self.status, self.status_path)
+
+                deadline = time.monotonic() + max_delay
+                while changed is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    more = watcher.wait(min(debounce, remaining))
+                    if not more:
+                        changed = None if more is None else changed
+                        break
+                    changed |= more
+                self._report(self.revalidate(changed), verbose)
+        finally:
+            watcher.close()
+            self.status.update(running=False, pending=False)
+            watch_status.save(self.status, self.status_path)
+
+    def _report(self, result, verbose):
+        if verbose:
+            print(json.dumps(result), flush=True)
+
+
+def status_summary(status_path=watch_status.STATUS_PATH):
+    """Watcher state and per-command verdicts, for the status action"""
+    status = watch_status.load(status_path)
+    if status is None:
+        return None
+    return {
+        "pid": status["pid"],
+        "backend": status["backend"],
+        "running": status["running"],
+        "live": watch_status.load_live(status_path) is not None,
+        "pending": status["pending"],
+        "updated": status["updated"],
+        "documents": len(status["documents"]),
+        "commands": {command: {"outputs": verdict["outputs"][:2], "linkage": verdict["linkage"][:2]}
+                     for command, verdict in sorted(status["commands"].items())},
+    }
+
+
+def start_background(argv, wait=10.0):
+    """Start the watcher detached and wait until its status is live"""
+    live = watch_status.load_live()
+    if live is not None:
+        return live
+
+    import subprocess
+
+    subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "run"] + argv,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+    deadline = time.time() + wait
+    while time.time() < deadline:
+        live = watch_status.load_live()
+        if live is not None:
+            return live
+        time.sleep(0.1)
+    return None
+
+
+def main():
+    """CLI interface"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Memory Bank Watch")
+    parser.add_argument("action", choices=["start", "run", "stop", "status", "once"])
+    parser.add_argument("--poll", action="store_true", help="Poll instead of using inotify")
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL,
+                        help="Polling interval in seconds")
+    parser.add_argument("--debounce", type=float, default=DEBOUNCE,
+                        help="Quiet seconds before a burst of changes is revalidated")
+    parser.add_argument("--max-delay", type=float, default=MAX_DELAY,
+                        help="Longest a continuous burst may postpone revalidation")
+    parser.add_argument("--verbose", action="store_true", help="Print each round (run)")
+
+    args = parser.parse_args()
+
+    if args.action == "run":
+        if watch_status.load_live() is not None:
+            print("Memory watch already running", file=sys.stderr)
+            sys.exit(1)
+        watch = MemoryWatch()
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        try:
+            watch.run(open_watcher(watch.root, args.poll, args.interval),
+                      args.debounce, args.max_delay, args.verbose)
+        except KeyboardInterrupt:
+            pass
+
+    elif args.action == "start":
+        argv = ["--interval", str(args.interval), "--debounce", str(args.debounce),
+                "--max-delay", str(args.max_delay)] + (["--poll"] if args.poll else [])
+        if start_background(argv) is None:
+            print("Memory watch failed to start", file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps(status_summary(), indent=2, ensure_ascii=False))
+
+    elif args.action == "stop":
+        status = watch_status.load()
+        if status is None or not status["running"] or not status["pid"]:
+            print("Memory watch not running", file=sys.stderr)
+            sys.exit(1)
+        try:
+            os.kill(status["pid"], signal.SIGTERM)
+        except OSError:
+            # Died without cleaning up: mark it stopped ourselves
+            status.update(running=False, pending=False)
+            watch_status.save(status)
+        print(json.dumps({"stopping": status["pid"]}, indent=2))
+
+    elif args.action == "status":
+        summary = status_summary()
+        if summary is None:
+            print("Memory watch has not run", file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps(summary, indent=2, ensure_ascii=False))
+
+    elif args.action == "once":
+        print(json.dumps(MemoryWatch().revalidate(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
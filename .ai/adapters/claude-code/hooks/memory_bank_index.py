@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Memory Bank Index
+Cached manifest of every file under memory-bank/ (path, mtime, size),
+persisted to memory-bank/.cache/manifest.marshal. A refresh stats each known
+directory and rescans only those whose mtime changed, so adding or removing
+documents is picked up without listing the whole tree. Glob-style output
+patterns from COMMAND_TEMPLATES are then answered from memory in one pass,
+and the same patterns map a document back to the command that produced it.
+
+Directory mtimes do not change when an existing file is rewritten in place,
+so refresh() alone leaves recorded file mtime/size stale for such files;
+existence lookups are always current after refresh(). stamp() stats a file
+at lookup time and corrects its record, and update() applies change
+notifications (fs_watch paths, as memory-watch.py delivers them), which
+keeps the whole manifest current while a watcher runs.
+"""
+
+import marshal
+import os
+import posixpath
+import re
+from fnmatch import translate
+from pathlib import Path
+from stat import S_ISREG
+
+MANIFEST_VERSION = 1
+
+
+def compile_outputs(command_templates):
+    """
+    Index the `outputs` patterns of COMMAND_TEMPLATES by directory for
+    command_for_path(): {rel_dir: [(name matcher, command), ...]}.
+    """
+    compiled = {}
+    for command, config in command_templates.items():
+        for pattern in config.get("outputs", []):
+            rel_dir, name = posixpath.split(pattern)
+            matcher = re.compile(translate(name)).match
+            compiled.setdefault(rel_dir, []).append((matcher, command))
+    return compiled
+
+
+def command_for_path(rel_path, compiled):
+    """Command whose outputs include a memory-bank relative path, or None"""
+    rel_dir, name = posixpath.split(rel_path)
+    for matcher, command in compiled.get(rel_dir, ()):
+        if matcher(name):
+            return command
+    return None
+
+
+class MemoryBankIndex:
+    """In-memory file manifest of a memory-bank tree"""
+
+    def __init__(self, root, manifest_path=None):
+        self.root = Path(root)
+        self.manifest_path = Path(manifest_path) if manifest_path else \
+            self.root / ".cache" / "manifest.marshal"
+        self.dirs = None
+        self._dirty = False
+
+    def refresh(self):
+        """Bring the manifest up to date with the tree; returns self"""
+        if self.dirs is None:
+            self.dirs = self._load()
+
+        fresh = {}
+        pending = [""]
+        while pending:
+            rel_dir = pending.pop()
+            record = self._refresh_dir(rel_dir)
+            if record is None:
+                continue
+            fresh[rel_dir] = record
+            pending.extend(posixpath.join(rel_dir, d) if rel_dir else d
+                           for d in record["subdirs"])
+
+        if fresh.keys() != self.dirs.keys():
+            self._dirty = True
+        self.dirs = fresh
+
+        if self._dirty:
+            self._save()
+        return self
+
+    def update(self, rel_paths):
+        """
+        Restat changed files (relative paths from a watcher), adding,
+        correcting or dropping their records; returns self. Paths in
+        directories not yet in the manifest fall back to refresh().
+        """
+        if self.dirs is None:
+            self.dirs = self._load()
+        unknown = False
+        for rel_path in rel_paths:
+            rel_dir, name = posixpath.split(rel_path)
+            record = self.dirs.get(rel_dir)
+            if record is None:
+                unknown = True
+                continue
+            self._restat(record, rel_path, name)
+        if unknown:
+            return self.refresh()
+        if self._dirty:
+            self._save()
+        return self
+
+    def stamp(self, rel_path):
+        """Current [mtime_ns, size] of a file (stat now), or None when it is gone"""
+        if self.dirs is None:
+            self.refresh()
+        rel_dir, name = posixpath.split(rel_path)
+        record = self.dirs.get(rel_dir)
+        if record is None:
+            try:
+                st = os.stat(os.path.join(self.root, rel_path))
+            except OSError:
+                return None
+            return [st.st_mtime_ns, st.st_size]
+        return self._restat(record, rel_path, name)
+
+    def save(self):
+        """Persist records corrected by stamp() (no-op when nothing changed)"""
+        if self._dirty:
+            self._save()
+
+    def files(self, rel_dir=""):
+        """
+        {name: [mtime_ns, size]} of the files directly in a directory
+        (stamps as of the last refresh/update; see stamp())
+        """
+        if self.dirs is None:
+            self.refresh()
+        record = self.dirs.get(rel_dir)
+        return record["files"] if record else {}
+
+    def walk(self, rel_dir=""):
+        """Relative posix paths of every file at or below a directory, sorted"""
+        if self.dirs is None:
+            self.refresh()
+        prefix = f"{rel_dir}/" if rel_dir else ""
+        paths = []
+        for name, record in self.dirs.items():
+            if name == rel_dir or name.startswith(prefix):
+                base = f"{name}/" if name else ""
+                paths.extend(base + f for f in record["files"])
+        return sorted(paths)
+
+    def path(self, rel_path):
+        """Absolute Path of a memory-bank relative path"""
+        return self.root / rel_path
+
+    def glob(self, pattern):
+        """Relative paths matching a pattern (`*` stays within one directory)"""
+        return self.glob_many([pattern])[pattern]
+
+    def glob_many(self, patterns):
+        """
+        Match several patterns, listing each directory once.
+        Returns {pattern: [relative posix path, ...]}.
+        """
+        results = {}
+        for pattern in patterns:
+            if pattern in results:
+                continue
+            rel_dir, name = posixpath.split(pattern)
+            files = self.files(rel_dir)
+            prefix = f"{rel_dir}/" if rel_dir else ""
+            if not any(c in name for c in "*?["):
+                results[pattern] = [prefix + name] if name in files else []
+            else:
+                matcher = re.compile(translate(name)).match
+                results[pattern] = [prefix + n for n in filter(matcher, files)]
+        return results
+
+    # ------------------------------------------------------------------
+    # Internals
+
+    def _restat(self, record, rel_path, name):
+        """Bring one file's record in line with the file; returns its stamp"""
+        try:
+            st = os.stat(os.path.join(self.root, rel_path))
+            stamp = [st.st_mtime_ns, st.st_size] if S_ISREG(st.st_mode) else None
+        except OSError:
+            stamp = None
+        if stamp is None:
+            if record["files"].pop(name, None) is not None:
+                self._dirty = True
+        elif record["files"].get(name) != stamp:
+            record["files"][name] = stamp
+            self._dirty = True
+        return stamp
+
+    def _refresh_dir(self, rel_dir):
+        path = os.path.join(self.root, rel_dir) if rel_dir else str(self.root)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+        record = self.dirs.get(rel_dir)
+        if record and record["mtime_ns"] == mtime:
+            return record
+
+        files, subdirs = {}, []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not entry.name.startswith("."):
+                            subdirs.append(entry.name)
+                    elif entry.is_file():
+                        st = entry.stat()
+                        files[entry.name] = [st.st_mtime_ns, st.st_size]
+        except OSError:
+            return None
+
+        self._dirty = True
+        return {"mtime_ns": mtime, "files": files, "subdirs": sorted(subdirs)}
+
+    def _load(self):
+        try:
+            with open(self.manifest_path, 'rb') as f:
+                manifest = marshal.loads(f.read())
+            if manifest.get("version") == MANIFEST_VERSION:
+                return manifest["dirs"]
+        except (OSError, ValueError, EOFError, TypeError, AttributeError, KeyError):
+            pass
+        return {}
+
+    def _save(self):
+        try:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.manifest_path.with_name(
+                f"{self.manifest_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                marshal.dump({"version": MANIFEST_VERSION, "dirs": self.dirs}, f)
+            os.replace(tmp_path, self.manifest_path)
+            self._dirty = False
+        except OSError:
+            pass  # Manifest is a cache; lookups still work from memory
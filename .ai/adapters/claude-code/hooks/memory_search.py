@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Memory Bank Search
+On-disk inverted index over every memory-bank text document, kept in
+memory-bank/.cache/search.sqlite3, for ranked keyword queries (BM25).
+
+Tokenization is CJK-aware, since guides and outputs mix Chinese and
+English: runs of latin letters/digits are lowercased words, and runs of
+CJK ideographs, kana or hangul become overlapping bigrams ("架構設計" ->
+"架構", "構設", "設計"; a lone character stays a unigram). Queries are
+tokenized the same way, so a Chinese phrase matches without a segmenter.
+
+Each posting records the term frequency and the offset of the term's first
+occurrence, which is where a snippet is cut from. refresh() lists documents
+through MemoryBankIndex, stats each one and reindexes only new or changed
+documents in one transaction; removed documents are dropped. sqlite3 is
+imported on first use; without it the index is unavailable and searches
+return nothing.
+
+Usage:
+  memory_search.py --refresh
+  memory_search.py --query "授權 token refresh" [--limit 10] [--snippets 2000]
+  memory_search.py --stats
+"""
+
+import math
+import os
+import re
+
+import hook_config
+from memory_bank_index import MemoryBankIndex
+
+INDEX_VERSION = 1
+MEMORY_BANK = os.path.join(hook_config.PROJECT_ROOT, "memory-bank")
+
+# Text documents worth indexing
+DOCUMENT_SUFFIXES = (".md", ".txt", ".yaml", ".yml", ".json")
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Characters of context kept before a snippet's first match
+SNIPPET_LEAD = 80
+SNIPPET_CHARS = 400
+
+# Kana, CJK ideographs (with extension A and compatibility forms) and hangul
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff"
+_TOKEN = re.compile(rf"[{_CJK}]+|[^\W_{_CJK}]+")
+_CJK_RUN = re.compile(rf"[{_CJK}]")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value);
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    length INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    doc INTEGER NOT NULL,
+    tf INTEGER NOT NULL,
+    first INTEGER NOT NULL,
+    PRIMARY KEY (term, doc)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc);
+"""
+
+
+def tokenize(text):
+    """[(term, char offset)] of lowercased text: words and CJK bigrams"""
+    tokens = []
+    for match in _TOKEN.finditer(text.lower()):
+        run, start = match.group(), match.start()
+        if not _CJK_RUN.match(run):
+            tokens.append((run, start))
+        elif len(run) == 1:
+            tokens.append((run, start))
+        else:
+            tokens.extend((run[i:i + 2], start + i) for i in range(len(run) - 1))
+    return tokens
+
+
+def query_terms(query):
+    """Distinct terms of a query, in order"""
+    return list(dict.fromkeys(term for term, _ in tokenize(query)))
+
+
+def is_document(rel_path):
+    return rel_path.endswith(DOCUMENT_SUFFIXES) and not os.path.basename(rel_path).startswith(".")
+
+
+class MemorySearch:
+    """BM25 keyword search over a memory-bank tree"""
+
+    def __init__(self, root=MEMORY_BANK, index=None, db_path=None):
+        self.root = str(root)
+        self.index = index
+        self.db_path = db_path or os.path.join(self.root, ".cache", "search.sqlite3")
+        self._db = None
+
+    def connect(self):
+        """sqlite3 connection with the schema in place, or None without sqlite3"""
+        if self._db is None:
+            try:
+                import sqlite3
+            except ImportError:
+                return None
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            db = sqlite3.connect(self.db_path, timeout=10)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            row = None
+            try:
+                row = db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            except sqlite3.DatabaseError:
+                pass
+            if row is None or row[0] != INDEX_VERSION:
+                db.executescript("DROP TABLE IF EXISTS postings; DROP TABLE IF EXISTS docs;"
+                                 "DROP TABLE IF EXISTS meta;" + _SCHEMA)
+                db.execute("INSERT INTO meta VALUES ('version', ?)", (INDEX_VERSION,))
+                db.commit()
+            self._db = db
+        return self._db
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    # ------------------------------------------------------------------
+    # Updates
+
+    def refresh(self):
+        """Reindex new and changed documents, drop removed ones; returns counts"""
+        db = self.connect()
+        if db is None:
+            return {"indexed": 0, "removed": 0, "documents": 0}
+        if self.index is None:
+            self.index = MemoryBankIndex(self.root)
+        self.index.refresh()
+
+        known = {path: (doc_id, [mtime, size])
+                 for doc_id, path, mtime, size in db.execute(
+                     "SELECT id, path, mtime_ns, size FROM docs")}
+        current = [rel for rel in self.index.walk() if is_document(rel)]
+
+        stale = []
+        for rel_path in current:
+            try:
+                st = os.stat(os.path.join(self.root, rel_path))
+            except OSError:
+                continue
+            stamp = [st.st_mtime_ns, st.st_size]
+            entry = known.get(rel_path)
+            if entry is None or entry[1] != stamp:
+                stale.append((rel_path, stamp, entry[0] if entry else None))
+        present = set(current)
+        removed = [entry[0] for path, entry in known.items() if path not in present]
+
+        with db:
+            for doc_id in removed:
+                self._drop(db, doc_id)
+            for rel_path, stamp, doc_id in stale:
+                self._index_document(db, rel_path, stamp, doc_id)
+
+        return {"indexed": len(stale), "removed": len(removed), "documents": len(current)}
+
+    def _drop(self, db, doc_id):
+        db.execute("DELETE FROM postings WHERE doc = ?", (doc_id,))
+        db.execute("DELETE FROM docs WHERE id = ?", (doc_id,))
+
+    def _index_document(self, db, rel_path, stamp, doc_id):
+        try:
+            with open(os.path.join(self.root, rel_path), 'r', encoding='utf-8', errors='replace') as f:
+                text = f.read()
+        except OSError:
+            return
+
+        postings = {}
+        tokens = tokenize(text)
+        for term, offset in tokens:
+            entry = postings.get(term)
+            if entry is None:
+                postings[term] = [1, offset]
+            else:
+                entry[0] += 1
+
+        if doc_id is None:
+            doc_id = db.execute("INSERT INTO docs (path, mtime_ns, size, length) VALUES (?, ?, ?, ?)",
+                                (rel_path, stamp[0], stamp[1], len(tokens))).lastrowid
+        else:
+            db.execute("DELETE FROM postings WHERE doc = ?", (doc_id,))
+            db.execute("UPDATE docs SET mtime_ns = ?, size = ?, length = ? WHERE id = ?",
+                       (stamp[0], stamp[1], len(tokens), doc_id))
+        db.executemany("INSERT INTO postings VALUES (?, ?, ?, ?)",
+                       ((term, doc_id, tf, first) for term, (tf, first) in postings.items()))
+
+    # ------------------------------------------------------------------
+    # Queries
+
+    def search(self, query, limit=10):
+        """
+        Documents ranked by BM25 for the query terms, best first:
+        [{"path", "score", "offset"}], offset being the earliest first
+        occurrence of a matched term (where a snippet starts).
+        """
+        db = self.connect()
+        terms = query_terms(query)
+        if db is None or not terms:
+            return []
+
+        total, avg_length = db.execute("SELECT COUNT(*), AVG(length) FROM docs").fetchone()
+        if not total:
+            return []
+        avg_length = avg_length or 1.0
+
+        marks = ",".join("?" * len(terms))
+        df = dict(db.execute(
+            f"SELECT term, COUNT(*) FROM postings WHERE term IN ({marks}) GROUP BY term", terms))
+        idf = {term: _idf(total, count) for term, count in df.items()}
+
+        scores, offsets, lengths = {}, {}, {}
+        for term, doc_id, tf, first, length in db.execute(
+                f"SELECT p.term, p.doc, p.tf, p.first, d.length FROM postings p "
+                f"JOIN docs d ON d.id = p.doc WHERE p.term IN ({marks})", terms):
+            norm = K1 * (1 - B + B * length / avg_length)
+            scores[doc_id] = scores.get(doc_id, 0.0) + idf[term] * tf * (K1 + 1) / (tf + norm)
+            offsets[doc_id] = min(offsets.get(doc_id, first), first)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        if not ranked:
+            return []
+        paths = dict(db.execute(
+            f"SELECT id, path FROM docs WHERE id IN ({','.join('?' * len(ranked))})",
+            [doc_id for doc_id, _ in ranked]))
+        return [{"path": paths[doc_id], "score": round(score, 4), "offset": offsets[doc_id]}
+                for doc_id, score in ranked]
+
+    def snippets(self, query, limit=5, budget=2000):
+        """
+        Top documents for the query with a text excerpt each, cut around the
+        first match, until `budget` characters of excerpts are used:
+        [{"path", "score", "snippet"}]
+        """
+        results = []
+        for hit in self.search(query, limit):
+            if budget <= 0:
+                break
+            try:
+                with open(os.path.join(self.root, hit["path"]), 'r',
+                          encoding='utf-8', errors='replace') as f:
+                    text = f.read()
+            except OSError:
+                continue
+            start = max(0, hit["offset"] - SNIPPET_LEAD)
+            excerpt = " ".join(text[start:start + min(SNIPPET_CHARS, budget)].split())
+            if not excerpt:
+                continue
+            budget -= len(excerpt)
+            results.append({"path": hit["path"], "score": hit["score"],
+                            "snippet": ("…" if start else "") + excerpt})
+        return results
+
+    def stats(self):
+        db = self.connect()
+        if db is None:
+            return {"available": False}
+        documents, tokens = db.execute("SELECT COUNT(*), COALESCE(SUM(length), 0) FROM docs").fetchone()
+        terms = db.execute("SELECT COUNT(DISTINCT term) FROM postings").fetchone()[0]
+        return {"available": True, "documents": documents, "tokens": tokens, "terms": terms,
+                "bytes": os.path.getsize(self.db_path)}
+
+
+def _idf(total, count):
+    return math.log(1 + (total - count + 0.5) / (count + 0.5))
+
+
+def main():
+    """CLI interface for memory-bank search"""
+    import argparse
+    import json
+    import time
+
+    parser = argparse.ArgumentParser(description="Memory Bank Search")
+    parser.add_argument("--refresh", action="store_true", help="Update the index from the tree")
+    parser.add_argument("--query", help="Ranked keyword query (refreshes the index first)")
+    parser.add_argument("--limit", type=int, default=10, help="Results to return")
+    parser.add_argument("--snippets", type=int, metavar="CHARS",
+                        help="Include excerpts, up to CHARS characters in total")
+    parser.add_argument("--no-refresh", action="store_true", help="Query the index as it is")
+    parser.add_argument("--stats", action="store_true", help="Index size")
+
+    args = parser.parse_args()
+
+    search = MemorySearch()
+    start = time.perf_counter()
+
+    if args.refresh:
+        result = search.refresh()
+
+    elif args.query:
+        if not args.no_refresh:
+            search.refresh()
+        if args.snippets:
+            hits = search.snippets(args.query, args.limit, args.snippets)
+        else:
+            hits = search.search(args.query, args.limit)
+        result = {"query": args.query, "terms": query_terms(args.query), "results": hits}
+
+    elif args.stats:
+        result = search.stats()
+
+    else:
+        parser.print_help()
+        return
+
+    result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 3)
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Memory Bank Reference Graph
+Which memory-bank documents link to which, persisted to
+memory-bank/.cache/references.marshal with both directions stored:
+
+  docs       {rel_path: [mtime_ns, size, (referenced rel_path, ...)]}
+  cited_by   {rel_path: {citing rel_path, ...}}
+
+A reference is a `memory-bank/<path>` mention anywhere in a document or a
+relative markdown link (`[text](../plans/x.md)`) resolved against the
+document's directory. Targets are memory-bank relative and need not exist
+(dangling links are kept). Combined with the command output patterns
+(memory_bank_index.command_for_path), edges answer which parent command
+outputs a document cites.
+
+refresh() lists documents through MemoryBankIndex, stats each one and
+rescans only new or changed documents, on a process pool when there are
+many of them; removed documents drop their edges. update() does the same
+for a few known paths, which is what the enforcer uses per validation.
+Queries are dict lookups.
+
+Usage:
+  reference_graph.py --refresh [--jobs N]
+  reference_graph.py --cited-by implementation/guide.md [--command /review-code]
+  reference_graph.py --references reviews/review-001.md
+  reference_graph.py --stats
+"""
+
+import marshal
+import os
+import posixpath
+import re
+
+import hook_config
+from memory_bank_index import MemoryBankIndex, command_for_path
+
+GRAPH_VERSION = 1
+MEMORY_BANK = os.path.join(hook_config.PROJECT_ROOT, "memory-bank")
+
+# Only markdown documents are scanned for references
+DOCUMENT_SUFFIXES = (".md",)
+
+# Stale documents below this count are scanned in-process
+PARALLEL_MIN_DOCS = 512
+
+_BANK_REF = re.compile(r"memory-bank/([^\s<>()\[\]{}\"'`|,;*]+)")
+_MD_LINK = re.compile(r"\]\(\s*<?([^)\s>]+)")
+
+
+def extract_references(content, rel_path=None):
+    """
+    Sorted memory-bank relative paths referenced by a document's text.
+    Relative markdown links are resolved only when the document's own
+    `rel_path` is known.
+    """
+    refs = set()
+    for match in _BANK_REF.finditer(content):
+        target = _normalize(match.group(1).rstrip(".:"))
+        if target:
+            refs.add(target)
+
+    if rel_path is not None:
+        base = posixpath.dirname(rel_path)
+        for match in _MD_LINK.finditer(content):
+            target = match.group(1).split("#", 1)[0].split("?", 1)[0]
+            if not target or ":" in target or target.startswith("/") or "memory-bank/" in target:
+                continue  # URL, absolute path, anchor, or already seen above
+            target = _normalize(posixpath.join(base, target))
+            if target:
+                refs.add(target)
+        refs.discard(rel_path)
+    return sorted(refs)
+
+
+def _normalize(path):
+    path = posixpath.normpath(path)
+    if path in (".", "..") or path.startswith("../"):
+        return None
+    return path
+
+
+def is_document(rel_path):
+    return rel_path.endswith(DOCUMENT_SUFFIXES) and not posixpath.basename(rel_path).startswith(".")
+
+
+def scan_documents(root, items):
+    """Worker entry point: [(rel_path, stamp, refs)] for [(rel_path, stamp)]"""
+    results = []
+    for rel_path, stamp in items:
+        try:
+            with open(os.path.join(root, rel_path), 'r', encoding='utf-8', errors='replace') as f:
+                refs = extract_references(f.read(), rel_path)
+        except OSError:
+            refs = []
+        results.append((rel_path, stamp, tuple(refs)))
+    return results
+
+
+class ReferenceGraph:
+    """Persistent document -> document reference graph of a memory-bank tree"""
+
+    def __init__(self, root=MEMORY_BANK, index=None, graph_path=None):
+        self.root = str(root)
+        self.index = index
+        self.graph_path = graph_path or os.path.join(self.root, ".cache", "references.marshal")
+        self.docs = None
+        self.cited = None
+        self._dirty = False
+
+    # ------------------------------------------------------------------
+    # Updates
+
+    def refresh(self, jobs=None):
+        """Rescan new and changed documents, drop removed ones; returns self"""
+        self._ensure_loaded()
+        if self.index is None:
+            self.index = MemoryBankIndex(self.root)
+        self.index.refresh()
+
+        current = [rel for rel in self.index.walk() if is_document(rel)]
+        for rel_path in set(self.docs) - set(current):
+            self._set_refs(rel_path, None)
+
+        self._rescan(self._stale(current), jobs)
+        self.save()
+        return self
+
+    def update(self, rel_paths):
+        """Bring the given documents up to date (rescanned only when changed)"""
+        self._ensure_loaded()
+        rel_paths = [rel for rel in rel_paths if is_document(rel)]
+        for rel_path in rel_paths:
+            if not os.path.exists(os.path.join(self.root, rel_path)):
+                self._set_refs(rel_path, None)
+        self._rescan(self._stale(rel_paths), jobs=1)
+        self.save()
+        return self
+
+    def _stale(self, rel_paths):
+        stale = []
+        for rel_path in rel_paths:
+            try:
+                st = os.stat(os.path.join(self.root, rel_path))
+            except OSError:
+                continue
+            stamp = [st.st_mtime_ns, st.st_size]
+            record = self.docs.get(rel_path)
+            if record is None or record[:2] != stamp:
+                stale.append((rel_path, stamp))
+        return stale
+
+    def _rescan(self, stale, jobs=None):
+        if not stale:
+            return
+        jobs = jobs or os.cpu_count() or 1
+        if jobs <= 1 or len(stale) < PARALLEL_MIN_DOCS:
+            results = scan_documents(self.root, stale)
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            size = max(64, len(stale) // (jobs * 4))
+            batches = [stale[i:i + size] for i in range(0, len(stale), size)]
+            results = []
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                for batch in pool.map(scan_documents, [self.root] * len(batches), batches):
+                    results.extend(batch)
+
+        for rel_path, stamp, refs in results:
+            self._set_refs(rel_path, refs, stamp)
+
+    def _set_refs(self, rel_path, refs, stamp=None):
+        """Replace a document's outgoing edges (refs=None removes the document)"""
+        old = self.docs.pop(rel_path, None)
+        for target in (old[2] if old else ()):
+            citing = self.cited.get(target)
+            if citing is not None:
+                citing.discard(rel_path)
+                if not citing:
+                    del self.cited[target]
+        if refs is not None:
+            self.docs[rel_path] = [stamp[0], stamp[1], refs]
+            for target in refs:
+                self.cited.setdefault(target, set()).add(rel_path)
+        self._dirty = self._dirty or old is not None or refs is not None
+
+    # ------------------------------------------------------------------
+    # Queries
+
+    def references(self, rel_path):
+        """Paths a document references (as of the last refresh/update)"""
+        self._ensure_loaded()
+        record = self.docs.get(rel_path)
+        return list(record[2]) if record else []
+
+    def cited_by(self, rel_path, command=None, compiled=None):
+        """
+        Documents referencing a path, sorted; with `command` (and the
+        compiled output patterns), only documents that command produced.
+        """
+        self._ensure_loaded()
+        citing = self.cited.get(_normalize(rel_path) or rel_path, ())
+        if command is not None:
+            citing = [rel for rel in citing if command_for_path(rel, compiled) == command]
+        return sorted(citing)
+
+    def stats(self):
+        self._ensure_loaded()
+        return {
+            "documents": len(self.docs),
+            "edges": sum(len(record[2]) for record in self.docs.values()),
+            "targets": len(self.cited),
+            "dangling": sum(1 for target in self.cited
+                            if not os.path.exists(os.path.join(self.root, target))),
+        }
+
+    # ------------------------------------------------------------------
+    # Persistence
+
+    def _ensure_loaded(self):
+        if self.docs is None:
+            self.docs, self.cited = self._load()
+
+    def _load(self):
+        try:
+            with open(self.graph_path, 'rb') as f:
+                graph = marshal.loads(f.read())
+            if graph.get("version") == GRAPH_VERSION:
+                return graph["docs"], graph["cited_by"]
+        except (OSError, EOFError, ValueError, TypeError, KeyError, AttributeError):
+            pass
+        return {}, {}
+
+    def save(self):
+        if not self._dirty:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.graph_path), exist_ok=True)
+            tmp_path = f"{self.graph_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                marshal.dump({"version": GRAPH_VERSION, "docs": self.docs,
+                              "cited_by": self.cited}, f)
+            os.replace(tmp_path, self.graph_path)
+            self._dirty = False
+        except (OSError, ValueError):
+            pass  # Graph is a cache; queries still work from memory
+
+
+def main():
+    """CLI interface for the reference graph"""
+    import argparse
+    import json
+    import time
+
+    parser = argparse.ArgumentParser(description="Memory Bank Reference Graph")
+    parser.add_argument("--refresh", action="store_true", help="Update the graph from the tree")
+    parser.add_argument("--jobs", type=int, help="Scan processes (default: CPU count)")
+    parser.add_argument("--cited-by", metavar="PATH", help="Documents referencing a path")
+    parser.add_argument("--command", help="With --cited-by: only documents this command produced")
+    parser.add_argument("--references", metavar="PATH", help="Paths a document references")
+    parser.add_argument("--stats", action="store_true", help="Graph size")
+
+    args = parser.parse_args()
+
+    graph = ReferenceGraph()
+    start = time.perf_counter()
+
+    if args.refresh:
+        graph.refresh(args.jobs)
+        result = graph.stats()
+
+    elif args.cited_by:
+        compiled = None
+        if args.command:
+            from command_registry import registry
+            from memory_bank_index import compile_outputs
+            compiled = compile_outputs(registry)
+        result = {"path": args.cited_by, "command": args.command,
+                  "cited_by": graph.cited_by(args.cited_by, args.command, compiled)}
+
+    elif args.references:
+        result = {"path": args.references, "references": graph.references(args.references)}
+
+    elif args.stats:
+        result = graph.stats()
+
+    else:
+        parser.print_help()
+        return
+
+    result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 3)
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Hook Rule Plugins
+Safety rules evaluated by hook-dispatch.py (and by the standalone hook
+scripts, one rule each). The registry below is plain data: a rule module is
+imported only when a payload for one of its tools arrives, so rules for
+other tools cost nothing.
+
+A rule module provides:
+  check(tool_name, tool_input) -> None | (BLOCK | WARN, message)
+reading only the tool_input fields it is registered with.
+"""
+
+import importlib
+import sys
+
+import hook_timing
+
+BLOCK = "block"
+WARN = "warn"
+
+# Rule name (module in this package) -> tools it applies to and the
+# tool_input fields it reads. Rules run in registration order.
+REGISTRY = {
+    "bash_guard": {"tools": ["Bash"], "fields": ["command"]},
+    "protected_branch": {"tools": ["Write", "Edit"], "fields": ["file_path"]},
+}
+
+_by_tool = None
+
+
+def register(name, tools, fields):
+    """Add a rule module (rules.<name>) for the given tools"""
+    global _by_tool
+    REGISTRY[name] = {"tools": list(tools), "fields": list(fields)}
+    _by_tool = None
+
+
+def rules_for(tool_name):
+    """Names of the rules that apply to a tool, in registration order"""
+    global _by_tool
+    if _by_tool is None:
+        _by_tool = {}
+        for name, spec in REGISTRY.items():
+            for tool in spec["tools"]:
+                _by_tool.setdefault(tool, []).append(name)
+    return _by_tool.get(tool_name, [])
+
+
+def selected_rules(tool_name, names=None):
+    """rules_for(), restricted to `names` when given"""
+    selected = rules_for(tool_name)
+    if names is not None:
+        selected = [n for n in selected if n in names]
+    return selected
+
+
+def payload_spec(names=None):
+    """
+    hook_payload spec for the fields the rules need. The tool_input fields
+    are chosen once tool_name is known (all registered fields otherwise).
+    """
+    def tool_input(parsed):
+        if "tool_name" in parsed:
+            selected = selected_rules(parsed["tool_name"], names)
+        else:
+            selected = names if names is not None else list(REGISTRY)
+        fields = {f for n in selected for f in REGISTRY[n]["fields"]}
+        return {f: True for f in fields} or None
+
+    return {"tool_name": True, "tool_input": tool_input}
+
+
+def load_rule(name):
+    return importlib.import_module(f"{__name__}.{name}")
+
+
+def evaluate(tool_name, tool_input, names=None):
+    """
+    Run the applicable rules, printing each verdict's message to stderr.
+    Stops at the first blocking verdict. Returns the hook exit code
+    (2 blocks the tool call, 0 allows it).
+    """
+    for name in selected_rules(tool_name, names):
+        with hook_timing.phase("rules"):
+            verdict = load_rule(name).check(tool_name, tool_input)
+        if verdict is None:
+            continue
+        action, message = verdict
+        print(message, file=sys.stderr)
+        if action == BLOCK:
+            return 2  # Exit code 2 blocks the tool call
+    return 0
+
+
+def run_stdin(names=None):
+    """Read the payload from stdin and evaluate; returns the exit code"""
+    from hook_payload import read_stdin_payload
+
+    try:
+        with hook_timing.phase("parse"):
+            data = read_stdin_payload(
+                payload_spec(names),
+                until=lambda d: "tool_name" in d and not selected_rules(d["tool_name"], names))
+    except ValueError:
+        return 0  # Allow if can't parse
+
+    tool_name = data.get("tool_name", "")
+    hook_timing.set_tool(tool_name)
+    tool_input = data.get("tool_input", {}) or {}
+    if not isinstance(tool_input, dict):
+        return 0
+    return evaluate(tool_name, tool_input, names)
@@ -0,0 +1,38 @@
+"""
+Rule: Dangerous Bash Commands
+Blocks destructive commands and warns on risky ones (bash_patterns rule set),
+with verdicts of repeated commands served from verdict_cache.
+"""
+
+import verdict_cache
+from bash_patterns import load_rule_set
+
+from rules import BLOCK, WARN
+
+
+def check(tool_name, tool_input):
+    command = tool_input.get("command", "")
+    if not command:
+        return None
+
+    # Dangerous patterns block, warning patterns only warn (cached per command)
+    verdict = verdict_cache.match(load_rule_set(), command)
+
+    if verdict and verdict[0] == "block":
+        return BLOCK, (
+            f"BLOCKED: Dangerous command pattern detected.\n"
+            f"Pattern: {verdict[1]}\n"
+            f"Command: {command}\n\n"
+            f"This command could cause irreversible damage. "
+            f"Please use a safer alternative."
+        )
+
+    if verdict and verdict[0] == "warn":
+        return WARN, (
+            f"WARNING: Potentially dangerous command.\n"
+            f"Pattern: {verdict[1]}\n"
+            f"Command: {command}\n\n"
+            f"Proceeding with caution. Ensure this is intentional."
+        )
+
+    return None
@@ -0,0 +1,49 @@
+"""
+Rule: Protected Branch Writes
+Blocks Write/Edit while the current branch is protected
+(enforcement.yaml git.protected_branches).
+"""
+
+import hook_config
+from git_head import current_branch
+
+from rules import BLOCK
+
+DEFAULT_PROTECTED_BRANCHES = ["main", "master", "production", "prod"]
+
+_protected = None
+_protected_stamp = None
+
+
+def protected_branches():
+    """Protected branch names (lowercase), from enforcement.yaml git.protected_branches"""
+    global _protected, _protected_stamp
+
+    stamp = hook_config.config_stamp()
+    if _protected is not None and stamp == _protected_stamp:
+        return _protected
+
+    names = (hook_config.section("git", {}) or {}).get("protected_branches")
+    _protected = {b.lower() for b in (names or DEFAULT_PROTECTED_BRANCHES)}
+    _protected_stamp = stamp
+    return _protected
+
+
+def check(tool_name, tool_input):
+    # Get current branch
+    branch = current_branch()
+    if branch is None:
+        return None  # Allow if not in git repo
+
+    if branch.lower() not in protected_branches():
+        return None  # Allow on non-protected branches
+
+    file_path = tool_input.get("file_path", "unknown")
+    return BLOCK, (
+        f"BLOCKED: Cannot write files on protected branch.\n"
+        f"Current branch: {branch}\n"
+        f"File: {file_path}\n\n"
+        f"Please create a feature branch first:\n"
+        f"  git checkout -b feature/your-feature-name\n\n"
+        f"Then make your changes and create a pull request."
+    )
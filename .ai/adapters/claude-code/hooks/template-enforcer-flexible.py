@@ -4,17 +4,30 @@ Flexible Template Enforcer
 平衡結構與創意：提供引導而非限制
 """
 
+from __future__ import annotations
+
 import os
 import json
 from pathlib import Path
-from datetime import datetime
-from typing import Dict, Any, List, Optional
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:  # 僅供型別標註，執行時不載入 typing
+    from typing import Any, Dict, List
+
+import hook_profile
+import hook_timing
+from guide_cache import GUIDE_SUFFIX, GuideCache
 
 # 專案根目錄
 PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 GUIDES_DIR = PROJECT_ROOT / ".ai" / "template" / "guides"
 MEMORY_BANK = PROJECT_ROOT / "memory-bank"
 
+# 結構檢查規則（_scan_structure）變更時遞增，使快取結果失效
+STRUCTURE_CHECK_VERSION = 1
+# 引導文件解析或提示格式（_compile_guide）變更時遞增
+GUIDE_FORMAT_VERSION = 1
+
 class FlexibleEnforcer:
     """
     靈活的模板執行器
@@ -23,9 +36,11 @@ class FlexibleEnforcer:
     - 提供引導而非規則
     """
 
-    def __init__(self):
+    def __init__(self, cache=None):
+        self.cache = cache  # ValidationCache，None 表示不快取
         self.mode = os.environ.get("TEMPLATE_MODE", "flexible")  # flexible | strict
         self.guides_dir = GUIDES_DIR
+        self.guides = GuideCache(GUIDES_DIR)
         self.memory_bank = MEMORY_BANK
 
     def pre_command_guidance(self, command: str) -> Dict[str, Any]:
@@ -33,13 +48,17 @@ class FlexibleEnforcer:
         命令執行前的引導（非阻擋）
         """
         # 檢查是否有引導文件
-        guide_file = self.guides_dir / f"{command[1:]}-guide.md"
+        guide = self._guide(command)
 
-        if guide_file.exists():
+        if guide:
             return {
                 "status": "guided",
-                "message": f"找到引導文件：{guide_file.name}",
-                "guidance": self._load_guidance(guide_file),
+                "message": f"找到引導文件：{command[1:]}{GUIDE_SUFFIX}",
+                "guidance": {
+                    "type": "guidance",
+                    "sections": guide["sections"],
+                    "flexibility_level": "high"
+                },
                 "mode": self.mode,
                 "action": "proceed"  # 永不阻擋
             }
@@ -82,12 +101,28 @@ class FlexibleEnforcer:
 
         return feedback
 
-    def _load_guidance(self, guide_file: Path) -> Dict[str, Any]:
-        """載入引導內容"""
-        with open(guide_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+    def _guide(self, command: str):
+        """已編譯的引導文件（段落與提示），無引導文件時為 None"""
+        return self.guides.get(f"{command[1:]}{GUIDE_SUFFIX}",
+                               lambda content: self._compile_guide(command, content),
+                               GUIDE_FORMAT_VERSION)
+
+    def warm_guides(self) -> Dict[str, Any]:
+        """一次編譯所有引導文件並寫入快取"""
+        def compile_for(name):
+            command = "/" + name[:-len(GUIDE_SUFFIX)]
+            return lambda content: self._compile_guide(command, content)
+        return self.guides.warm(compile_for, GUIDE_FORMAT_VERSION)
+
+    def _compile_guide(self, command: str, content: str) -> Dict[str, Any]:
+        """解析引導文件的段落並渲染提示（結果由 GuideCache 保存）"""
+        return {
+            "sections": self._parse_sections(content),
+            "prompt": self._render_guided_prompt(command, content),
+        }
 
-        # 解析 markdown 結構（簡化版）
+    def _parse_sections(self, content: str) -> Dict[str, Any]:
+        """解析 markdown 結構（簡化版）"""
         sections = {}
         current_section = None
         current_content = []
@@ -104,17 +139,20 @@ class FlexibleEnforcer:
         if current_section:
             sections[current_section] = '\n'.join(current_content)
 
-        return {
-            "type": "guidance",
-            "sections": sections,
-            "flexibility_level": "high"
-        }
+        return sections
 
     def _check_structure(self, command: str, file_path: str) -> Dict[str, Any]:
         """
         檢查文件結構（非強制性）
-        返回建議和表揚
+        返回建議和表揚；有快取時，內容未變的文檔直接回傳先前結果
         """
+        if self.cache is None:
+            return self._scan_structure(command, file_path)
+        return self.cache.get("structure", command, file_path, STRUCTURE_CHECK_VERSION,
+                              lambda p: self._scan_structure(command, p))
+
+    def _scan_structure(self, command: str, file_path: str) -> Dict[str, Any]:
+        """實際讀取文件並檢查結構元素"""
         feedback = {
             "suggestions": [],
             "strengths": []
@@ -166,18 +204,9 @@ class FlexibleEnforcer:
 
         return "✅ 文檔已保存。"
 
-    def get_template_prompt(self, command: str) -> str:
-        """
-        為 LLM 生成引導提示
-        強調創意自由和價值導向
-        """
-        guide_file = self.guides_dir / f"{command[1:]}-guide.md"
-
-        if guide_file.exists():
-            with open(guide_file, 'r', encoding='utf-8') as f:
-                guide_content = f.read()
-
-            return f"""
+    def _render_guided_prompt(self, command: str, guide_content: str) -> str:
+        """有引導文件時的提示（結果由 GuideCache 保存）"""
+        return f"""
 # {command} 任務引導
 
 {guide_content}
@@ -190,6 +219,16 @@ class FlexibleEnforcer:
 
 請根據專案實際情況，創造最合適的文檔。
 """
+
+    def get_template_prompt(self, command: str) -> str:
+        """
+        為 LLM 生成引導提示
+        強調創意自由和價值導向
+        """
+        guide = self._guide(command)
+
+        if guide:
+            return guide["prompt"]
         else:
             return f"""
 # {command} 自由創作
@@ -213,27 +252,54 @@ def main():
     parser.add_argument("--pre-check", help="Pre-command guidance")
     parser.add_argument("--post-check", help="Post-command feedback")
     parser.add_argument("--files", nargs="+", help="Output files")
+    parser.add_argument("--changed-since", metavar="REV",
+                        help="Only check files changed since this git revision")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore stored check results")
     parser.add_argument("--prompt", help="Generate LLM prompt for command")
+    parser.add_argument("--warm-guides", action="store_true",
+                        help="Compile every guide into the guide cache")
 
     args = parser.parse_args()
 
     enforcer = FlexibleEnforcer()
 
     if args.pre_check:
-        result = enforcer.pre_command_guidance(args.pre_check)
+        with hook_timing.phase("rules"):
+            result = enforcer.pre_command_guidance(args.pre_check)
         print(json.dumps(result, indent=2, ensure_ascii=False))
 
     elif args.post_check and args.files:
-        result = enforcer.post_command_check(args.post_check, args.files)
+        from validation_cache import ValidationCache, split_changed
+
+        if not args.no_cache:
+            enforcer.cache = ValidationCache()
+        files, skipped = args.files, []
+        if args.changed_since:
+            try:
+                files, skipped = split_changed(files, args.changed_since)
+            except ValueError as e:
+                parser.error(str(e))
+
+        with hook_timing.phase("rules"):
+            result = enforcer.post_command_check(args.post_check, files)
+        if enforcer.cache is not None:
+            enforcer.cache.save()
+        if args.changed_since:
+            result["skipped"] = skipped
         print(json.dumps(result, indent=2, ensure_ascii=False))
 
     elif args.prompt:
         prompt = enforcer.get_template_prompt(args.prompt)
         print(prompt)
 
+    elif args.warm_guides:
+        result = enforcer.warm_guides()
+        result["cache"] = enforcer.guides.cache_path
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+
     else:
         parser.print_help()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    hook_profile.run_main(main)
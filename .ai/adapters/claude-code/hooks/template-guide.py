@@ -5,139 +5,60 @@ Template Guidance Hook for LLM
 允許 LLM 在保持結構的同時自由創造內容
 """
 
-import yaml
+from __future__ import annotations
+
+import os
 import json
 from pathlib import Path
-from typing import Dict, List, Any
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:  # 僅供型別標註，執行時不載入 typing
+    from typing import Any, Dict, List, Optional
+
+import hook_profile
+import hook_timing
+from command_registry import RegistryError, registry
+from keyword_scan import read_chunks, scan_keywords
+
+# 驗證邏輯（_validate / _keywords_present）變更時遞增，使快取結果失效
+VALIDATION_VERSION = 1
 
 class TemplateGuide:
     """引導式模板系統 - 提供結構但不限制創意"""
 
-    def __init__(self):
+    def __init__(self, cache=None):
+        self.cache = cache  # ValidationCache，None 表示不快取
         self.template_dir = Path(__file__).parent.parent / "template" / "guides"
         self.v1_reference = Path.cwd() / "docs" / "archive" / "templates_v1"
 
     def get_template_guidance(self, command: str) -> Dict[str, Any]:
         """
-        獲取模板引導而非填充規則
+        獲取模板引導而非填充規則（取自 .ai/enforcement.yaml 的 guidance）
         返回：
         - essential_structure: 必須包含的核心結構
         - guidance_principles: 引導原則而非固定欄位
         - examples: 參考範例但可自由發揮
         - constraints: 最小約束條件
         """
-
-        guidance = {
-            "/van": {
-                "purpose": "理解並轉化業務需求",
-                "essential_structure": [
-                    "專案背景與問題陳述",
-                    "核心目標與成功指標",
-                    "使用者故事與驗收標準",
-                    "範圍定義與約束"
-                ],
-                "guidance_principles": {
-                    "focus": "問題驅動而非解決方案驅動",
-                    "clarity": "使用業務語言而非技術術語",
-                    "completeness": "涵蓋 Why, What, Who, When",
-                    "flexibility": "根據專案特性調整內容深度"
-                },
-                "freedom_areas": [
-                    "故事格式可調整（不一定要 As a...I want...）",
-                    "可加入領域特定章節（如合規要求、市場分析）",
-                    "圖表和視覺化自由選擇"
-                ],
-                "minimal_constraints": {
-                    "must_have": ["問題陳述", "目標", "範圍"],
-                    "format": "Markdown with clear sections",
-                    "output": "memory-bank/requirements/"
-                }
-            },
-
-            "/creative": {
-                "purpose": "架構設計與技術願景",
-                "essential_structure": [
-                    "架構總覽與設計理念",
-                    "系統組成與互動關係",
-                    "技術選型與理由",
-                    "關鍵設計決策"
-                ],
-                "guidance_principles": {
-                    "vision": "展現架構願景而非細節堆砌",
-                    "rationale": "每個決策都要有理由",
-                    "adaptability": "考慮未來演進路徑",
-                    "context": "架構符合業務目標"
-                },
-                "freedom_areas": [
-                    "架構圖表風格（C4, UML, 自定義）",
-                    "可選擇性包含 DDD, Clean Architecture 等",
-                    "技術棧描述深度根據需要調整",
-                    "可加入架構模式、設計模式討論"
-                ],
-                "minimal_constraints": {
-                    "must_have": ["系統架構圖", "技術選型", "設計決策"],
-                    "format": "Visual + Narrative",
-                    "output": "memory-bank/designs/architecture/"
-                }
-            },
-
-            "/implement": {
-                "purpose": "實作指導與開發藍圖",
-                "essential_structure": [
-                    "實作階段規劃",
-                    "核心模組設計",
-                    "介面定義",
-                    "測試策略"
-                ],
-                "guidance_principles": {
-                    "pragmatic": "實用導向而非理論完美",
-                    "incremental": "漸進式交付價值",
-                    "testable": "每個模組都可測試",
-                    "maintainable": "考慮長期維護"
-                },
-                "freedom_areas": [
-                    "代碼組織方式自由選擇",
-                    "測試框架和策略彈性決定",
-                    "可包含或省略詳細代碼範例",
-                    "開發順序可根據優先級調整"
-                ],
-                "minimal_constraints": {
-                    "must_have": ["模組劃分", "介面定義", "測試計劃"],
-                    "format": "Actionable guide",
-                    "output": "memory-bank/implementation/"
-                }
-            }
-        }
-
-        return guidance.get(command, self._default_guidance())
+        return registry.guidance(command)
 
     def _default_guidance(self) -> Dict[str, Any]:
         """預設引導結構"""
-        return {
-            "purpose": "根據指令目的自由發揮",
-            "essential_structure": [
-                "目的與背景",
-                "核心內容",
-                "結論與下一步"
-            ],
-            "guidance_principles": {
-                "clarity": "清晰表達核心觀點",
-                "completeness": "涵蓋必要資訊",
-                "actionable": "提供可執行建議"
-            },
-            "freedom_areas": ["格式", "深度", "範例"],
-            "minimal_constraints": {
-                "must_have": ["核心內容"],
-                "format": "Markdown",
-                "output": "memory-bank/"
-            }
-        }
+        return registry.compiled()["default_guidance"]
 
-    def create_llm_prompt(self, command: str, context: Dict[str, Any]) -> str:
+    def create_llm_prompt(self, command: str, context: Dict[str, Any], related: int = 0,
+                          related_budget: int = 2000, related_query: Optional[str] = None) -> str:
         """
         為 LLM 創建引導提示而非填充指令
+        related > 0 時從 memory-bank 檢索最相關的既有文檔片段（總長度不超過
+        related_budget 字元）附在專案上下文之後；查詢預設取自 context 與目的
         """
         guidance = self.get_template_guidance(command)
+        related_section = ""
+        if related > 0:
+            query = related_query or " ".join(_text_values(context) + [guidance['purpose']])
+            related_section = self._format_related(
+                self._related_documents(query, related, related_budget))
 
         prompt = f"""
 # 任務引導：{command}
@@ -161,7 +82,7 @@ class TemplateGuide:
 
 ## 專案上下文
 {json.dumps(context, indent=2, ensure_ascii=False)}
-
+{related_section}
 ---
 請根據以上引導創建文檔。記住：
 1. 保持核心結構但形式可自由發揮
@@ -171,6 +92,27 @@ class TemplateGuide:
 """
         return prompt
 
+    def _related_documents(self, query: str, limit: int, budget: int) -> List[Dict[str, Any]]:
+        """memory-bank 全文檢索（增量更新索引後）取前 limit 筆片段"""
+        from memory_search import MemorySearch
+
+        search = MemorySearch()
+        try:
+            search.refresh()
+            return search.snippets(query, limit, budget)
+        finally:
+            search.close()
+
+    def _format_related(self, hits: List[Dict[str, Any]]) -> str:
+        """格式化檢索片段為 markdown（無結果時為空字串）"""
+        if not hits:
+            return ""
+        lines = ["", "## 相關既有文檔（memory-bank 檢索，供參考）"]
+        for hit in hits:
+            lines.append(f"- memory-bank/{hit['path']}")
+            lines.append(f"  > {hit['snippet']}")
+        return '\n'.join(lines) + '\n'
+
     def _format_list(self, items: List[str]) -> str:
         """格式化列表為 markdown"""
         return '\n'.join(f"- {item}" for item in items)
@@ -184,17 +126,43 @@ class TemplateGuide:
         驗證輸出是否符合最小約束
         不檢查固定欄位，只確保核心元素存在
         """
+        return self._validate(command, [content])
+
+    def validate_file(self, command: str, path: str) -> Dict[str, Any]:
+        """
+        串流驗證輸出檔案，逐塊讀取而不載入整份文檔
+        有快取時，內容與 must_have 未變的文檔直接回傳先前結果
+        """
+        if self.cache is None:
+            return self._validate(command, read_chunks(path))
+
+        must_have = self.get_template_guidance(command)['minimal_constraints']['must_have']
+        return self.cache.get("guide", command, path, [VALIDATION_VERSION, list(must_have)],
+                              lambda p: self._validate(command, read_chunks(p)))
+
+    def _validate(self, command: str, chunks) -> Dict[str, Any]:
+        """
+        一次掃描比對所有必要元素的關鍵詞
+        matches 記錄每個關鍵詞首次出現的位置（未出現為 null）
+        """
         guidance = self.get_template_guidance(command)
+        must_have = guidance['minimal_constraints']['must_have']
+        element_keywords = {element: element.lower().split() for element in must_have}
+        offsets = scan_keywords(
+            chunks, {kw for kws in element_keywords.values() for kw in kws})
+
         validation = {
             "valid": True,
             "missing": [],
-            "suggestions": []
+            "suggestions": [],
+            "matches": {}
         }
 
         # 只檢查必要元素是否以某種形式存在
-        for element in guidance['minimal_constraints']['must_have']:
+        for element, keywords in element_keywords.items():
+            validation["matches"][element] = {kw: offsets[kw] for kw in keywords}
             # 使用模糊匹配而非精確匹配
-            if not self._fuzzy_check(content, element):
+            if not self._keywords_present(keywords, offsets):
                 validation["valid"] = False
                 validation["missing"].append(element)
 
@@ -215,12 +183,41 @@ class TemplateGuide:
         # 簡單的關鍵詞檢查，可以更智能
         keywords = element.lower().split()
         content_lower = content.lower()
+        offsets = {kw: content_lower.find(kw) for kw in keywords if kw in content_lower}
+        return self._keywords_present(keywords, offsets)
 
+    def _keywords_present(self, keywords: List[str], offsets: Dict[str, Any]) -> bool:
+        """offsets 為 scan_keywords 的結果（未出現為 None）"""
         # 如果大部分關鍵詞都出現，就認為元素存在
-        matches = sum(1 for kw in keywords if kw in content_lower)
+        matches = sum(1 for kw in keywords if offsets.get(kw) is not None)
         return matches >= len(keywords) * 0.6  # 60% 匹配即可
 
 
+def _text_values(value) -> List[str]:
+    """context 中所有字串值（遞迴展開 dict / list）"""
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, dict):
+        value = list(value.values())
+    if isinstance(value, list):
+        return [text for item in value for text in _text_values(item)]
+    return []
+
+
+def _expand_paths(targets):
+    """檔案原樣保留，目錄展開為其下所有 .md 檔案"""
+    paths = []
+    for target in targets:
+        if os.path.isdir(target):
+            for root, dirs, files in os.walk(target):
+                dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+                paths.extend(os.path.join(root, name) for name in sorted(files)
+                             if name.endswith(".md") and not name.startswith("."))
+        else:
+            paths.append(target)
+    return paths
+
+
 def main():
     """CLI 介面"""
     import argparse
@@ -228,23 +225,60 @@ def main():
     parser = argparse.ArgumentParser(description="Template Guidance System")
     parser.add_argument("--command", help="Command to get guidance for")
     parser.add_argument("--prompt", action="store_true", help="Generate LLM prompt")
-    parser.add_argument("--validate", help="Validate output file")
+    parser.add_argument("--validate", nargs="+", metavar="PATH",
+                        help="Validate output files (directories: every .md file)")
+    parser.add_argument("--changed-since", metavar="REV",
+                        help="Only validate files changed since this git revision")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore stored validation results")
     parser.add_argument("--context", help="JSON context for prompt", default="{}")
+    parser.add_argument("--related", type=int, default=0, metavar="K",
+                        help="With --prompt: add the K most relevant memory-bank excerpts")
+    parser.add_argument("--related-budget", type=int, default=2000, metavar="CHARS",
+                        help="Total size of the added excerpts")
+    parser.add_argument("--related-query", help="Search query (default: context values and purpose)")
 
     args = parser.parse_args()
 
+    try:
+        registry.compiled()
+    except RegistryError as e:
+        parser.exit(1, f"{parser.prog}: 錯誤：{e}\n")
+
     guide = TemplateGuide()
 
     if args.prompt and args.command:
         context = json.loads(args.context)
-        prompt = guide.create_llm_prompt(args.command, context)
+        prompt = guide.create_llm_prompt(args.command, context, args.related,
+                                         args.related_budget, args.related_query)
         print(prompt)
 
     elif args.validate and args.command:
-        with open(args.validate, 'r') as f:
-            content = f.read()
-        result = guide.validate_output(args.command, content)
-        print(json.dumps(result, indent=2, ensure_ascii=False))
+        from validation_cache import ValidationCache, split_changed
+
+        if not args.no_cache:
+            guide.cache = ValidationCache()
+        paths = _expand_paths(args.validate)
+        skipped = []
+        if args.changed_since:
+            try:
+                paths, skipped = split_changed(paths, args.changed_since)
+            except ValueError as e:
+                parser.error(str(e))
+
+        with hook_timing.phase("rules"):
+            results = {path: guide.validate_file(args.command, path) for path in paths}
+        if guide.cache is not None:
+            guide.cache.save()
+
+        if len(args.validate) == 1 and not os.path.isdir(args.validate[0]) and not args.changed_since:
+            print(json.dumps(results[paths[0]], indent=2, ensure_ascii=False))
+        else:
+            print(json.dumps({
+                "valid": all(r["valid"] for r in results.values()),
+                "results": results,
+                "skipped": skipped,
+                "cache": guide.cache.stats() if guide.cache is not None else None,
+            }, indent=2, ensure_ascii=False))
 
     elif args.command:
         guidance = guide.get_template_guidance(args.command)
@@ -255,4 +289,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    hook_profile.run_main(main)
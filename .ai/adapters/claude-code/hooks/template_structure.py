@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Template Structure Cache
+Headings of the output templates, extracted once and persisted to
+.ai/.cache/template-structure.json. An entry is reused while the template's
+mtime and size are unchanged, and revalidated by content hash when they are
+not. Generated documents are scanned in a single streaming pass that stops
+as soon as every wanted heading has been seen.
+"""
+
+import io
+import json
+import os
+from pathlib import Path
+
+import hook_config
+
+CACHE_VERSION = 1
+CACHE_PATH = Path(hook_config.CACHE_DIR) / "template-structure.json"
+
+
+def scan_structure(lines, targets=None):
+    """
+    One pass over a document's lines (with line endings, as file iteration
+    yields them). Returns {"headings", "frontmatter"}.
+
+    Frontmatter means the document starts with a "---" line and a later
+    "---" line exists. When `targets` is given, "headings" holds only the
+    targets found, and the scan stops once all of them are found and the
+    frontmatter is settled.
+    """
+    wanted = set(targets) if targets is not None else None
+    headings, seen = [], set()
+    opened = closed = False
+
+    for number, line in enumerate(lines):
+        if number == 0 and line == "---\n":
+            opened = True
+            continue
+        if opened and not closed:
+            if line == "---\n":
+                closed = True
+
+        if line.startswith('#'):
+            heading = line.strip()
+            if wanted is None:
+                headings.append(heading)
+            elif heading in wanted and heading not in seen:
+                seen.add(heading)
+                headings.append(heading)
+
+        if wanted is not None and len(seen) == len(wanted) and (closed or not opened):
+            break
+
+    return {
+        "headings": headings,
+        "frontmatter": opened and closed,
+    }
+
+
+class TemplateStructureCache:
+    """Persistent per-template structure cache"""
+
+    def __init__(self, template_dir, cache_path=CACHE_PATH):
+        self.template_dir = Path(template_dir)
+        self.cache_path = Path(cache_path)
+        self._entries = None
+
+    def get(self, template):
+        """Structure of a template (relative to template_dir), or None if missing"""
+        if self._entries is None:
+            self._entries = self._load()
+
+        path = self.template_dir / template
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+
+        stamp = [st.st_mtime_ns, st.st_size]
+        entry = self._entries.get(template)
+        if entry and entry["stamp"] == stamp:
+            return entry
+
+        import hashlib  # Only on a stamp miss: _hashlib costs ~4 ms to import
+
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        if entry and entry["sha256"] == digest:
+            entry["stamp"] = stamp
+        else:
+            structure = scan_structure(io.StringIO(data.decode("utf-8")))
+            entry = {
+                "stamp": stamp,
+                "sha256": digest,
+                "headings": structure["headings"],
+            }
+            self._entries[template] = entry
+
+        self._save()
+        return entry
+
+    def _load(self):
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if cache.get("version") == CACHE_VERSION:
+                return cache["templates"]
+        except (OSError, ValueError, KeyError):
+            pass
+        return {}
+
+    def _save(self):
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": CACHE_VERSION, "templates": self._entries}, f,
+                          ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            pass  # Cache is best-effort
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Validation Cache
+Results of the advisory document checks (template-guide --validate,
+template-enforcer-flexible --post-check), persisted with marshal to
+.ai/.cache/validation.marshal so unchanged documents are not validated
+again. An entry is keyed on (check, command, path) and holds the
+document's content sha256 and the validator version it was computed
+with:
+
+  stamp hit       mtime and size unchanged -> stored result, file not read
+  content hit     stamp changed, sha256 unchanged -> stored result
+  miss            content or version changed -> validated again
+
+The version is whatever the caller passes for the check (e.g. the command's
+must_have list), so editing the guidance in enforcement.yaml revalidates
+only the documents of that command. Writes are atomic and best-effort;
+concurrent runs may drop each other's new entries, never corrupt them.
+
+changed_since(rev) lists the files touched since a git revision (committed,
+staged, unstaged and untracked) and split_changed() partitions paths by it,
+for the CLIs' --changed-since option.
+"""
+
+import marshal
+import os
+
+import hook_config
+
+CACHE_VERSION = 1
+CACHE_PATH = os.path.join(hook_config.CACHE_DIR, "validation.marshal")
+
+
+class ValidationCache:
+    """Persistent per-document validation results"""
+
+    def __init__(self, cache_path=CACHE_PATH):
+        self.cache_path = cache_path
+        self._entries = None
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, check, command, path, version, validate):
+        """
+        validate(path) for a document, or its stored result while the
+        document's content and the version are unchanged. Files that cannot
+        be stat'ed are validated without caching.
+        """
+        try:
+            st = os.stat(path)
+        except OSError:
+            return validate(path)
+
+        if self._entries is None:
+            self._entries = self._load()
+
+        key = (check, command, os.path.realpath(path))
+        stamp = [st.st_mtime_ns, st.st_size]
+        entry = self._entries.get(key)
+        if entry and entry["version"] == version and entry["stamp"] == stamp:
+            self.hits += 1
+            return entry["result"]
+
+        digest = _digest(path)
+        if entry and entry["version"] == version and entry["sha256"] == digest:
+            entry["stamp"] = stamp
+            self._dirty = True
+            self.hits += 1
+            return entry["result"]
+
+        self.misses += 1
+        result = validate(path)
+        if digest is not None:
+            self._entries[key] = {"stamp": stamp, "sha256": digest,
+                                  "version": version, "result": result}
+            self._dirty = True
+        return result
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+    def save(self):
+        """Persist new and refreshed entries (no-op when nothing changed)"""
+        if not self._dirty:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                marshal.dump({"version": CACHE_VERSION, "entries": self._entries}, f)
+            os.replace(tmp_path, self.cache_path)
+            self._dirty = False
+        except (OSError, ValueError):
+            pass  # Cache is best-effort
+
+    def _load(self):
+        try:
+            with open(self.cache_path, 'rb') as f:
+                cache = marshal.loads(f.read())
+            if cache.get("version") == CACHE_VERSION:
+                return cache["entries"]
+        except (OSError, EOFError, ValueError, TypeError, KeyError, AttributeError):
+            pass
+        return {}
+
+
+def _digest(path):
+    """sha256 of a file's content, or None when it cannot be read"""
+    import hashlib
+
+    h = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+    except OSError:
+        return None
+    return h.hexdigest()
+
+
+def changed_since(rev, cwd=None):
+    """
+    Real paths of the files that differ from `rev` in the working tree,
+    plus untracked files. Raises ValueError when git cannot resolve `rev`.
+    """
+    cwd = cwd or hook_config.PROJECT_ROOT
+    top = _git(["rev-parse", "--show-toplevel"], cwd).strip()
+    diff = _git(["diff", "--name-only", "-z", rev, "--"], cwd)
+    untracked = _git(["ls-files", "--others", "--exclude-standard", "--full-name", "-z"], cwd)
+
+    names = [name for name in (diff + untracked).split("\0") if name]
+    return {os.path.realpath(os.path.join(top, name)) for name in names}
+
+
+def _git(args, cwd):
+    import subprocess
+
+    try:
+        result = subprocess.run(["git"] + args, cwd=cwd, capture_output=True, text=True, timeout=30)
+    except (subprocess.TimeoutExpired, FileNotFoundError) as e:
+        raise ValueError(f"git {args[0]} failed: {e}")
+    if result.returncode != 0:
+        raise ValueError(result.stderr.strip() or f"git {args[0]} exited {result.returncode}")
+    return result.stdout
+
+
+def split_changed(paths, rev):
+    """(changed, unchanged) partition of `paths` against changed_since(rev)"""
+    changed = changed_since(rev)
+    hit, miss = [], []
+    for path in paths:
+        (hit if os.path.realpath(path) in changed else miss).append(path)
+    return hit, miss
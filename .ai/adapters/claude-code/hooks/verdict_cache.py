@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Bash Verdict Cache
+Remembers the bash_guard verdict (block / warn / allow and the matching
+pattern) of commands already seen, keyed on a hash of the command and the
+rule-set version, so repeated commands skip pattern evaluation.
+
+  Persistent process (hook server):  in-memory LRU of MEMORY_CAPACITY entries
+  One-shot process:                  small on-disk table in .ai/.cache/,
+                                     for commands of DISK_MIN_LENGTH or more
+
+Short commands are evaluated in ~15us, less than opening the table, so a
+one-shot process only consults the table for long commands (heredocs, long
+pipelines) where evaluation costs hundreds of microseconds or more.
+
+The table (bash-verdicts.bin) is a 4-way set-associative array of 64-byte
+slots read and written with pread/pwrite, each lookup touching one set.
+Slots carry a 16-byte BLAKE2b digest of their key and verdict, so a torn
+concurrent write or a corrupted slot reads as a miss. The
+header records the rule-set version; a different version starts a new
+table, so editing bash_guard in enforcement.yaml invalidates all entries.
+Commands are hashed verbatim: trimming whitespace could change the outcome
+of anchored patterns such as '\\s*$'.
+
+Usage:
+  verdict_cache.py --stats    # on-disk table hit/miss counters
+  verdict_cache.py --clear
+"""
+
+import os
+import sys
+from collections import OrderedDict
+
+import hook_config
+
+MEMORY_CAPACITY = 4096
+DISK_MIN_LENGTH = 1024
+TABLE_PATH = os.path.join(hook_config.CACHE_DIR, "bash-verdicts.bin")
+TABLE_SLOTS = 4096
+WAYS = 4
+
+# Header: magic, slot count, rule-set version, clock, hits, misses
+MAGIC = b"BVC2"
+HEADER_SIZE = 64
+# Slot: key, outcome, pattern index, check digest, access clock
+SLOT_SIZE = 64
+_KEY, _BODY, _CHECK, _AGE = slice(0, 16), slice(0, 19), slice(19, 35), slice(35, 43)
+_VERSION, _CLOCK, _HITS, _MISSES = slice(8, 24), slice(24, 32), slice(32, 40), slice(40, 48)
+
+# Outcome codes stored in slots
+_OUTCOMES = {None: 1, "block": 2, "warn": 3}
+_VERDICTS = {code: name for name, code in _OUTCOMES.items()}
+
+_memory = None
+_table = None
+
+
+def rule_set_version(rule_set):
+    """16-byte digest of a rule set's patterns and triggers (memoized on it)"""
+    version = getattr(rule_set, "_cache_version", None)
+    if version is None:
+        from hashlib import blake2b
+
+        text = repr((rule_set.dangerous.patterns, rule_set.dangerous.triggers,
+                     rule_set.warning.patterns, rule_set.warning.triggers))
+        version = blake2b(text.encode("utf-8"), digest_size=16).digest()
+        rule_set._cache_version = version
+    return version
+
+
+def match(rule_set, command):
+    """rule_set.match(command), answered from the cache when possible"""
+    if _persistent():
+        global _memory
+        if _memory is None:
+            _memory = MemoryCache(MEMORY_CAPACITY)
+        cache = _memory
+    elif len(command) >= DISK_MIN_LENGTH:
+        global _table
+        if _table is None:
+            _table = DiskTable(TABLE_PATH)
+        cache = _table
+    else:
+        return rule_set.match(command)
+
+    version = rule_set_version(rule_set)
+    found, verdict = cache.get(version, command, rule_set)
+    if not found:
+        verdict = rule_set.match(command)
+        cache.put(version, command, rule_set, verdict)
+    return verdict
+
+
+def memory_stats():
+    """Hit counters of this process's in-memory cache"""
+    return _memory.stats() if _memory is not None else _counters(0, 0, 0)
+
+
+def _persistent():
+    runtime = sys.modules.get("hook_runtime")
+    return bool(runtime is not None and getattr(runtime, "persistent_process", False))
+
+
+def _counters(hits, misses, entries):
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / total * 100, 2) if total else 0.0,
+        "entries": entries,
+    }
+
+
+def _encode(rule_set, verdict):
+    """Verdict -> (outcome code, pattern index)"""
+    if verdict is None:
+        return _OUTCOMES[None], 0
+    level = rule_set.dangerous if verdict[0] == "block" else rule_set.warning
+    return _OUTCOMES[verdict[0]], level.patterns.index(verdict[1])
+
+
+def _decode(rule_set, outcome, index):
+    name = _VERDICTS[outcome]
+    if name is None:
+        return None
+    level = rule_set.dangerous if name == "block" else rule_set.warning
+    return name, level.patterns[index]
+
+
+class MemoryCache:
+    """LRU of verdicts for the lifetime of a persistent process"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, command):
+        # Long commands are stored by digest to bound memory
+        if len(command) <= DISK_MIN_LENGTH:
+            return command
+        from hashlib import blake2b
+
+        return blake2b(command.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+    def get(self, version, command, rule_set):
+        if version != self.version:
+            self.entries.clear()  # Rule set changed
+            self.version = version
+        key = self._key(command)
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return True, self.entries[key]
+        self.misses += 1
+        return False, None
+
+    def put(self, version, command, rule_set, verdict):
+        self.entries[self._key(command)] = verdict
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def stats(self):
+        return _counters(self.hits, self.misses, len(self.entries))
+
+
+class DiskTable:
+    """Fixed-size set-associative verdict table shared by hook processes"""
+
+    def __init__(self, path, slots=TABLE_SLOTS):
+        self.path = path
+        self.slots = slots
+        self.sets = slots // WAYS
+        self.fd = None
+        self.version = None
+
+    def get(self, version, command, rule_set):
+        if not self._open(version):
+            return False, None
+        key = self._hash(version, command)
+        offset = self._set_offset(key)
+        data = os.pread(self.fd, SLOT_SIZE * WAYS, offset)
+        for way in range(WAYS):
+            slot = data[way * SLOT_SIZE:(way + 1) * SLOT_SIZE]
+            if slot[_KEY] == key and slot[_CHECK] == _check(slot[_BODY]) \
+                    and slot[16] in _VERDICTS:
+                self._bump(_HITS)
+                self._touch(offset + way * SLOT_SIZE)
+                return True, _decode(rule_set, slot[16], int.from_bytes(slot[17:19], "little"))
+        self._bump(_MISSES)
+        return False, None
+
+    def put(self, version, command, rule_set, verdict):
+        if not self._open(version):
+            return
+        key = self._hash(version, command)
+        offset = self._set_offset(key)
+        data = os.pread(self.fd, SLOT_SIZE * WAYS, offset)
+
+        # Reuse the key's slot, else an empty one, else the least recently used
+        victim, oldest = 0, None
+        for way in range(WAYS):
+            slot = data[way * SLOT_SIZE:(way + 1) * SLOT_SIZE]
+            age = int.from_bytes(slot[_AGE], "little")
+            if slot[_KEY] == key or not any(slot):
+                victim = way
+                break
+            if oldest is None or age < oldest:
+                victim, oldest = way, age
+
+        outcome, index = _encode(rule_set, verdict)
+        body = key + bytes([outcome]) + index.to_bytes(2, "little")
+        slot = body + _check(body) + self._tick().to_bytes(8, "little")
+        slot += bytes(SLOT_SIZE - len(slot))
+        try:
+            os.pwrite(self.fd, slot, offset + victim * SLOT_SIZE)
+        except OSError:
+            pass  # Cache is best-effort
+
+    def stats(self):
+        header = self._read_header()
+        if header is None:
+            return _counters(0, 0, 0)
+        entries = 0
+        body = os.pread(self.fd, self.slots * SLOT_SIZE, HEADER_SIZE)
+        for i in range(self.slots):
+            if any(body[i * SLOT_SIZE:i * SLOT_SIZE + _KEY.stop]):
+                entries += 1
+        return _counters(int.from_bytes(header[_HITS], "little"),
+                         int.from_bytes(header[_MISSES], "little"), entries)
+
+    def clear(self):
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+        self.fd = None
+
+    # ------------------------------------------------------------------
+    # Internals
+
+    def _open(self, version):
+        """Open the table for a rule-set version, recreating it if stale"""
+        if self.fd is not None and version == self.version:
+            return True
+        header = self._read_header()
+        if header is None or header[_VERSION] != version or \
+                int.from_bytes(header[4:8], "little") != self.slots:
+            if not self._create(version):
+                return False
+        self.version = version
+        return True
+
+    def _read_header(self):
+        if self.fd is None:
+            try:
+                self.fd = os.open(self.path, os.O_RDWR)
+            except OSError:
+                return None
+        header = os.pread(self.fd, HEADER_SIZE, 0)
+        if len(header) < HEADER_SIZE or header[:4] != MAGIC:
+            return None
+        return header
+
+    def _create(self, version):
+        """Write a fresh table and swap it in atomically"""
+        header = bytearray(HEADER_SIZE)
+        header[:4] = MAGIC
+        header[4:8] = self.slots.to_bytes(4, "little")
+        header[_VERSION] = version
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(header)
+                f.truncate(HEADER_SIZE + self.slots * SLOT_SIZE)
+            os.replace(tmp_path, self.path)
+            if self.fd is not None:
+                os.close(self.fd)
+            self.fd = os.open(self.path, os.O_RDWR)
+        except OSError:
+            self.fd = None
+            return False
+        return True
+
+    def _hash(self, version, command):
+        from hashlib import blake2b
+
+        return blake2b(command.encode("utf-8", "surrogatepass"), digest_size=16,
+                       key=version).digest()
+
+    def _set_offset(self, key):
+        return HEADER_SIZE + (int.from_bytes(key[:8], "little") % self.sets) * WAYS * SLOT_SIZE
+
+    def _tick(self):
+        """Advance the shared access clock; returns the new value"""
+        clock = int.from_bytes(os.pread(self.fd, 8, _CLOCK.start), "little") + 1
+        os.pwrite(self.fd, clock.to_bytes(8, "little"), _CLOCK.start)
+        return clock
+
+    def _touch(self, slot_offset):
+        try:
+            os.pwrite(self.fd, self._tick().to_bytes(8, "little"), slot_offset + _AGE.start)
+        except OSError:
+            pass
+
+    def _bump(self, field):
+        # Unlocked read-modify-write: counters are approximate under concurrency
+        try:
+            value = int.from_bytes(os.pread(self.fd, 8, field.start), "little") + 1
+            os.pwrite(self.fd, value.to_bytes(8, "little"), field.start)
+        except OSError:
+            pass
+
+
+def _check(body):
+    """Digest of a slot's key and verdict"""
+    from hashlib import blake2b
+
+    return blake2b(body, digest_size=16, person=MAGIC).digest()
+
+
+def main():
+    """CLI interface for the on-disk verdict table"""
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Bash Verdict Cache")
+    parser.add_argument("--stats", action="store_true", help="Show hit/miss counters")
+    parser.add_argument("--clear", action="store_true", help="Delete the on-disk table")
+
+    args = parser.parse_args()
+    table = DiskTable(TABLE_PATH)
+
+    if args.clear:
+        table.clear()
+        print(json.dumps({"cleared": TABLE_PATH}, indent=2))
+
+    elif args.stats:
+        stats = table.stats()
+        stats["path"] = TABLE_PATH
+        print(json.dumps(stats, indent=2))
+
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
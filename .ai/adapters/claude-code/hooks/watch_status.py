@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Watch Status
+Verdicts precomputed by memory-watch.py, persisted with marshal to
+.ai/.cache/watch-status.marshal, for the blocking post-command hook to read
+instead of validating inline:
+
+  config      enforcement.yaml stamp the verdicts were computed with
+  commands    {command: {"outputs": [valid, message, violations, elapsed_ms],
+                         "linkage": [valid, message, violations, elapsed_ms],
+                         "parents": [linked parent commands]}}
+              (output check and parent-outputs check, as TemplateEnforcer
+              runs them without files or content)
+  documents   {rel_path: [mtime_ns, size, cites a parent output]} for every
+              document a command produced (None when it has no parents)
+  dirs        dir_stamps() of every output directory, taken before the
+              verdicts were computed
+  synced      time.time_ns() when those stamps were taken
+  pid, backend, running, pending, updated
+
+The watcher rewrites the file after every revalidation, marks it pending as
+soon as a burst of changes starts, and touches it every HEARTBEAT seconds
+while idle. load_live() returns the status only while the file is that fresh,
+the watcher is running and nothing is pending, so a stopped or hung watcher
+never answers for the tree. Callers still compare stamps, since a change
+made after the last event was seen is not in the status yet: fresh() checks
+the output directories (a file created or deleted there changes them) and
+callers compare the stamps of the documents they were given.
+"""
+
+import marshal
+import os
+import time
+
+import hook_config
+
+STATUS_VERSION = 2
+STATUS_PATH = os.path.join(hook_config.CACHE_DIR, "watch-status.marshal")
+
+HEARTBEAT = 2.0  # Seconds between touches of an idle watcher
+STALE_AFTER = 3 * HEARTBEAT
+# Directory mtimes this close to `synced` may hide a later change made within
+# the same file system timestamp tick, so they do not prove freshness
+RACY_WINDOW_NS = 50_000_000
+
+
+def empty_status():
+    return {"version": STATUS_VERSION, "config": None, "commands": {}, "documents": {},
+            "dirs": {}, "synced": 0, "pid": None, "backend": None, "running": False,
+            "pending": False, "updated": None}
+
+
+def load(path=STATUS_PATH):
+    """Status as last written, or None"""
+    try:
+        with open(path, 'rb') as f:
+            status = marshal.loads(f.read())
+        if status.get("version") == STATUS_VERSION:
+            return status
+    except (OSError, EOFError, ValueError, TypeError, AttributeError):
+        pass
+    return None
+
+
+def load_live(path=STATUS_PATH):
+    """Status of a running, settled watcher with a recent heartbeat, or None"""
+    try:
+        age = time.time() - os.stat(path).st_mtime
+    except OSError:
+        return None
+    if age > STALE_AFTER:
+        return None
+    status = load(path)
+    if status is None or not status["running"] or status["pending"]:
+        return None
+    return status
+
+
+def dir_stamps(root, rel_dirs):
+    """
+    {rel_dir: stamp} for memory-bank directories: the mtime_ns (None when the
+    directory is missing), except for the root, whose mtime also moves with
+    the enforcement log and caches, which is stamped by its visible names
+    """
+    stamps = {}
+    for rel_dir in rel_dirs:
+        try:
+            if rel_dir:
+                stamps[rel_dir] = os.stat(os.path.join(root, rel_dir)).st_mtime_ns
+            else:
+                stamps[rel_dir] = sorted(name for name in os.listdir(root)
+                                         if not name.startswith("."))
+        except OSError:
+            stamps[rel_dir] = None
+    return stamps
+
+
+def fresh(status, root):
+    """Whether no file was created or deleted in an output directory since `synced`"""
+    dirs = status["dirs"]
+    if not dirs or dir_stamps(root, dirs) != dirs:
+        return False
+    racy = status["synced"] - RACY_WINDOW_NS
+    return not any(isinstance(stamp, int) and stamp >= racy for stamp in dirs.values())
+
+
+def save(status, path=STATUS_PATH):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            marshal.dump(status, f)
+        os.replace(tmp_path, path)
+    except (OSError, ValueError):
+        pass  # Hooks validate inline without a status
+
+
+def touch(path=STATUS_PATH):
+    """Heartbeat: mark the status as still current"""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Bash pattern matcher micro-benchmark
+Compares the previous per-pattern re.search loop of deny-dangerous-bash.py
+with the compiled single-pass RuleSet from bash_patterns.py over a corpus of
+realistic commands, and checks that both produce the same verdict level.
+
+Usage:
+  python benchmarks/bench_bash_patterns.py [--count 1000] [--json out.json]
+"""
+
+import argparse
+import re
+import sys
+import time
+
+from common import HOOKS_DIR, emit, print_table
+from corpus import bash_commands
+
+sys.path.insert(0, str(HOOKS_DIR))
+import bash_patterns  # noqa: E402
+
+
+def legacy_match(command):
+    """Verdict as computed by the original deny-dangerous-bash.py loop"""
+    for pattern, _ in bash_patterns.DANGEROUS_PATTERNS:
+        if re.search(pattern, command, re.IGNORECASE):
+            return "block", pattern
+    for pattern, _ in bash_patterns.WARNING_PATTERNS:
+        if re.search(pattern, command, re.IGNORECASE):
+            return "warn", pattern
+    return None
+
+
+def run(fn, commands, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for command in commands:
+            fn(command)
+    return (time.perf_counter() - start) / (rounds * len(commands))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bash pattern matcher benchmark")
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    commands = bash_commands(args.count)
+    rules = bash_patterns.RuleSet(bash_patterns.DANGEROUS_PATTERNS,
+                                  bash_patterns.WARNING_PATTERNS)
+
+    mismatches = [c for c in commands
+                  if (legacy_match(c) or ("allow",))[0] != (rules.match(c) or ("allow",))[0]]
+
+    short = [c for c in commands if len(c) < 1024]
+    long = [c for c in commands if len(c) >= 1024]
+    results = []
+    for label, subset in (("short", short), ("heredoc", long), ("all", commands)):
+        legacy = run(legacy_match, subset, args.rounds)
+        compiled = run(rules.match, subset, args.rounds)
+        results.append({
+            "corpus": label,
+            "commands": len(subset),
+            "legacy_us": round(legacy * 1e6, 2),
+            "compiled_us": round(compiled * 1e6, 2),
+            "speedup": round(legacy / compiled, 2) if compiled else 0,
+        })
+
+    if args.json:
+        emit({"results": results, "verdict_mismatches": len(mismatches)}, args.json)
+    print_table(results, ["corpus", "commands", "legacy_us", "compiled_us", "speedup"])
+    print(f"verdict mismatches: {len(mismatches)}")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
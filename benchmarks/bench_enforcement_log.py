@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Enforcement log concurrency stress test
+N processes append to one EnforcementLog at the same time, then the log is
+checked and throughput reported, for three writers:
+  unlocked  one commit per entry without the fcntl lock (the previous
+            behaviour: concurrent index read-modify-writes lose counts)
+  locked    one locked commit per entry
+  group     locked group commit (default FLUSH_WINDOW / MAX_BATCH)
+
+Checks per run: every line in every segment (compressed or not) parses as JSON (no torn or
+interleaved lines), the line count equals entries written, the saved index
+totals match the lines (no lost index updates) and no writer crashed
+(unlocked writers trip over each other's half-written tails and segment
+rotations). Exits 1 when the locked writers fail a check.
+
+Usage:
+  python benchmarks/bench_enforcement_log.py [--processes 8] [--entries 500]
+         [--entry-bytes 2048] [--segment-kb 512] [--json out.json]
+"""
+
+import argparse
+import gzip
+import json
+import multiprocessing
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from common import HOOKS_DIR, emit, print_table
+
+sys.path.insert(0, str(HOOKS_DIR))
+import enforcement_log  # noqa: E402
+
+MODES = {
+    # mode: (flush_window, use fcntl)
+    "unlocked": (0, False),
+    "locked": (0, True),
+    "group": (enforcement_log.FLUSH_WINDOW, True),
+}
+
+
+def writer(log_path, mode, worker, entries, entry_bytes, segment_bytes, start):
+    flush_window, locked = MODES[mode]
+    if not locked:
+        enforcement_log.fcntl = None
+    log = enforcement_log.EnforcementLog(log_path, segment_bytes, flush_window)
+    padding = "x" * entry_bytes
+    start.wait()
+    try:
+        for i in range(entries):
+            log.append({
+                "timestamp": datetime.now().isoformat(),
+                "command": f"/worker{worker}",
+                "status": "SUCCESS" if i % 5 else "VIOLATION",
+                "details": {"seq": i, "padding": padding},
+                "violations": [] if i % 5 else ["NO_OUTPUT_GENERATED"],
+            })
+        log.flush()
+    except Exception:
+        sys.exit(1)  # Reported as a crashed writer
+
+
+def check(log_dir):
+    """Parse every segment; returns (lines, torn lines, index totals)"""
+    lines = torn = 0
+    for path in Path(log_dir).glob(".enforcement.log*"):
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('{"' + enforcement_log.HEADER_KEY):
+                    continue  # Compressed segment header
+                lines += 1
+                try:
+                    entry = json.loads(line)
+                    if "padding" not in entry["details"]:
+                        torn += 1
+                except (ValueError, KeyError, TypeError):
+                    torn += 1
+    try:
+        with open(Path(log_dir) / ".enforcement.index.json", 'r') as f:
+            indexed = json.load(f)["totals"]["entries"]
+    except (OSError, ValueError, KeyError):
+        indexed = None
+    return lines, torn, indexed
+
+
+def run(mode, args):
+    tmp = Path(tempfile.mkdtemp(prefix="log-stress-"))
+    log_path = str(tmp / ".enforcement.log")
+    ctx = multiprocessing.get_context("fork")
+    start = ctx.Event()
+    workers = [ctx.Process(target=writer,
+                           args=(log_path, mode, w, args.entries, args.entry_bytes,
+                                 args.segment_kb * 1024, start))
+               for w in range(args.processes)]
+    try:
+        for p in workers:
+            p.start()
+        time.sleep(0.2)  # Let every worker reach the barrier
+        began = time.perf_counter()
+        start.set()
+        for p in workers:
+            p.join()
+        elapsed = time.perf_counter() - began
+
+        crashed = sum(1 for p in workers if p.exitcode != 0)
+        expected = args.processes * args.entries
+        lines, torn, indexed = check(tmp)
+        segments = len(list(tmp.glob(".enforcement.log.*")))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    return {
+        "mode": mode,
+        "processes": args.processes,
+        "expected": expected,
+        "lines": lines,
+        "torn": torn,
+        "indexed": indexed,
+        "segments": segments,
+        "crashed": crashed,
+        "ok": lines == expected and torn == 0 and indexed == expected and not crashed,
+        "entries_per_s": round(expected / elapsed),
+        "seconds": round(elapsed, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Enforcement log concurrency stress test")
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--entries", type=int, default=500, help="Entries per process")
+    parser.add_argument("--entry-bytes", type=int, default=2048, help="Padding per entry")
+    parser.add_argument("--segment-kb", type=int, default=512, help="Segment size (exercises sealing)")
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    results = [run(mode, args) for mode in args.modes.split(",")]
+
+    if args.json:
+        emit(results, args.json)
+    print_table(results, ["mode", "processes", "expected", "lines", "torn", "indexed",
+                          "segments", "crashed", "ok", "entries_per_s", "seconds"])
+
+    failed = [r for r in results if r["mode"] != "unlocked" and not r["ok"]]
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
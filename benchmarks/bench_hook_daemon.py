@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Hook daemon latency benchmark
+Compares per-call latency of invoking the hook scripts directly (one cold
+interpreter per call, today's setup) against the hook-client.py shim talking
+to a running hook-server.py.
+
+Usage:
+  python benchmarks/bench_hook_daemon.py [--iterations 200] [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import hook_script, print_table, summarize, time_process, emit
+
+PAYLOADS = {
+    "deny-dangerous-bash": {
+        "tool_name": "Bash",
+        "tool_input": {"command": "python -m pytest -q tests/ && git status"},
+    },
+    "forbid-write-main": {
+        "tool_name": "Write",
+        "tool_input": {"file_path": "src/app.py", "content": "print('hello')\n" * 200},
+    },
+}
+
+
+def wait_for_socket(path, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if os.path.exists(path):
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hook daemon latency benchmark")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="hook-bench-")
+    env = dict(os.environ, HOOK_DAEMON_SOCKET=os.path.join(tmp, "hooks.sock"))
+    server = subprocess.Popen([sys.executable, hook_script("hook-server.py"), "run"],
+                              env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    if not wait_for_socket(env["HOOK_DAEMON_SOCKET"]):
+        server.kill()
+        sys.exit("hook server did not start")
+
+    results = []
+    try:
+        for hook, payload in PAYLOADS.items():
+            data = json.dumps(payload).encode("utf-8")
+            modes = {
+                "direct": [sys.executable, hook_script(f"{hook}.py")],
+                "daemon": [sys.executable, hook_script("hook-client.py"), hook],
+                "daemon -S": [sys.executable, "-S", hook_script("hook-client.py"), hook],
+            }
+            for mode, argv in modes.items():
+                time_process(argv, data, env)  # warm the page cache
+                samples = [time_process(argv, data, env) for _ in range(args.iterations)]
+                results.append({"hook": hook, "mode": mode, **summarize(samples)})
+    finally:
+        subprocess.run([sys.executable, hook_script("hook-server.py"), "stop"],
+                       env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        server.wait(timeout=5)
+
+    if args.json:
+        emit(results, args.json)
+    print_table(results, ["hook", "mode", "n", "p50_ms", "p99_ms", "mean_ms"])
+
+
+if __name__ == "__main__":
+    main()
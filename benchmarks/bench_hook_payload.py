@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Hook payload parsing benchmark
+Latency and peak RSS of reading the tool payload from stdin, per payload
+size, for:
+  json.load   json.load(sys.stdin) of the whole payload (the previous approach)
+  streaming   hook_payload.read_stdin_payload of the fields the hooks need
+Each sample is a fresh interpreter; peak RSS is the child's VmHWM, read at
+exit (ru_maxrss from wait4 would include the benchmark's own pre-exec RSS),
+so interpreter startup (~10 MB) is included in both columns.
+
+Payloads (content is the variable-size part):
+  write         Write, file_path before content (the usual key order)
+  write-late    Write, content before file_path (worst case: content skipped)
+  bash-on-write deny-dangerous-bash fields on a Write payload (stops at tool_name)
+
+Usage:
+  python benchmarks/bench_hook_payload.py [--sizes 1K,1M,20M] [--iterations 10]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import HOOKS_DIR, emit, print_table, summarize
+
+# Appended to each reader: print the process's peak RSS in KB
+PEAK_RSS = (
+    "for line in open('/proc/self/status'):\n"
+    "    if line.startswith('VmHWM:'):\n"
+    "        print(line.split()[1])\n"
+)
+
+READERS = {
+    "json.load": (
+        "import json, sys\n"
+        "data = json.load(sys.stdin)\n"
+        "(data.get('tool_input') or {{}}).get({key!r})\n"
+        + PEAK_RSS
+    ),
+    "streaming": (
+        "import sys\n"
+        "sys.path.insert(0, {hooks!r})\n"
+        "from hook_payload import read_stdin_payload\n"
+        "read_stdin_payload({{'tool_name': True, 'tool_input': {{{key!r}: True}}}},\n"
+        "                   until=lambda d: d.get('tool_name', {tool!r}) != {tool!r})\n"
+        + PEAK_RSS
+    ),
+}
+
+CASES = {
+    "write": ("file_path", "Write", False),
+    "write-late": ("file_path", "Write", True),
+    "bash-on-write": ("command", "Bash", False),
+}
+
+
+def parse_size(text):
+    units = {"K": 1024, "M": 1024 * 1024}
+    return int(text[:-1]) * units[text[-1]] if text[-1] in units else int(text)
+
+
+def payload(size, content_first):
+    line = 'print("payload line with \\"quotes\\" and \\\\ escapes")\n'
+    content = (line * (size // len(line) + 1))[:size]
+    tool_input = {"file_path": "src/app.py", "content": content}
+    if content_first:
+        tool_input = {"content": content, "file_path": "src/app.py"}
+    return json.dumps({
+        "session_id": "bench",
+        "hook_event_name": "PreToolUse",
+        "tool_name": "Write",
+        "tool_input": tool_input,
+    }).encode("utf-8")
+
+
+def run_once(code, stdin_path):
+    """(seconds, peak RSS in KB) of one interpreter running `code`"""
+    with open(stdin_path, 'rb') as stdin:
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-c", code], stdin=stdin,
+                                capture_output=True, check=True)
+        elapsed = time.perf_counter() - start
+    return elapsed, int(result.stdout.split()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hook payload parsing benchmark")
+    parser.add_argument("--sizes", default="1K,1M,20M")
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="payload-bench-") as tmp:
+        for size_text in args.sizes.split(","):
+            size = parse_size(size_text)
+            for case, (key, tool, content_first) in CASES.items():
+                stdin_path = os.path.join(tmp, f"{case}-{size_text}.json")
+                with open(stdin_path, 'wb') as f:
+                    f.write(payload(size, content_first))
+
+                for reader, template in READERS.items():
+                    code = template.format(key=key, tool=tool, hooks=str(HOOKS_DIR))
+                    samples, peaks = [], []
+                    for _ in range(args.iterations):
+                        elapsed, peak = run_once(code, stdin_path)
+                        samples.append(elapsed)
+                        peaks.append(peak)
+                    row = {"size": size_text, "payload": case, "reader": reader}
+                    row.update(summarize(samples))
+                    row["peak_rss_mb"] = round(max(peaks) / 1024, 1)
+                    results.append(row)
+
+    if args.json:
+        emit(results, args.json)
+    print_table(results, ["size", "payload", "reader", "p50_ms", "p99_ms", "peak_rss_mb"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Memory-bank index benchmark
+Times the output/linkage lookups of one `command-enforcer.py --validate`
+pass over every command on a synthetic memory-bank, three ways:
+  glob        Path.glob per output pattern (the previous approach)
+  index-cold  MemoryBankIndex with no manifest yet (full scan + save)
+  index-warm  MemoryBankIndex loaded from its manifest in a new process
+
+Usage:
+  python benchmarks/bench_memory_bank_index.py [--docs 50000] [--json out.json]
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from common import emit, load_hook, print_table
+from corpus import memory_bank
+
+
+def all_patterns(templates):
+    """Patterns one validate pass per command looks up (outputs + parents)"""
+    patterns = []
+    for config in templates.values():
+        patterns.extend(config["outputs"])
+        for parent in config.get("links_to", []):
+            patterns.extend(templates[parent]["outputs"])
+    return patterns
+
+
+def glob_lookup(root, patterns):
+    found = 0
+    for pattern in patterns:
+        path = root / pattern
+        if path.parent.exists():
+            found += len(list(path.parent.glob(path.name)))
+    return found
+
+
+def index_lookup(root, patterns):
+    from memory_bank_index import MemoryBankIndex
+
+    index = MemoryBankIndex(root).refresh()
+    matches = index.glob_many(patterns)
+    return sum(len(matches[pattern]) for pattern in patterns)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory-bank index benchmark")
+    parser.add_argument("--docs", type=int, default=50000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    templates = load_hook("command-enforcer").COMMAND_TEMPLATES
+    patterns = all_patterns(templates)
+    tmp = Path(tempfile.mkdtemp(prefix="mb-bench-"))
+    root = tmp / "memory-bank"
+
+    try:
+        start = time.perf_counter()
+        memory_bank(root, args.docs, templates)
+        print(f"generated {args.docs} documents in {time.perf_counter() - start:.1f}s")
+
+        results = []
+        timings = {"glob": [], "index-cold": [], "index-warm": []}
+        counts = {}
+        for _ in range(args.rounds):
+            manifest = root / ".cache" / "manifest.marshal"
+            for mode in timings:
+                if mode == "index-cold" and manifest.exists():
+                    manifest.unlink()
+                fn = glob_lookup if mode == "glob" else index_lookup
+                start = time.perf_counter()
+                counts[mode] = fn(root, patterns)
+                timings[mode].append(time.perf_counter() - start)
+
+        for mode, samples in timings.items():
+            results.append({
+                "mode": mode,
+                "docs": args.docs,
+                "lookups": len(patterns),
+                "matches": counts[mode],
+                "best_ms": round(min(samples) * 1000, 2),
+                "mean_ms": round(sum(samples) / len(samples) * 1000, 2),
+            })
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    if args.json:
+        emit(results, args.json)
+    print_table(results, ["mode", "docs", "lookups", "matches", "best_ms", "mean_ms"])
+
+
+if __name__ == "__main__":
+    main()
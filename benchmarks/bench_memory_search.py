@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Memory-bank full-text search benchmark
+Indexes a synthetic memory-bank (corpus documents, filler words plus one
+guide reference each) and times:
+  build          no index yet, every document tokenized and inserted
+  refresh        index on disk, nothing changed (stat pass only)
+  incremental    index on disk, --touched documents rewritten
+  search         one ranked query on a warm connection
+  search/rare    query for a term that appears in few documents
+  snippets       top-5 excerpts within a 2000 character budget
+
+Usage:
+  python benchmarks/bench_memory_search.py [--docs 10000] [--touched 100] [--json out.json]
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from common import emit, load_hook, print_table
+from corpus import memory_bank
+
+QUERY = "cache index render"
+RARE_QUERY = "guide-7 授權"
+
+
+def timed(fn, rounds):
+    samples, value = [], None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        value = fn()
+        samples.append(time.perf_counter() - start)
+    return samples, value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory-bank full-text search benchmark")
+    parser.add_argument("--docs", type=int, default=10000)
+    parser.add_argument("--touched", type=int, default=100, help="Documents changed for 'incremental'")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    templates = load_hook("command-enforcer").COMMAND_TEMPLATES
+    from memory_search import MemorySearch
+
+    tmp = Path(tempfile.mkdtemp(prefix="search-bench-"))
+    root = tmp / "memory-bank"
+    db_path = root / ".cache" / "search.sqlite3"
+
+    def build():
+        search = MemorySearch(root)
+        try:
+            for suffix in ("", "-wal", "-shm"):
+                Path(f"{db_path}{suffix}").unlink(missing_ok=True)
+            return search.refresh()
+        finally:
+            search.close()
+
+    def refresh():
+        search = MemorySearch(root)
+        try:
+            return search.refresh()
+        finally:
+            search.close()
+
+    def touch():
+        for rel in created[:args.touched]:
+            with open(root / rel, "a", encoding="utf-8") as f:
+                f.write("\n## 授權\n授權流程已更新\n")
+        return refresh()
+
+    try:
+        start = time.perf_counter()
+        created = sorted(memory_bank(root, args.docs, templates))
+        print(f"generated {args.docs} documents in {time.perf_counter() - start:.1f}s")
+
+        timings, found = {}, {}
+        timings["build"], _ = timed(build, args.rounds)
+        timings["refresh"], _ = timed(refresh, args.rounds)
+        timings["incremental"], _ = timed(touch, args.rounds)
+
+        search = MemorySearch(root)
+        search.search(QUERY)  # Warm the connection and page cache
+        timings["search"], hits = timed(lambda: search.search(QUERY), args.rounds * 10)
+        found["search"] = len(hits)
+        timings["search/rare"], hits = timed(lambda: search.search(RARE_QUERY), args.rounds * 10)
+        found["search/rare"] = len(hits)
+        timings["snippets"], hits = timed(lambda: search.snippets(QUERY, 5, 2000), args.rounds * 10)
+        found["snippets"] = len(hits)
+        index_stats = search.stats()
+        search.close()
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    results = []
+    for mode, samples in timings.items():
+        results.append({
+            "mode": mode,
+            "docs": args.docs,
+            "terms": index_stats["terms"],
+            "index_mb": round(index_stats["bytes"] / 1e6, 1),
+            "result": found.get(mode, ""),
+            "best_ms": round(min(samples) * 1000, 3),
+            "mean_ms": round(sum(samples) / len(samples) * 1000, 3),
+        })
+
+    if args.json:
+        emit(results, args.json)
+    print(f"cpus: {os.cpu_count()}")
+    print_table(results, ["mode", "docs", "terms", "index_mb", "result", "best_ms", "mean_ms"])
+
+
+if __name__ == "__main__":
+    main()
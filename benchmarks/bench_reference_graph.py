@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Memory-bank reference graph benchmark
+Builds the reference graph of a synthetic memory-bank (every corpus
+document cites one of 97 implementation guides) and times:
+  build-serial   no graph yet, documents scanned in-process (--jobs 1)
+  build          no graph yet, documents scanned on the process pool
+  refresh        graph loaded from disk, nothing changed (stat pass only)
+  incremental    graph loaded from disk, --touched documents rewritten
+  load           graph loaded from disk, no refresh
+  cited_by       one reverse lookup on a loaded graph
+  cited_by/cmd   reverse lookup filtered to the documents of one command
+
+Usage:
+  python benchmarks/bench_reference_graph.py [--docs 100000] [--touched 100] [--json out.json]
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from common import emit, load_hook, print_table
+from corpus import memory_bank
+
+TARGET = "implementation/guide-0.md"
+
+
+def timed(fn, rounds):
+    samples, value = [], None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        value = fn()
+        samples.append(time.perf_counter() - start)
+    return samples, value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory-bank reference graph benchmark")
+    parser.add_argument("--docs", type=int, default=100000)
+    parser.add_argument("--touched", type=int, default=100, help="Documents changed for 'incremental'")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    templates = load_hook("command-enforcer").COMMAND_TEMPLATES
+    from memory_bank_index import compile_outputs
+    from reference_graph import ReferenceGraph
+
+    compiled = compile_outputs(templates)
+    tmp = Path(tempfile.mkdtemp(prefix="refgraph-bench-"))
+    root = tmp / "memory-bank"
+    graph_path = root / ".cache" / "references.marshal"
+
+    def build(jobs):
+        def run():
+            if graph_path.exists():
+                graph_path.unlink()
+            return ReferenceGraph(root).refresh(jobs).stats()
+        return run
+
+    def touch():
+        for rel in created[:args.touched]:
+            with open(root / rel, "a", encoding="utf-8") as f:
+                f.write(f"\nSee memory-bank/{TARGET}\n")
+        return ReferenceGraph(root).refresh()
+
+    try:
+        start = time.perf_counter()
+        created = sorted(memory_bank(root, args.docs, templates))
+        print(f"generated {args.docs} documents in {time.perf_counter() - start:.1f}s")
+
+        timings = {}
+        timings["build-serial"], stats = timed(build(1), args.rounds)
+        timings["build"], _ = timed(build(None), args.rounds)
+        timings["refresh"], _ = timed(lambda: ReferenceGraph(root).refresh(), args.rounds)
+        timings["incremental"], _ = timed(touch, args.rounds)
+        timings["load"], _ = timed(lambda: ReferenceGraph(root).references(created[0]), args.rounds)
+
+        graph = ReferenceGraph(root)
+        graph.references(created[0])  # Load once
+        timings["cited_by"], cited = timed(lambda: graph.cited_by(TARGET), args.rounds * 100)
+        timings["cited_by/cmd"], cited_cmd = timed(
+            lambda: graph.cited_by(TARGET, "/review-code", compiled), args.rounds * 100)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    results = []
+    for mode, samples in timings.items():
+        results.append({
+            "mode": mode,
+            "docs": args.docs,
+            "edges": stats["edges"],
+            "result": len(cited_cmd) if mode == "cited_by/cmd" else len(cited) if mode == "cited_by" else "",
+            "best_ms": round(min(samples) * 1000, 3),
+            "mean_ms": round(sum(samples) / len(samples) * 1000, 3),
+        })
+
+    if args.json:
+        emit(results, args.json)
+    print(f"cpus: {os.cpu_count()}")
+    print_table(results, ["mode", "docs", "edges", "result", "best_ms", "mean_ms"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Template-guide validation benchmark
+Validates large generated documents for each guided command two ways:
+  substring   read + lowercase the whole file, one `in` scan per keyword
+              (the previous approach)
+  streaming   TemplateGuide.validate_file (chunked single-pass scan)
+Keywords are placed at the end of the document, the worst case for both.
+Peak traced memory is reported alongside time.
+
+Usage:
+  python benchmarks/bench_template_validate.py [--sizes 1,8,32] [--json out.json]
+"""
+
+import argparse
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from common import emit, load_hook, print_table
+from corpus import FILLER_WORDS
+
+
+def write_document(path, size_mb, keywords, rng):
+    line = " ".join(rng.choice(FILLER_WORDS) for _ in range(12)) + "\n"
+    with open(path, 'w', encoding='utf-8') as f:
+        for _ in range(size_mb * 1024 * 1024 // len(line)):
+            f.write(line)
+        f.write("## " + " ".join(keywords) + "\n")
+
+
+def substring_validate(command, path, guide):
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    content_lower = content.lower()
+    missing = []
+    for element in guide.get_template_guidance(command)['minimal_constraints']['must_have']:
+        keywords = element.lower().split()
+        matches = sum(1 for kw in keywords if kw in content_lower)
+        if matches < len(keywords) * 0.6:
+            missing.append(element)
+    return {"valid": not missing, "missing": missing}
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Template-guide validation benchmark")
+    parser.add_argument("--sizes", default="1,8,32", help="Document sizes in MB")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    guide = load_hook("template-guide").TemplateGuide()
+    commands = ["/van", "/creative", "/implement"]
+    rng = random.Random(0)
+    tmp = Path(tempfile.mkdtemp(prefix="tg-bench-"))
+    results = []
+
+    try:
+        for size_mb in (int(s) for s in args.sizes.split(",")):
+            for command in commands:
+                must_have = guide.get_template_guidance(command)['minimal_constraints']['must_have']
+                path = tmp / f"{command[1:]}-{size_mb}mb.md"
+                write_document(path, size_mb, must_have, rng)
+
+                baseline, _, _ = measure(substring_validate, command, path, guide)
+                for mode, fn in (("substring", lambda: substring_validate(command, path, guide)),
+                                 ("streaming", lambda: guide.validate_file(command, str(path)))):
+                    result, elapsed, peak = measure(fn)
+                    results.append({
+                        "mode": mode,
+                        "command": command,
+                        "size_mb": size_mb,
+                        "valid": result["valid"],
+                        "same": result["missing"] == baseline["missing"],
+                        "ms": round(elapsed * 1000, 1),
+                        "peak_mb": round(peak / 1024 / 1024, 2),
+                    })
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    if args.json:
+        emit(results, args.json)
+    print_table(results, ["mode", "command", "size_mb", "valid", "same", "ms", "peak_mb"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Hook import-time budget check
+Runs each hook entry point under `python -X importtime` in a throwaway
+project (common.make_project) and compares the import time it adds on top
+of bare interpreter startup against that entry point's budget. Modules the
+interpreter imports for `python -c pass` (site and its dependencies) are
+not counted. One warm-up run per entry point builds __pycache__ and the
+config snapshot first, so the numbers are those of a warm cold start: a
+fresh process on an installed project.
+
+Each entry point also lists modules it must not import at all (yaml means
+the config snapshot was bypassed, typing/threading/hashlib mean a lazy
+import regressed). That part of the check is exact; the timing part is
+the median of --runs runs. Exits 1 when an entry point is over budget or
+imports a forbidden module.
+
+Usage:
+  python benchmarks/check_import_budget.py [--runs 5] [--only command-enforcer*]
+                                           [--budget-scale 1.5] [--json out.json]
+"""
+
+import argparse
+import fnmatch
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from common import emit, make_project, print_table
+from corpus import tool_payloads
+
+# Never imported by a warm hook run
+FORBIDDEN = {"yaml", "typing", "concurrent.futures", "asyncio"}
+
+# name: (argv, payload, budget_ms, extra forbidden modules)
+ENTRY_POINTS = {
+    "deny-dangerous-bash": (["deny-dangerous-bash.py"], "bash-short", 25,
+                            {"argparse", "pathlib", "datetime", "hashlib", "threading"}),
+    "forbid-write-main": (["forbid-write-main.py"], "edit-4K", 25,
+                          {"argparse", "pathlib", "datetime", "hashlib", "threading"}),
+    "hook-dispatch": (["hook-dispatch.py"], "bash-short", 25,
+                      {"argparse", "pathlib", "datetime", "hashlib", "threading"}),
+    "hook-client deny-dangerous-bash": (["hook-client.py", "deny-dangerous-bash"], "bash-short", 25,
+                                        {"argparse", "pathlib", "datetime", "hashlib", "threading"}),
+    "command-enforcer --check": (["command-enforcer.py", "--check", "/van"], None, 50,
+                                 {"hashlib", "threading"}),
+    "template-guide --command": (["template-guide.py", "--command", "/van"], None, 45,
+                                 {"hashlib", "threading", "datetime", "sqlite3"}),
+    "template-enforcer-flexible --pre-check": (["template-enforcer-flexible.py", "--pre-check", "/van"],
+                                               None, 45, {"hashlib", "threading", "datetime"}),
+    "batch-validate": (["batch-validate.py", "memory-bank"], None, 50, {"hashlib"}),
+}
+
+# Environment variables that would change what a hook run imports
+SCRUBBED_ENV = ("HOOK_TIMING", "HOOK_PROFILE", "HOOK_DAEMON_SOCKET", "TEMPLATE_MODE", "GIT_DIR",
+                "PYTHONPROFILEIMPORTTIME", "PYTHONDONTWRITEBYTECODE")
+
+
+def parse_importtime(stderr):
+    """[(module, self_us, cumulative_us, depth)] from -X importtime output"""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # Column header
+        name = fields[2].rstrip()
+        stripped = name.lstrip()
+        depth = (len(name) - len(stripped) - 1) // 2
+        imports.append((stripped, int(fields[0]), int(fields[1]), depth))
+    return imports
+
+
+def importtime(argv, stdin, env, cwd):
+    result = subprocess.run([sys.executable, "-X", "importtime"] + argv, input=stdin,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, env=env, cwd=cwd)
+    return parse_importtime(result.stderr.decode("utf-8", "replace"))
+
+
+def measure(argv, stdin, env, cwd, baseline, runs):
+    """Median added import time (ms), imported modules and the heaviest top-level imports"""
+    totals = []
+    modules = set()
+    top = {}
+    for _ in range(runs):
+        added = [entry for entry in importtime(argv, stdin, env, cwd) if entry[0] not in baseline]
+        totals.append(sum(entry[1] for entry in added) / 1000)
+        modules.update(entry[0] for entry in added)
+        for name, _, cumulative, depth in added:
+            if depth == 0:
+                top.setdefault(name, []).append(cumulative / 1000)
+    heaviest = sorted(((statistics.median(ms), name) for name, ms in top.items()), reverse=True)[:5]
+    return statistics.median(totals), modules, heaviest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hook import-time budget check")
+    parser.add_argument("--runs", type=int, default=5, help="Timed runs per entry point")
+    parser.add_argument("--only", action="append", help="Glob over entry point names (repeatable)")
+    parser.add_argument("--budget-scale", type=float, default=1.0,
+                        help="Multiply every budget (slow or loaded machines)")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    env = {k: v for k, v in os.environ.items() if k not in SCRUBBED_ENV}
+    payloads = tool_payloads()
+    baseline = {entry[0] for entry in importtime(["-c", "pass"], b"", env, None)}
+
+    tmp = Path(tempfile.mkdtemp(prefix="hooks-imports-"))
+    results = []
+    try:
+        hooks_dir = make_project(tmp)
+        (tmp / "memory-bank").mkdir()
+        for name, (argv, payload, budget_ms, forbidden) in ENTRY_POINTS.items():
+            if args.only and not any(fnmatch.fnmatch(name, p) for p in args.only):
+                continue
+            command = [str(hooks_dir / argv[0])] + argv[1:]
+            stdin = payloads[payload] if payload else b""
+            importtime(command, stdin, env, str(tmp))  # Warm-up
+            median_ms, modules, heaviest = measure(command, stdin, env, str(tmp), baseline, args.runs)
+
+            budget = round(budget_ms * args.budget_scale, 1)
+            banned = sorted(modules & (FORBIDDEN | forbidden))
+            results.append({
+                "entry_point": name,
+                "import_ms": round(median_ms, 2),
+                "budget_ms": budget,
+                "modules": len(modules),
+                "forbidden": ",".join(banned),
+                "status": "OVER" if median_ms > budget or banned else "ok",
+                "heaviest": ", ".join(f"{module} {ms:.1f}" for ms, module in heaviest),
+            })
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    if args.json:
+        emit(results, args.json)
+    print_table(results, ["entry_point", "import_ms", "budget_ms", "modules", "forbidden",
+                          "status", "heaviest"])
+
+    failed = [r for r in results if r["status"] != "ok"]
+    if failed:
+        print(f"\n{len(failed)} entry point(s) over their import budget", file=sys.stderr)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark helpers shared by the scripts in this directory.
+"""
+
+import atexit
+import json
+import math
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+HOOKS_DIR = REPO_ROOT / ".ai" / "adapters" / "claude-code" / "hooks"
+
+_sandbox = None
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples):
+    """p50/p99/mean summary in milliseconds (samples are seconds)"""
+    return {
+        "n": len(samples),
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+        "mean_ms": round(sum(samples) / len(samples) * 1000, 3) if samples else 0.0,
+    }
+
+
+def time_process(argv, stdin=b"", env=None, cwd=None):
+    """Wall time of one subprocess invocation, in seconds"""
+    start = time.perf_counter()
+    subprocess.run(argv, input=stdin, stdout=subprocess.DEVNULL,
+                   stderr=subprocess.DEVNULL, env=env, cwd=cwd)
+    return time.perf_counter() - start
+
+
+def time_call(fn, *args, repeat=1):
+    """Wall time of fn(*args), in seconds"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(*args)
+    return (time.perf_counter() - start) / repeat
+
+
+def hook_script(name):
+    return str(HOOKS_DIR / name)
+
+
+def make_project(root):
+    """
+    Lay out a project the way scripts/sync-ai-config.js installs the hooks:
+    .ai/ next to .claude/hooks/, in a git repository on a feature branch.
+    The hooks resolve enforcement.yaml, memory-bank/ and their caches from
+    their own location, so they must run from such a tree (run from
+    .ai/adapters/ they would find no configuration). Returns the hooks dir.
+    """
+    root = Path(root)
+    ignore = shutil.ignore_patterns(".cache", "__pycache__")
+    shutil.copytree(REPO_ROOT / ".ai", root / ".ai", ignore=ignore, dirs_exist_ok=True)
+    shutil.copytree(HOOKS_DIR, root / ".claude" / "hooks", ignore=ignore, dirs_exist_ok=True)
+    subprocess.run(["git", "init", "-q", "-b", "bench", str(root)],
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return root / ".claude" / "hooks"
+
+
+def sandbox_hooks_dir():
+    """Hooks dir of a throwaway project shared by this process (see make_project)"""
+    global _sandbox
+    if _sandbox is None:
+        root = Path(tempfile.mkdtemp(prefix="hooks-bench-"))
+        atexit.register(shutil.rmtree, root, True)
+        _sandbox = make_project(root)
+    return _sandbox
+
+
+def load_hook(name, hooks_dir=None):
+    """Import a hook script (e.g. "command-enforcer") as a module"""
+    hooks_dir = str(hooks_dir or sandbox_hooks_dir())
+    if hooks_dir not in sys.path:
+        sys.path.insert(0, hooks_dir)
+    import hook_runtime
+    return hook_runtime.load_hook(name)
+
+
+def print_table(rows, columns):
+    """Print a list of dicts as an aligned text table"""
+    widths = [max(len(c), *(len(str(r.get(c, ""))) for r in rows)) for c in columns]
+    print("  ".join(c.ljust(w) for c, w in zip(columns, widths)))
+    print("  ".join("-" * w for w in widths))
+    for row in rows:
+        print("  ".join(str(row.get(c, "")).ljust(w) for c, w in zip(columns, widths)))
+
+
+def emit(results, json_path=None):
+    """Write results as JSON to a file, or to stdout when no path is given"""
+    text = json.dumps(results, indent=2, ensure_ascii=False)
+    if json_path:
+        Path(json_path).write_text(text + "\n", encoding="utf-8")
+    else:
+        sys.stdout.write(text + "\n")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark comparison
+Diffs two run_suite.py results files case by case and flags regressions:
+a case regresses when the head metric exceeds the base by more than
+--threshold percent AND by more than --min-delta-ms (so sub-millisecond
+noise on fast cases is not reported). Exits 1 when anything regressed.
+
+Usage:
+  python benchmarks/compare.py base.json head.json [--metric p50_ms]
+                               [--threshold 10] [--min-delta-ms 0.5] [--json out.json]
+"""
+
+import argparse
+import json
+import sys
+
+from common import emit, print_table
+
+
+def compare(base, head, metric, threshold, min_delta_ms):
+    """Rows of {case, base, head, delta_pct, status} over both runs' cases"""
+    rows = []
+    for case_id in sorted(set(base) | set(head)):
+        if case_id not in head:
+            rows.append({"case": case_id, "base": base[case_id][metric], "status": "removed"})
+            continue
+        if case_id not in base:
+            rows.append({"case": case_id, "head": head[case_id][metric], "status": "new"})
+            continue
+
+        old, new = base[case_id][metric], head[case_id][metric]
+        delta = new - old
+        pct = (delta / old * 100) if old else 0.0
+        if abs(delta) <= min_delta_ms or abs(pct) <= threshold:
+            status = "ok"
+        else:
+            status = "REGRESSION" if delta > 0 else "improved"
+        rows.append({"case": case_id, "base": old, "head": new,
+                     "delta_pct": round(pct, 1), "status": status})
+    return rows
+
+
+def load(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark comparison")
+    parser.add_argument("base", help="Results of the reference run")
+    parser.add_argument("head", help="Results of the run under test")
+    parser.add_argument("--metric", default="p50_ms", choices=["p50_ms", "p99_ms", "mean_ms", "best_ms"])
+    parser.add_argument("--threshold", type=float, default=10.0, help="Allowed slowdown in percent")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5, help="Ignore smaller absolute changes")
+    parser.add_argument("--json", help="Write the comparison to this file")
+    args = parser.parse_args()
+
+    base, head = load(args.base), load(args.head)
+    rows = compare(base["results"], head["results"], args.metric, args.threshold, args.min_delta_ms)
+    regressions = [row for row in rows if row["status"] == "REGRESSION"]
+
+    print(f"base: {base['meta'].get('revision')} ({base['meta'].get('timestamp')})  "
+          f"head: {head['meta'].get('revision')} ({head['meta'].get('timestamp')})  "
+          f"metric: {args.metric}")
+    print_table(rows, ["case", "base", "head", "delta_pct", "status"])
+    print(f"\n{len(regressions)} regression(s) over {args.threshold}% and {args.min_delta_ms} ms")
+
+    if args.json:
+        emit({"metric": args.metric, "threshold": args.threshold,
+              "min_delta_ms": args.min_delta_ms, "rows": rows}, args.json)
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Synthetic inputs for the benchmarks in this directory.
+All generators are deterministic for a given seed.
+"""
+
+import os
+import random
+
+# Commands agents run all the time
+COMMON_COMMANDS = [
+    "git status",
+    "git diff --stat HEAD~1",
+    "git log --oneline -20",
+    "git add -A && git commit -m 'Fix parser edge case'",
+    "python -m pytest -q tests/",
+    "python -m pytest tests/test_api.py -k 'not slow' -x",
+    "npm run lint && npm test",
+    "npm install --save-dev typescript@5",
+    "ls -la src/",
+    "find . -name '*.py' -not -path './.venv/*' | xargs wc -l",
+    "grep -rn 'TODO' src/ | head -50",
+    "docker compose up -d db && docker compose logs -f --tail=100 api",
+    "ruff check . && mypy src/",
+    "cargo build --release 2>&1 | tail -20",
+    "rm -rf build/ dist/",
+    "git push origin feature/login --force-with-lease",
+    "curl -s http://localhost:8000/health | jq .",
+]
+
+# Commands the guard must block
+DANGEROUS_COMMANDS = [
+    "rm -rf /",
+    "sudo rm -rf /var/lib/app",
+    "dd if=/dev/zero of=/dev/sda bs=1M",
+    "mkfs.ext4 /dev/sdb1",
+    "chmod -R 777 /",
+    "echo data > /dev/sda",
+    ":(){ :|:& };:",
+]
+
+FILLER_WORDS = (
+    "service handler request response config module import return value "
+    "update payload cache index status format parse render"
+).split()
+
+
+def heredoc_command(size, rng):
+    """A generated `cat > file <<'EOF'` command of roughly `size` bytes"""
+    lines = []
+    total = 0
+    while total < size:
+        line = "    " + " ".join(rng.choice(FILLER_WORDS) for _ in range(10))
+        lines.append(line)
+        total += len(line) + 1
+    body = "\n".join(lines)
+    return f"cat > src/generated.py <<'EOF'\n{body}\nEOF"
+
+
+def bash_commands(count=1000, heredoc_sizes=(2048, 8192, 65536), seed=0):
+    """Mixed corpus: common commands, dangerous ones and large heredocs"""
+    rng = random.Random(seed)
+    pool = COMMON_COMMANDS * 6 + DANGEROUS_COMMANDS
+    commands = [rng.choice(pool) for _ in range(count)]
+    for size in heredoc_sizes:
+        for _ in range(max(1, count // 50)):
+            commands.append(heredoc_command(size, rng))
+    rng.shuffle(commands)
+    return commands
+
+
+def document(command, index, rng, size=600):
+    """A markdown memory-bank document with frontmatter and a few headings"""
+    words = " ".join(rng.choice(FILLER_WORDS) for _ in range(max(1, size // 7)))
+    return (
+        f"---\ncommand: {command}\nphase: bench\nversion: 1.0.{index}\n"
+        f"timestamp: 2024-01-01T00:00:00\n---\n\n"
+        f"# {command[1:]} document {index}\n\n## Overview\n{words}\n\n"
+        f"## Details\nSee memory-bank/implementation/guide-{index % 97}.md\n"
+    )
+
+
+def memory_bank(root, count, command_templates, seed=0, doc_size=600):
+    """
+    Populate `root` with `count` documents spread over the wildcard output
+    patterns of COMMAND_TEMPLATES. Returns {relative path: command}.
+    """
+    rng = random.Random(seed)
+    slots = [(command, pattern)
+             for command, config in sorted(command_templates.items())
+             for pattern in config["outputs"] if "*" in pattern]
+    created = {}
+    for i in range(count):
+        command, pattern = slots[i % len(slots)]
+        parts = pattern.split("*")
+        rel = parts[0] + "".join(f"{i:06d}-{k}" + rest for k, rest in enumerate(parts[1:]))
+        path = os.path.join(root, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(document(command, i, rng, doc_size))
+        created[rel] = command
+    return created
+
+
+LOG_STATUSES = ["SUCCESS"] * 8 + ["VIOLATION", "BLOCKED"]
+LOG_VIOLATIONS = ["NO_OUTPUT_GENERATED", "MISSING_TEMPLATE", "INVALID_OUTPUT_LOCATION",
+                  "TEMPLATE_NOT_USED", "MISSING_PARENT_OUTPUT", "NO_PARENT_REFERENCE"]
+
+
+def log_entry(command, timestamp, rng):
+    """An entry shaped like TemplateEnforcer.log_execution writes"""
+    status = rng.choice(LOG_STATUSES)
+    violations = [] if status == "SUCCESS" else [rng.choice(LOG_VIOLATIONS)]
+    return {
+        "timestamp": timestamp,
+        "command": command,
+        "status": status,
+        "details": {
+            "Output validation": {"valid": status == "SUCCESS", "message": "Found 3 outputs"},
+            "Linkage validation": {"valid": True, "message": "Linkage validation passed"},
+        },
+        "violations": violations,
+    }
+
+
+def enforcement_log(log_path, count, commands, seed=0, days=30,
+                    segment_bytes=4 * 1024 * 1024):
+    """
+    Write `count` entries spread over the last `days` days in the layout
+    EnforcementLog produces, before compression: sealed segments of about
+    `segment_bytes` (.enforcement.log.<n>) plus the active file.
+    EnforcementLog.compress_segments() turns the segments into .gz ones. No
+    index is written, so the first reader rebuilds it.
+    """
+    import json
+    from datetime import datetime, timedelta
+
+    rng = random.Random(seed)
+    commands = sorted(commands)
+    start = datetime.now() - timedelta(days=days)
+    step = timedelta(days=days) / max(count, 1)
+    os.makedirs(os.path.dirname(log_path), exist_ok=True)
+
+    segment, size = 1, 0
+    out = open(f"{log_path}.{segment}", "w", encoding="utf-8")
+    try:
+        for i in range(count):
+            entry = log_entry(rng.choice(commands), (start + step * i).isoformat(), rng)
+            line = json.dumps(entry) + "\n"
+            if size + len(line) > segment_bytes:
+                out.close()
+                segment += 1
+                size = 0
+                out = open(f"{log_path}.{segment}", "w", encoding="utf-8")
+            out.write(line)
+            size += len(line)
+    finally:
+        out.close()
+    # The last segment stays active, as it would be before reaching the limit
+    os.replace(f"{log_path}.{segment}", log_path)
+
+
+def tool_payloads(seed=0):
+    """{name: PreToolUse payload bytes} covering the hook input sizes that matter"""
+    import json
+
+    rng = random.Random(seed)
+    content_line = "    " + " ".join(rng.choice(FILLER_WORDS) for _ in range(10)) + "\n"
+
+    def payload(tool, tool_input):
+        return json.dumps({
+            "session_id": "bench",
+            "hook_event_name": "PreToolUse",
+            "tool_name": tool,
+            "tool_input": tool_input,
+        }).encode("utf-8")
+
+    return {
+        "bash-short": payload("Bash", {"command": "git status"}),
+        "bash-dangerous": payload("Bash", {"command": "sudo rm -rf /var/lib/app"}),
+        "bash-heredoc-64K": payload("Bash", {"command": heredoc_command(65536, rng)}),
+        "write-1M": payload("Write", {"file_path": "src/generated.py",
+                                      "content": content_line * (1024 * 1024 // len(content_line))}),
+        "edit-4K": payload("Edit", {"file_path": "src/app.py",
+                                    "old_string": content_line * (4096 // len(content_line)),
+                                    "new_string": content_line * (4096 // len(content_line))}),
+    }
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite
+Times every hook CLI entry point and the core TemplateEnforcer /
+TemplateGuide methods against synthetic corpora, and writes one
+machine-readable results file that compare.py diffs between runs.
+
+Corpora, generated in a throwaway project laid out like an installed one
+(common.make_project):
+  memory-bank   documents over the COMMAND_TEMPLATES output patterns (--docs)
+  log           enforcement log entries in sealed segments (--log-lines)
+  payloads      PreToolUse payloads from short commands to 1 MB writes
+
+Every case runs one warm-up, then --iterations timed samples. Case ids name
+the entry point and the corpus size, e.g.
+  cli/command-enforcer --report [log=100000]
+  method/validate_output [docs=10000]
+
+Usage:
+  python benchmarks/run_suite.py [--docs 1000,10000] [--log-lines 10000,100000]
+                                 [--iterations 10] [--only 'cli/*']
+                                 [--output results.json]
+  python benchmarks/compare.py base.json head.json
+"""
+
+import argparse
+import fnmatch
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from common import REPO_ROOT, emit, load_hook, make_project, print_table, summarize, time_process
+from corpus import enforcement_log, memory_bank, tool_payloads
+
+# Hooks that read a PreToolUse payload, and the payloads they see in practice
+PAYLOAD_HOOKS = {
+    "deny-dangerous-bash": ["bash-short", "bash-dangerous", "bash-heredoc-64K"],
+    "forbid-write-main": ["write-1M", "edit-4K"],
+    "hook-dispatch": ["bash-short", "bash-heredoc-64K", "write-1M", "edit-4K"],
+}
+
+# Environment variables that would change what a hook run does
+SCRUBBED_ENV = ("HOOK_TIMING", "HOOK_PROFILE", "HOOK_DAEMON_SOCKET", "TEMPLATE_MODE", "GIT_DIR")
+
+
+class Suite:
+    def __init__(self, project, iterations, only=None):
+        self.project = Path(project)
+        self.hooks_dir = self.project / ".claude" / "hooks"
+        self.memory_bank = self.project / "memory-bank"
+        self.iterations = iterations
+        self.only = only
+        self.results = {}
+        self.env = {k: v for k, v in os.environ.items() if k not in SCRUBBED_ENV}
+
+    def selected(self, case_id):
+        return self.only is None or any(fnmatch.fnmatch(case_id, p) for p in self.only)
+
+    def record(self, case_id, group, params, sample, iterations=None):
+        """Warm up once, then time `sample()` (returns seconds) repeatedly"""
+        if not self.selected(case_id):
+            return
+        sample()
+        samples = [sample() for _ in range(iterations or self.iterations)]
+        row = {"group": group, "params": params}
+        row.update(summarize(samples))
+        row["best_ms"] = round(min(samples) * 1000, 3)
+        self.results[case_id] = row
+        print(f"  {case_id}: p50 {row['p50_ms']} ms", file=sys.stderr)
+
+    def cli(self, case_id, params, argv, stdin=b"", iterations=None):
+        command = [sys.executable, str(self.hooks_dir / argv[0])] + argv[1:]
+        self.record(case_id, "cli", params,
+                    lambda: time_process(command, stdin, self.env, str(self.project)),
+                    iterations)
+
+    def method(self, case_id, params, fn, repeat=1):
+        """Time `repeat` back-to-back calls of fn per sample"""
+        def sample():
+            start = time.perf_counter()
+            for _ in range(repeat):
+                fn()
+            return time.perf_counter() - start
+        self.record(case_id, "method", dict(params, repeat=repeat), sample)
+
+    # ------------------------------------------------------------------
+    # Cases
+
+    def payload_cases(self):
+        payloads = tool_payloads()
+        for hook, names in PAYLOAD_HOOKS.items():
+            for name in names:
+                self.cli(f"cli/{hook} [{name}]", {"payload": name},
+                         [f"{hook}.py"], payloads[name])
+
+    def guidance_cases(self):
+        guide = load_hook("template-guide", self.hooks_dir).TemplateGuide()
+        content = "## Analysis\nThe problem is stated, then a solution is sketched.\n" * 20
+        element = "problem analysis solution approach"
+        self.method("method/_fuzzy_check x10000", {}, lambda: guide._fuzzy_check(content, element),
+                    repeat=10000)
+
+        self.cli("cli/template-guide --command", {}, ["template-guide.py", "--command", "/van"])
+        self.cli("cli/template-guide --prompt", {},
+                 ["template-guide.py", "--command", "/van", "--prompt"])
+        self.cli("cli/template-enforcer-flexible --pre-check", {},
+                 ["template-enforcer-flexible.py", "--pre-check", "/van"])
+        self.cli("cli/template-enforcer-flexible --prompt", {},
+                 ["template-enforcer-flexible.py", "--prompt", "/van"])
+
+    def memory_bank_cases(self, docs):
+        enforcer_module = load_hook("command-enforcer", self.hooks_dir)
+        templates = enforcer_module.COMMAND_TEMPLATES
+        commands = sorted(templates)
+
+        shutil.rmtree(self.memory_bank, ignore_errors=True)
+        created = memory_bank(self.memory_bank, docs, templates)
+        by_command = {}
+        for rel, command in sorted(created.items()):
+            by_command.setdefault(command, rel)
+        params = {"docs": docs}
+        tag = f"[docs={docs}]"
+
+        # Template content of each command: what a compliant output looks like
+        contents = {}
+        for command in commands:
+            template = enforcer_module.TEMPLATE_DIR / templates[command]["templates"][0]
+            contents[command] = template.read_text(encoding="utf-8") if template.exists() else ""
+
+        def each_command(method_name, *with_content):
+            def run():
+                enforcer = enforcer_module.TemplateEnforcer()  # Fresh index per pass
+                for command in commands:
+                    args = (command, contents[command]) if with_content else (command,)
+                    getattr(enforcer, method_name)(*args)
+            return run
+
+        self.method(f"method/validate_output {tag}", params, each_command("validate_output"))
+        self.method(f"method/validate_linkages {tag}", params,
+                    each_command("validate_linkages", True))
+        self.method(f"method/check_template_usage {tag}", params,
+                    each_command("check_template_usage", True))
+
+        sample_command = "/plan" if "/plan" in by_command else sorted(by_command)[0]
+        sample_file = str(self.memory_bank / by_command[sample_command])
+        self.cli(f"cli/command-enforcer --check {tag}", params,
+                 ["command-enforcer.py", "--check", sample_command])
+        self.cli(f"cli/command-enforcer --validate {tag}", params,
+                 ["command-enforcer.py", "--validate", sample_command, "--files", sample_file])
+        self.cli(f"cli/template-guide --validate {tag}", params,
+                 ["template-guide.py", "--command", "/van", "--validate", sample_file])
+        self.cli(f"cli/template-enforcer-flexible --post-check {tag}", params,
+                 ["template-enforcer-flexible.py", "--post-check", sample_command,
+                  "--files", sample_file])
+        self.cli(f"cli/batch-validate {tag}", params,
+                 ["batch-validate.py", str(self.memory_bank)],
+                 iterations=min(self.iterations, 3))
+
+    def log_cases(self, lines):
+        enforcer_module = load_hook("command-enforcer", self.hooks_dir)
+        log_path = enforcer_module.ENFORCEMENT_LOG
+        for path in log_path.parent.glob(".enforcement*"):
+            path.unlink()
+        enforcement_log(str(log_path), lines, enforcer_module.COMMAND_TEMPLATES)
+        enforcer_module.TemplateEnforcer().log.compress_segments()
+        index_path = log_path.with_name(".enforcement.index.json")
+        params = {"log_lines": lines}
+        tag = f"[log={lines}]"
+
+        def report(cold):
+            def run():
+                if cold and index_path.exists():
+                    index_path.unlink()
+                enforcer_module.TemplateEnforcer().generate_report()
+            return run
+
+        self.method(f"method/generate_report cold {tag}", params, report(True))
+        self.method(f"method/generate_report {tag}", params, report(False))
+        self.cli(f"cli/command-enforcer --report {tag}", params,
+                 ["command-enforcer.py", "--report"])
+        self.cli(f"cli/command-enforcer --report --since {tag}", params,
+                 ["command-enforcer.py", "--report", "--since", "24h"])
+        self.cli(f"cli/command-enforcer --query active {tag}", params,
+                 ["command-enforcer.py", "--query", "--from", "2h", "--to", "1h"])
+        self.cli(f"cli/command-enforcer --query sealed {tag}", params,
+                 ["command-enforcer.py", "--query", "--from", "500h", "--to", "499h"])
+
+
+def git_revision():
+    try:
+        result = subprocess.run(["git", "-C", str(REPO_ROOT), "rev-parse", "--short", "HEAD"],
+                                capture_output=True, text=True)
+        return result.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def parse_sizes(text):
+    return [int(size) for size in text.split(",") if size]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark suite")
+    parser.add_argument("--docs", default="1000,10000", help="Memory-bank sizes (up to 100000)")
+    parser.add_argument("--log-lines", default="10000,100000",
+                        help="Enforcement log sizes (up to 1000000)")
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--only", action="append", help="Glob over case ids (repeatable)")
+    parser.add_argument("--output", help="Write results to this file (default: stdout)")
+    args = parser.parse_args()
+
+    tmp = Path(tempfile.mkdtemp(prefix="hooks-suite-"))
+    started = time.perf_counter()
+    try:
+        suite = Suite(tmp, args.iterations, args.only)
+        make_project(tmp)
+
+        print("payloads", file=sys.stderr)
+        suite.payload_cases()
+        suite.guidance_cases()
+        for docs in parse_sizes(args.docs):
+            print(f"memory-bank: {docs} documents", file=sys.stderr)
+            suite.memory_bank_cases(docs)
+        for lines in parse_sizes(args.log_lines):
+            print(f"enforcement log: {lines} entries", file=sys.stderr)
+            suite.log_cases(lines)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "iterations": args.iterations,
+            "docs": parse_sizes(args.docs),
+            "log_lines": parse_sizes(args.log_lines),
+            "duration_s": round(time.perf_counter() - started, 1),
+        },
+        "results": suite.results,
+    }
+
+    rows = [dict(case=case_id, **{k: v for k, v in row.items() if k.endswith("_ms")})
+            for case_id, row in suite.results.items()]
+    if args.output:
+        emit(report, args.output)
+        print_table(rows, ["case", "p50_ms", "p99_ms", "mean_ms", "best_ms"])
+    else:
+        emit(report)
+
+
+if __name__ == "__main__":
+    main()